@@ -4,20 +4,66 @@ Birden fazla deneme yapar ve en iyisini seçer
 """
 
 import logging
+import os
 import random
 import hashlib
 import json
-from typing import Dict, List, Callable, Optional
+import time
+from typing import Dict, List, Callable, Optional, Iterator, Tuple
 from datetime import datetime
 
+from algorithms.attempt_scheduler import (
+    ATTEMPT_SCHEDULERS, DEFAULT_ATTEMPT_SCHEDULER, FEEDBACK_DELAY, UCB1Scheduler, arm_label
+)
+from algorithms.graph_coloring import COLORING_ALGORITHMS, DEFAULT_COLORING_ALGORITHM
+from algorithms.result_cache import PlanningResultCache, WARM_START_KEYS
+
 logger = logging.getLogger(__name__)
 
+# Parameters known not to change the best result of a run. Every other
+# parameter is part of the result cache key, so a new planner option can never
+# serve a result computed without it.
+CACHE_IGNORED_KEYS = frozenset({
+    'parallel_workers',  # Results do not depend on the worker count
+    'randomize',  # Randomized runs bypass the cache
+    'days_count',  # Only used in diagnostic messages
+})
+
+
+def execute_attempt(
+        planning_function: Callable,
+        scorer,
+        params: Dict,
+        attempt_params: Dict
+) -> Tuple[Dict, Optional[Dict]]:
+    """Run one seeded planning attempt and score it
+
+    Returns (result, score_result); score_result is None for failed attempts.
+    """
+    random.seed(attempt_params['random_seed'])
+
+    # Planlama yap
+    result = planning_function(attempt_params, progress_callback=None)
+    if not result.get('success') or not result.get('schedule'):
+        return result, None
+
+    # Puanlama yap
+    score_result = scorer.score_schedule(
+        result['schedule'],
+        result.get('course_students', {}),
+        result.get('course_info', {}),
+        params,
+        conflict_graph=result.get('conflict_graph')
+    )
+    return result, score_result
+
 
 class AttemptManager:
     """Çoklu deneme yönetimi ve en iyi sonuç seçimi"""
 
-    def __init__(self, scorer):
+    def __init__(self, scorer, result_cache: Optional[PlanningResultCache] = None):
         self.scorer = scorer
+        self.result_cache = result_cache
         self.attempts_history = []
 
     def run_multiple_attempts(
@@ -25,24 +71,55 @@ class AttemptManager:
             planning_function: Callable,
             params: Dict,
             max_attempts: int = 50,
-            progress_callback: Optional[Callable[[int, str], None]] = None
+            progress_callback: Optional[Callable[[int, str], None]] = None,
+            should_stop: Optional[Callable[[], bool]] = None
     ) -> Dict:
         """
         Birden fazla deneme yap ve en iyisini döndür
 
+        With params['time_budget_seconds'] > 0 the run is bounded by wall-clock
+        time instead (max_attempts stays an upper bound): attempts run until the
+        local search reserve (local_search_seconds, at most half the budget) is
+        left, then local search gets the rest. Progress messages carry the best
+        score so far.
+
+        With a result_cache, unchanged inputs (parameters and department data)
+        return the cached best result at once. Otherwise the best attempt of a
+        cached run on the same data with a few different parameters is
+        replayed first as a warm start, and params['warm_start_attempts']
+        caps the attempts that follow it.
+
         Args:
             planning_function: Planlama algoritması fonksiyonu
             params: Planlama parametreleri
             max_attempts: Maksimum deneme sayısı
             progress_callback: İlerleme callback'i
+            should_stop: İptal kontrolü; True dönerse en iyi sonuçla durulur
 
         Returns:
             En iyi sonuç dict'i
         """
+        started = time.perf_counter()
         try:
             self.attempts_history = []
             best_result = None
             best_score = -1
+            time_to_best = None
+            cancelled = False
+
+            # Same inputs => previous best at once; close inputs => warm start
+            cache_entry = self._open_cache_entry(planning_function, params, max_attempts)
+            if cache_entry and cache_entry['cached'] is not None:
+                logger.info("♻️ Girdiler değişmedi, sonuç önbellekten alındı")
+                return self._cached_result(cache_entry['cached'], started)
+
+            # Anytime mode: wall-clock budget split between attempts and local search
+            time_budget = float(params.get('time_budget_seconds', 0) or 0)
+            local_search_seconds = float(params.get('local_search_seconds', 0) or 0)
+            deadline = started + time_budget if time_budget > 0 else None
+            attempts_deadline = deadline
+            if deadline is not None and local_search_seconds > 0:
+                attempts_deadline = deadline - min(local_search_seconds, time_budget / 2)
 
             logger.info(f"🎯 {max_attempts} deneme başlatılıyor...")
 
@@ -58,7 +135,8 @@ class AttemptManager:
                 'degree_first',
                 'random',
                 'class_grouped',
-                'capacity_aware'
+                'capacity_aware',
+                'color_classes'
             ]
             # Shuffle strategies deterministically per run to avoid fixed first strategy bias
             rnd = random.Random(base_seed)
@@ -67,123 +145,242 @@ class AttemptManager:
             attempts_without_improvement = 0
             max_no_improvement = 50  # Allow more attempts without improvement for thorough search
 
-            for attempt in range(max_attempts):
-                try:
-                    # Strateji seç (döngüsel + rastgele)
-                    if attempt < len(strategies):
-                        strategy = strategies[attempt]
-                    else:
-                        strategy = random.choice(strategies)
-
-                    # İlerleme güncelle
-                    if progress_callback:
-                        progress = 50 + int((attempt / max_attempts) * 45)
-                        progress_callback(
-                            progress,
-                            f"Deneme {attempt + 1}/{max_attempts} - Strateji: {strategy}"
-                        )
+            # Abandon attempts whose optimistic score bound falls below the best so far
+            prune_enabled = bool(params.get('prune_attempts', True))
 
-                    # Parametreleri kopyala ve strateji ekle
-                    attempt_params = params.copy()
+            # Attempt variants: 'uniform' (each strategy once, then random strategies) or
+            # 'ucb1' (bandit over strategy × rotate_days × coloring, favours the arms that score)
+            scheduler_name = params.get('attempt_scheduler', DEFAULT_ATTEMPT_SCHEDULER)
+            if scheduler_name not in ATTEMPT_SCHEDULERS:
+                logger.warning(f"⚠️ Unknown attempt scheduler '{scheduler_name}', using {DEFAULT_ATTEMPT_SCHEDULER}")
+                scheduler_name = DEFAULT_ATTEMPT_SCHEDULER
+            scheduler = self._build_scheduler(strategies, params) if scheduler_name == 'ucb1' else None
+
+            def make_attempt_params(attempt: int) -> Dict:
+                attempt_params = self._build_attempt_params(params, attempt, strategies, base_seed)
+                if scheduler is not None:
+                    strategy, rotate_days, coloring = scheduler.choose(attempt)
                     attempt_params['order_strategy'] = strategy
-                    attempt_params['attempt_number'] = attempt
-
-                    # Rastgelelik ekle (her denemede FARKLI sonuç için)
-                    # Different attempts = different seeds, same click = same results
-                    random_seed = base_seed + attempt * 1000
-                    random.seed(random_seed)
-                    attempt_params['random_seed'] = random_seed
-                    # Rotate days per attempt to increase diversity while preserving spread
-                    attempt_params['rotate_days'] = True
-
-                    # Planlama yap
-                    result = planning_function(attempt_params, progress_callback=None)
-
-                    if not result.get('success') or not result.get('schedule'):
-                        logger.warning(f"Attempt {attempt + 1}: Failed to generate schedule")
-                        # Store failed attempt with error details
-                        attempt_record = {
-                            'attempt_number': attempt + 1,
-                            'strategy': strategy,
-                            'score': 0,
-                            'schedule': [],
-                            'score_details': {},
-                            'timestamp': datetime.now(),
-                            'result': result,
-                            'failed': True,
-                            'error_message': result.get('message', 'Bilinmeyen hata')
-                        }
-                        self.attempts_history.append(attempt_record)
-                        continue
-
-                    schedule = result['schedule']
-
-                    # Puanlama yap
-                    score_result = self.scorer.score_schedule(
-                        schedule,
-                        result.get('course_students', {}),
-                        result.get('course_info', {}),
-                        params
-                    )
+                    attempt_params['rotate_days'] = rotate_days
+                    attempt_params['coloring_algorithm'] = coloring
+                if prune_enabled:
+                    # Parallel submissions may see an older best; that only prunes less
+                    attempt_params['prune_below'] = best_score if best_result else None
+                return attempt_params
 
-                    total_score = score_result['total_score']
+            warm_start = cache_entry['warm'] if cache_entry else None
+            if warm_start is not None:
+                best_result = self._run_warm_start(planning_function, params, warm_start)
+                if best_result is None:
+                    warm_start = None
+                else:
+                    best_score = warm_start['replayed_score'] = best_result['score']
+                    time_to_best = time.perf_counter() - started
+                    warm_attempts = int(params.get('warm_start_attempts', 0) or 0)
+                    if warm_attempts > 0:
+                        max_attempts = min(max_attempts, warm_attempts)
 
-                    # Kaydet
-                    attempt_record = {
-                        'attempt_number': attempt + 1,
-                        'strategy': strategy,
-                        'score': total_score,
-                        'schedule': schedule,
-                        'score_details': score_result,
-                        'timestamp': datetime.now(),
-                        'result': result
-                    }
+            workers = self._resolve_worker_count(params, max_attempts)
+            snapshot = self._get_planning_snapshot(planning_function, params) if workers > 1 else None
+            if workers > 1 and snapshot is not None:
+                from algorithms.parallel_attempts import ParallelAttemptRunner
+                logger.info(f"🧵 Paralel mod: {workers} işlemci")
+                runner = ParallelAttemptRunner(snapshot, self.scorer, workers)
+                # The bandit must not choose ahead of the results it may use
+                window = FEEDBACK_DELAY if scheduler is not None else None
+                outcomes = runner.run(params, make_attempt_params, max_attempts, window=window)
+            else:
+                workers = 1
+                outcomes = self._iter_sequential_attempts(
+                    planning_function, params, make_attempt_params, max_attempts
+                )
 
-                    self.attempts_history.append(attempt_record)
+            for attempt, attempt_params, result, score_result, error in outcomes:
+                strategy = attempt_params['order_strategy']
 
-                    # En iyi kontrol
-                    if total_score > best_score:
-                        best_score = total_score
-                        best_result = attempt_record
-                        attempts_without_improvement = 0
+                if should_stop and should_stop():
+                    logger.info("⏹️ Planlama iptal edildi, en iyi sonuç korunuyor")
+                    cancelled = True
+                    break
+                if attempts_deadline is not None:
+                    # Without any schedule yet, keep trying until the whole budget is used
+                    now = time.perf_counter()
+                    if now >= deadline or (best_result and now >= attempts_deadline):
+                        logger.info(f"⏱️ Deneme süresi doldu ({attempt} deneme)")
+                        break
 
-                        logger.info(
-                            f"✨ Yeni en iyi! Deneme {attempt + 1}: "
-                            f"Puan={total_score:.2f}, Strateji={strategy}"
-                        )
+                # İlerleme güncelle
+                if progress_callback:
+                    elapsed = time.perf_counter() - started
+                    if attempts_deadline is not None:
+                        share = min(1.0, elapsed / max(1e-9, attempts_deadline - started))
+                        text = f"Deneme {attempt + 1} ({elapsed:.0f}/{time_budget:.0f} sn) - Strateji: {strategy}"
                     else:
-                        attempts_without_improvement += 1
+                        share = attempt / max_attempts
+                        text = f"Deneme {attempt + 1}/{max_attempts} - Strateji: {strategy}"
+                    if best_result:
+                        text += f" - En iyi: {best_score:.2f}"
+                    progress_callback(50 + int(share * 45), text)
 
-                    # Mükemmel puan bulunduysa dur (threshold raised to 98 for more thorough optimization)
-                    if total_score >= 98:
-                        logger.info(f"🎉 Mükemmel puan bulundu! ({total_score:.2f})")
-                        break
+                if error is not None:
+                    logger.error(f"Attempt {attempt + 1} error: {error}", exc_info=error)
+                    if scheduler is not None:
+                        scheduler.observe(attempt, None)
+                    continue
 
-                    # İyileşme yoksa dur (only after minimum 50 attempts for diversity)
+                # Pruned iff the attempt's final bound is below the best of the attempts
+                # before it, so the outcome does not depend on the worker count
+                score_bound = result.get('score_bound')
+                if prune_enabled and best_result and (
+                        result.get('pruned') or
+                        (score_bound is not None and round(score_bound, 2) < best_score)
+                ):
+                    self.attempts_history.append({
+                        'attempt_number': attempt + 1,
+                        'strategy': strategy,
+                        'arm': self._arm_of(attempt_params),
+                        'score': 0,
+                        'schedule': [],
+                        'score_details': {},
+                        'timestamp': datetime.now(),
+                        'result': result,
+                        'pruned': True,
+                        'score_bound': score_bound
+                    })
+                    if scheduler is not None:
+                        scheduler.observe(attempt, None)
+                    attempts_without_improvement += 1
                     if attempts_without_improvement >= max_no_improvement and attempt > 150:
                         logger.info(
                             f"⚠️ {max_no_improvement} denemedir iyileşme yok, durduruluyor..."
                         )
                         break
+                    continue
 
-                except Exception as e:
-                    logger.error(f"Attempt {attempt + 1} error: {e}", exc_info=True)
+                if score_result is None:
+                    logger.warning(f"Attempt {attempt + 1}: Failed to generate schedule")
+                    # Store failed attempt with error details
+                    attempt_record = {
+                        'attempt_number': attempt + 1,
+                        'strategy': strategy,
+                        'arm': self._arm_of(attempt_params),
+                        'score': 0,
+                        'schedule': [],
+                        'score_details': {},
+                        'timestamp': datetime.now(),
+                        'result': result,
+                        'failed': True,
+                        'error_message': result.get('message', 'Bilinmeyen hata')
+                    }
+                    self.attempts_history.append(attempt_record)
+                    if scheduler is not None:
+                        scheduler.observe(attempt, None)
                     continue
 
+                total_score = score_result['total_score']
+                if scheduler is not None:
+                    scheduler.observe(attempt, total_score)
+
+                # Kaydet
+                attempt_record = {
+                    'attempt_number': attempt + 1,
+                    'strategy': strategy,
+                    'arm': self._arm_of(attempt_params),
+                    'score': total_score,
+                    'schedule': result['schedule'],
+                    'score_details': score_result,
+                    'timestamp': datetime.now(),
+                    'result': result,
+                    'attempt_params': attempt_params,
+                    # Worker results carry only the score; the schedule is rebuilt for the winner
+                    'remote': bool(result.get('remote'))
+                }
+
+                self.attempts_history.append(attempt_record)
+
+                # En iyi kontrol
+                if total_score > best_score:
+                    best_score = total_score
+                    best_result = attempt_record
+                    time_to_best = time.perf_counter() - started
+                    attempts_without_improvement = 0
+
+                    logger.info(
+                        f"✨ Yeni en iyi! Deneme {attempt + 1}: "
+                        f"Puan={total_score:.2f}, Strateji={strategy}"
+                    )
+                else:
+                    attempts_without_improvement += 1
+
+                # Mükemmel puan bulunduysa dur (threshold raised to 98 for more thorough optimization)
+                if total_score >= 98:
+                    logger.info(f"🎉 Mükemmel puan bulundu! ({total_score:.2f})")
+                    break
+
+                # İyileşme yoksa dur (only after minimum 50 attempts for diversity)
+                if attempts_without_improvement >= max_no_improvement and attempt > 150:
+                    logger.info(
+                        f"⚠️ {max_no_improvement} denemedir iyileşme yok, durduruluyor..."
+                    )
+                    break
+
+            # Stop pool workers still running speculative attempts
+            close = getattr(outcomes, 'close', None)
+            if close:
+                close()
+
+            if best_result and best_result.get('remote'):
+                best_result = self._materialize_remote_result(best_result, planning_function, params)
+
+            # Optional local search stage on the winner (params['local_search_seconds'] > 0);
+            # in anytime mode it gets whatever is left of the budget
+            local_search = None
+            if deadline is not None:
+                local_search_seconds = deadline - time.perf_counter() if local_search_seconds > 0 else 0
+            if best_result and not cancelled and local_search_seconds > 0:
+                if progress_callback:
+                    progress_callback(96, f"Yerel arama ile iyileştiriliyor... - En iyi: {best_score:.2f}")
+                search_started = time.perf_counter() - started
+                local_search = self._improve_best_result(
+                    best_result, planning_function, params, base_seed, local_search_seconds, should_stop
+                )
+                if local_search and local_search['applied']:
+                    best_score = best_result['score']
+                    time_to_best = search_started + local_search['time_to_best_s']
+                # Cancelled during the search: its best so far is kept
+                cancelled = bool(should_stop and should_stop())
+
+            elapsed = time.perf_counter() - started
+            timing = {
+                'elapsed_seconds': round(elapsed, 3),
+                'attempts_per_second': round(len(self.attempts_history) / elapsed, 2) if elapsed > 0 else 0.0,
+                'time_to_best': round(time_to_best, 3) if time_to_best is not None else None,
+                'time_budget': time_budget or None,
+                'cancelled': cancelled
+            }
+
             if not best_result:
                 # Analyze why all attempts failed
                 failure_analysis = self._analyze_failures(self.attempts_history)
                 
                 return {
                     'success': False,
-                    'message': failure_analysis['message'],
+                    'message': "⏹️ Planlama iptal edildi." if cancelled else failure_analysis['message'],
                     'details': failure_analysis['details'],
                     'suggestions': failure_analysis['suggestions'],
-                    'attempts_count': len(self.attempts_history)
+                    'attempts_count': len(self.attempts_history),
+                    **timing
                 }
 
             # En iyi sonucu döndür
             logger.info(f"✅ En iyi sonuç: Puan={best_score:.2f}, Deneme={best_result['attempt_number']}")
+            pruned_attempts = sum(1 for h in self.attempts_history if h.get('pruned'))
+            failed_attempts = sum(1 for h in self.attempts_history if h.get('failed'))
+            logger.info(f"✂️ {pruned_attempts} deneme budandı, ❌ {failed_attempts} deneme başarısız")
+            logger.info(
+                f"⏱️ {timing['elapsed_seconds']:.1f}s, {timing['attempts_per_second']:.1f} deneme/sn, "
+                f"en iyiye {timing['time_to_best']:.1f}s"
+            )
 
             # score_details'e attempt bilgisini ekle
             score_details_with_attempt = best_result['score_details'].copy()
@@ -191,7 +388,7 @@ class AttemptManager:
             score_details_with_attempt['total_attempts'] = len(self.attempts_history)
             score_details_with_attempt['strategy_used'] = best_result['strategy']
 
-            return {
+            outcome = {
                 'success': True,
                 'schedule': best_result['schedule'],
                 'score': best_score,
@@ -200,9 +397,31 @@ class AttemptManager:
                 'total_attempts': len(self.attempts_history),
                 'strategy_used': best_result['strategy'],
                 'attempts_history': self._get_summary_history(),
+                'attempt_scheduler': scheduler_name,
+                'scheduler_stats': scheduler.arm_stats() if scheduler is not None else [],
+                'stats': best_result['result'].get('stats', {}),
                 'base_seed': base_seed,
-                'message': self._format_success_message(best_result, len(self.attempts_history))
+                'parallel_workers': workers,
+                'pruned_attempts': pruned_attempts,
+                'failed_attempts': failed_attempts,
+                'local_search': local_search,
+                **timing,
+                'message': self._format_success_message(best_result, len(self.attempts_history), timing)
             }
+            stored = False
+            if cache_entry and not cancelled:
+                stored = self.result_cache.put(
+                    cache_entry['key'], params['bolum_id'], cache_entry['fingerprint'], cache_entry['seed_params'],
+                    {k: best_result['attempt_params'][k] for k in WARM_START_KEYS if k in best_result['attempt_params']},
+                    outcome
+                )
+            outcome['cache'] = {
+                'hit': False,
+                'stored': stored,
+                # Replayed variant: cached score, its score under the new params, changed params
+                'warm_start': {k: v for k, v in warm_start.items() if k != 'variant'} if warm_start else None
+            }
+            return outcome
 
         except Exception as e:
             logger.error(f"Multiple attempts error: {e}", exc_info=True)
@@ -219,27 +438,279 @@ class AttemptManager:
                 'error': str(e)
             }
 
-    def _get_summary_history(self) -> List[Dict]:
-        """Özet deneme geçmişi"""
-        return [
+    def _open_cache_entry(self, planning_function: Callable, params: Dict, max_attempts: int) -> Optional[Dict]:
+        """Cache key of this run, its cached result and, on a miss, a warm-start candidate
+
+        None without a cache, with randomize=True or without a planner snapshot.
+        """
+        if self.result_cache is None or params.get('randomize', False):
+            return None
+        planner = getattr(planning_function, '__self__', None)
+        if planner is None or not hasattr(planner, 'get_snapshot'):
+            return None
+
+        fingerprint = planner.get_snapshot(params['bolum_id']).fingerprint()
+        seed_params = self._normalize_params_for_seed(params)
+        search_params = {
+            k: v for k, v in params.items()
+            if k not in CACHE_IGNORED_KEYS and k not in seed_params
+        }
+        search_params['max_attempts'] = max_attempts
+        entry = {
+            'key': PlanningResultCache.make_key(seed_params, search_params, fingerprint),
+            'fingerprint': fingerprint,
+            'seed_params': seed_params,
+            'warm': None
+        }
+        entry['cached'] = self.result_cache.get(entry['key'])
+        if entry['cached'] is None and params.get('warm_start', True):
+            entry['warm'] = self.result_cache.find_warm_start(params['bolum_id'], fingerprint, seed_params)
+        return entry
+
+    def _cached_result(self, cached: Dict, started: float) -> Dict:
+        result = dict(cached)
+        result['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        result['cache'] = {'hit': True, 'stored': False, 'warm_start': None}
+        result['message'] = (
+            "♻️ Girdiler değişmedi, önceki en iyi program önbellekten alındı.\n\n" + cached.get('message', '')
+        )
+        return result
+
+    def _run_warm_start(self, planning_function: Callable, params: Dict, warm_start: Dict) -> Optional[Dict]:
+        """Replay the cached best attempt's variant under the new params as attempt 0"""
+        attempt_params = dict(params, **warm_start['variant'])
+        attempt_params['prune_below'] = None
+        try:
+            result, score_result = execute_attempt(planning_function, self.scorer, params, attempt_params)
+        except Exception as e:
+            logger.warning(f"⚠️ Sıcak başlangıç denemesi hata verdi: {e}")
+            return None
+        if score_result is None:
+            logger.info("🔥 Sıcak başlangıç yeni parametrelerle başarısız, normal arama yapılıyor")
+            return None
+
+        logger.info(
+            f"🔥 Sıcak başlangıç: önbellekteki puan {warm_start['score']:.2f} → {score_result['total_score']:.2f} "
+            f"(değişen: {', '.join(warm_start['changed']) or 'arama ayarları'})"
+        )
+        record = {
+            'attempt_number': 0,
+            'strategy': attempt_params['order_strategy'],
+            'arm': self._arm_of(attempt_params),
+            'score': score_result['total_score'],
+            'schedule': result['schedule'],
+            'score_details': score_result,
+            'timestamp': datetime.now(),
+            'result': result,
+            'attempt_params': attempt_params,
+            'remote': False,
+            'warm_start': True
+        }
+        self.attempts_history.append(record)
+        return record
+
+    def _build_attempt_params(self, params: Dict, attempt: int, strategies: List[str], base_seed: int) -> Dict:
+        """Parameters of one attempt; depends only on (base_seed, attempt) so that
+        sequential and parallel runs explore exactly the same attempts"""
+        # Rastgelelik ekle (her denemede FARKLI sonuç için)
+        # Different attempts = different seeds, same click = same results
+        random_seed = base_seed + attempt * 1000
+
+        # Strateji seç (döngüsel + rastgele)
+        if attempt < len(strategies):
+            strategy = strategies[attempt]
+        else:
+            strategy = random.Random(random_seed).choice(strategies)
+
+        # Parametreleri kopyala ve strateji ekle
+        attempt_params = params.copy()
+        attempt_params['order_strategy'] = strategy
+        attempt_params['attempt_number'] = attempt
+        attempt_params['random_seed'] = random_seed
+        # Rotate days per attempt to increase diversity while preserving spread
+        attempt_params['rotate_days'] = True
+        return attempt_params
+
+    def _build_scheduler(self, strategies: List[str], params: Dict) -> UCB1Scheduler:
+        """Bandit over the attempt variants; the configured coloring comes first
+
+        tabucol costs ~20x a greedy/DSatur attempt, so it is only explored when configured.
+        """
+        coloring = params.get('coloring_algorithm', DEFAULT_COLORING_ALGORITHM)
+        colorings = [coloring] + [c for c in COLORING_ALGORITHMS if c not in (coloring, 'tabucol')]
+        return UCB1Scheduler(strategies, (True, False), colorings)
+
+    def _arm_of(self, attempt_params: Dict) -> str:
+        return arm_label((
+            attempt_params['order_strategy'],
+            bool(attempt_params.get('rotate_days', True)),
+            attempt_params.get('coloring_algorithm', DEFAULT_COLORING_ALGORITHM)
+        ))
+
+    def _iter_sequential_attempts(
+            self,
+            planning_function: Callable,
+            params: Dict,
+            make_attempt_params: Callable[[int], Dict],
+            max_attempts: int
+    ) -> Iterator[Tuple]:
+        """Run attempts one after another in this thread"""
+        for attempt in range(max_attempts):
+            attempt_params = make_attempt_params(attempt)
+            try:
+                result, score_result = execute_attempt(planning_function, self.scorer, params, attempt_params)
+                yield attempt, attempt_params, result, score_result, None
+            except Exception as e:
+                yield attempt, attempt_params, None, None, e
+
+    def _resolve_worker_count(self, params: Dict, max_attempts: int) -> int:
+        """Number of planning processes requested (1 = sequential)"""
+        try:
+            workers = int(params.get('parallel_workers', 1) or 1)
+        except (TypeError, ValueError):
+            workers = 1
+        workers = min(workers, os.cpu_count() or 1, max_attempts)
+        return max(1, workers)
+
+    def _get_planning_snapshot(self, planning_function: Callable, params: Dict):
+        """Snapshot to ship to worker processes; None if the planner has none"""
+        planner = getattr(planning_function, '__self__', None)
+        if planner is None or not hasattr(planner, 'get_snapshot'):
+            logger.warning("Paralel mod için planlama snapshot'ı yok, sıralı moda geçiliyor")
+            return None
+        return planner.get_snapshot(params['bolum_id'])
+
+    def _materialize_remote_result(self, record: Dict, planning_function: Callable, params: Dict) -> Dict:
+        """Rebuild the full schedule of a worker-scored attempt in this process"""
+        # No pruning threshold: the winner must be rebuilt in full
+        attempt_params = dict(record['attempt_params'], prune_below=None)
+        result, score_result = execute_attempt(
+            planning_function, self.scorer, params, attempt_params
+        )
+        if score_result is None:
+            raise RuntimeError(f"Deneme {record['attempt_number']} yeniden oluşturulamadı")
+        if score_result['total_score'] != record['score']:
+            logger.warning(
+                f"Deneme {record['attempt_number']} yeniden oluşturuldu, puan farklı: "
+                f"{record['score']} → {score_result['total_score']}"
+            )
+
+        record.update({
+            'score': score_result['total_score'],
+            'schedule': result['schedule'],
+            'score_details': score_result,
+            'result': result,
+            'remote': False
+        })
+        return record
+
+    def _improve_best_result(
+            self,
+            record: Dict,
+            planning_function: Callable,
+            params: Dict,
+            seed: int,
+            seconds: float,
+            should_stop: Optional[Callable[[], bool]] = None
+    ) -> Optional[Dict]:
+        """Run the planner's local search on the best attempt; keep it only if it scores higher
+
+        Returns the search stats (None if the planner has no local search or it failed).
+        """
+        planner = getattr(planning_function, '__self__', None)
+        improve = getattr(planner, 'improve_schedule', None)
+        if improve is None:
+            logger.warning("Planlayıcıda yerel arama yok, atlanıyor")
+            return None
+
+        result = record['result']
+        try:
+            outcome = improve(result, params, seconds, seed=seed, scorer=self.scorer, should_stop=should_stop)
+        except Exception as e:
+            logger.error(f"Local search error: {e}", exc_info=True)
+            return None
+        if outcome is None:
+            return None
+
+        # The full scorer has the final word on the improved schedule
+        score_result = self.scorer.score_schedule(
+            outcome['schedule'],
+            result.get('course_students', {}),
+            result.get('course_info', {}),
+            params,
+            conflict_graph=result.get('conflict_graph')
+        )
+        stats = dict(outcome['stats'], verified_score=score_result['total_score'])
+        stats['applied'] = score_result['total_score'] > record['score']
+        if stats['applied']:
+            logger.info(f"🔧 Yerel arama uygulandı: {record['score']:.2f} → {score_result['total_score']:.2f}")
+            record.update({
+                'score': score_result['total_score'],
+                'schedule': outcome['schedule'],
+                'score_details': score_result,
+                'result': dict(result, schedule=outcome['schedule'])
+            })
+        return stats
+
+    def _get_summary_history(self) -> Dict:
+        """Özet deneme geçmişi ve kol (strateji/gün kaydırma/renklendirme) istatistikleri
+
+        Returns {'attempts': [...], 'arms': [...]}, arms sorted by best score.
+        """
+        attempts = [
             {
                 'attempt': h['attempt_number'],
                 'strategy': h['strategy'],
+                'arm': h.get('arm'),
                 'score': h['score'],
+                'failed': bool(h.get('failed')),
+                'pruned': bool(h.get('pruned')),
                 'timestamp': h['timestamp'].isoformat()
             }
             for h in self.attempts_history
         ]
 
-    def _format_success_message(self, best_result: Dict, total_attempts: int) -> str:
+        arms: Dict[str, Dict] = {}
+        for h in self.attempts_history:
+            stats = arms.setdefault(h.get('arm'), {
+                'arm': h.get('arm'), 'plays': 0, 'successes': 0, 'pruned': 0, 'failed': 0,
+                'best_score': 0.0, 'mean_score': 0.0
+            })
+            stats['plays'] += 1
+            if h.get('pruned'):
+                stats['pruned'] += 1
+            elif h.get('failed'):
+                stats['failed'] += 1
+            else:
+                stats['successes'] += 1
+                stats['mean_score'] += h['score']
+                stats['best_score'] = max(stats['best_score'], h['score'])
+        for stats in arms.values():
+            if stats['successes']:
+                stats['mean_score'] = round(stats['mean_score'] / stats['successes'], 2)
+
+        return {
+            'attempts': attempts,
+            'arms': sorted(arms.values(), key=lambda a: (-a['best_score'], -a['plays']))
+        }
+
+    def _format_success_message(self, best_result: Dict, total_attempts: int, timing: Optional[Dict] = None) -> str:
         """Başarı mesajı formatla"""
         score = best_result['score']
         score_details = best_result['score_details']
 
         msg = f"✅ En iyi program oluşturuldu!\n\n"
+        if timing and timing.get('cancelled'):
+            msg = f"⏹️ Planlama durduruldu, bulunan en iyi program korundu.\n\n"
         msg += f"📊 Toplam Puan: {score:.2f}/100\n"
         msg += f"🔄 Deneme: {best_result['attempt_number']}/{total_attempts}\n"
-        msg += f"🎯 Strateji: {best_result['strategy']}\n\n"
+        msg += f"🎯 Strateji: {best_result['strategy']}\n"
+        if timing:
+            msg += (
+                f"⏱️ Süre: {timing['elapsed_seconds']:.1f} sn "
+                f"({timing['attempts_per_second']:.1f} deneme/sn, en iyiye {timing['time_to_best']:.1f} sn)\n"
+            )
+        msg += "\n"
 
         # Bonuslar
         bonuses = score_details.get('bonuses', [])
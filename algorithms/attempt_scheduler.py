@@ -0,0 +1,147 @@
+"""
+Deneme Zamanlayıcı (Attempt Scheduler)
+Chooses the variant (order strategy × day rotation × coloring) of each planning attempt
+"""
+
+import logging
+import math
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ATTEMPT_SCHEDULERS = ('uniform', 'ucb1')
+DEFAULT_ATTEMPT_SCHEDULER = 'uniform'
+
+# The choice for attempt k only uses the results of attempts < k - FEEDBACK_DELAY.
+# Parallel runs submit at most this many attempts ahead, so they see the same
+# results and choose the same arms as a sequential run.
+FEEDBACK_DELAY = 16
+
+# UCB1 exploration constant (rewards are percentiles in [0, 1])
+UCB_EXPLORATION = 1.0
+
+# (order_strategy, rotate_days, coloring_algorithm)
+Arm = Tuple[str, bool, str]
+
+
+def arm_label(arm: Arm) -> str:
+    strategy, rotate_days, coloring = arm
+    return f"{strategy}/{'rotate' if rotate_days else 'fixed'}/{coloring}"
+
+
+class _Dimension:
+    """UCB1 statistics of one variant dimension (e.g. the order strategies)"""
+
+    def __init__(self, options: Sequence):
+        self.options = list(options)
+        self.plays = [0] * len(self.options)
+        self.observed = [0] * len(self.options)
+        self.reward_sums = [0.0] * len(self.options)
+
+
+class UCB1Scheduler:
+    """Factored UCB1 bandit over attempt variants, with delayed feedback
+
+    Every dimension (order strategy, day rotation, coloring) is its own UCB1
+    bandit sharing the attempt's reward, so 7 + 2 + 3 options are learned
+    instead of 42 combinations - a few hundred attempts are enough to exploit.
+    Only the best schedule counts, so the reward of a successful attempt is the
+    percentile of its score among the scores seen so far (arms that reach the
+    top get rewarded, not those with a good average); failed and pruned
+    attempts get 0. Unplayed options
+    go first (in the given order, so the first arm is the configured variant).
+    Plays count as soon as an option is chosen, so attempts whose results are
+    not visible yet still spread over the options.
+
+    choose() must be called for attempts 0, 1, 2, ... in order and observe()
+    for every attempt up to k - FEEDBACK_DELAY before choose(k) - the order in
+    which AttemptManager processes attempts. Choices are then deterministic.
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[str],
+        rotations: Sequence[bool],
+        colorings: Sequence[str],
+        feedback_delay: int = FEEDBACK_DELAY,
+        exploration: float = UCB_EXPLORATION
+    ):
+        if not strategies or not rotations or not colorings:
+            raise ValueError("Her boyutta en az bir seçenek gerekli")
+        self.dimensions = [_Dimension(strategies), _Dimension(rotations), _Dimension(colorings)]
+        self.feedback_delay = int(feedback_delay)
+        self.exploration = float(exploration)
+
+        self.scores: List[float] = []  # sorted scores of the folded successful attempts
+
+        self._chosen: Dict[int, Tuple[int, ...]] = {}  # attempt -> option index per dimension
+        self._scores: Dict[int, Optional[float]] = {}  # attempt -> score, until folded in
+        self._folded = 0  # attempts < _folded are in the dimension statistics
+        self._total = 0
+
+    def choose(self, attempt: int) -> Arm:
+        if attempt not in self._chosen:
+            self._fold(attempt - self.feedback_delay)
+            self._total += 1
+            indices = tuple(self._select(dimension) for dimension in self.dimensions)
+            for dimension, index in zip(self.dimensions, indices):
+                dimension.plays[index] += 1
+            self._chosen[attempt] = indices
+        indices = self._chosen[attempt]
+        return tuple(d.options[i] for d, i in zip(self.dimensions, indices))
+
+    def observe(self, attempt: int, score: Optional[float]) -> None:
+        """Record an attempt's score (None for failed or pruned attempts)"""
+        if attempt in self._chosen and attempt >= self._folded:
+            self._scores[attempt] = score
+
+    def _fold(self, until: int) -> None:
+        """Move the results of attempts < until into the statistics"""
+        while self._folded < until:
+            attempt = self._folded
+            self._folded += 1
+            indices = self._chosen.get(attempt)
+            if indices is None or attempt not in self._scores:
+                continue
+            score = self._scores.pop(attempt)
+            reward = 0.0
+            if score is not None:
+                # A score seen before is (almost always) a schedule seen before: no reward
+                below = bisect_left(self.scores, score)
+                repeated = below < len(self.scores) and self.scores[below] == score
+                insort(self.scores, score)
+                if not repeated:
+                    reward = below / (len(self.scores) - 1) if len(self.scores) > 1 else 1.0
+            for dimension, index in zip(self.dimensions, indices):
+                dimension.observed[index] += 1
+                dimension.reward_sums[index] += reward
+
+    def _mean_reward(self, dimension: _Dimension, index: int) -> float:
+        if not dimension.observed[index]:
+            return 1.0  # no visible result yet: optimistic
+        return dimension.reward_sums[index] / dimension.observed[index]
+
+    def _select(self, dimension: _Dimension) -> int:
+        for i, plays in enumerate(dimension.plays):
+            if not plays:
+                return i
+
+        log_total = math.log(self._total)
+        best, best_value = 0, -math.inf
+        for i, plays in enumerate(dimension.plays):
+            value = self._mean_reward(dimension, i) + self.exploration * math.sqrt(log_total / plays)
+            if value > best_value:
+                best, best_value = i, value
+        return best
+
+    def arm_stats(self) -> List[Dict]:
+        """Per-option plays and mean reward of every dimension"""
+        stats = []
+        for name, dimension in zip(('order_strategy', 'rotate_days', 'coloring_algorithm'), self.dimensions):
+            for i, option in enumerate(dimension.options):
+                stats.append({
+                    'dimension': name, 'option': option, 'plays': dimension.plays[i],
+                    'mean_reward': round(self._mean_reward(dimension, i), 3) if dimension.observed[i] else None
+                })
+        return stats
@@ -0,0 +1,171 @@
+"""
+Ders Çakışma Grafiği (Conflict Graph)
+Builds course conflict adjacency, overlap weights and degrees in one pass
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ConflictGraph:
+    """Course conflict graph backed by a sparse enrollment matrix
+
+    Student numbers are interned into dense integer ids and enrollments are
+    stored as a CSR incidence matrix (one row per course). All pairwise
+    overlap counts come from the sparse product A·Aᵀ, evaluated by expanding
+    each student's sorted course row into course pairs and counting them, so
+    the cost is proportional to the enrollments rather than to courses².
+
+    The graph is built once per course set and threshold and shared by
+    coloring, course ordering and scoring; treat it as read-only.
+    """
+
+    def __init__(self, course_students: Dict[int, Iterable[str]], min_overlap: int = 1):
+        self.course_ids: List[int] = list(course_students.keys())
+        self.course_index: Dict[int, int] = {cid: i for i, cid in enumerate(self.course_ids)}
+        self.min_overlap = int(min_overlap)
+
+        # Intern student numbers into dense ids and build the CSR rows
+        self.student_index: Dict[str, int] = {}
+        self.student_numbers: List[str] = []
+        indptr = [0]
+        indices: List[int] = []
+        for cid in self.course_ids:
+            for ogrenci_no in course_students[cid]:
+                sid = self.student_index.get(ogrenci_no)
+                if sid is None:
+                    sid = self.student_index[ogrenci_no] = len(self.student_numbers)
+                    self.student_numbers.append(ogrenci_no)
+                indices.append(sid)
+            indptr.append(len(indices))
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.course_sizes = np.diff(self.indptr)
+
+        self.weights: Dict[Tuple[int, int], int] = {}
+        self.adjacency: Dict[int, Set[int]] = {}
+        self.degrees: Dict[int, int] = {}
+        self.edge_count = 0
+
+        # Derived lookups built on first use (placement-loop helpers)
+        self._student_masks: Dict[int, int] = {}
+        self._student_courses: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        self._build()
+
+    @property
+    def student_count(self) -> int:
+        return len(self.student_index)
+
+    def _pair_overlaps(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Upper triangle of A·Aᵀ as (row, col, count) arrays of course indices"""
+        n = len(self.course_ids)
+        course_of = np.repeat(np.arange(n, dtype=np.int64), self.course_sizes)
+
+        # Group enrollments by student, courses ascending within a student
+        order = np.lexsort((course_of, self.indices))
+        students = self.indices[order]
+        courses = course_of[order]
+
+        # Entries d apart belonging to the same student form a course pair;
+        # once no student has d+1 courses there are no longer runs either
+        codes = []
+        d = 1
+        while d < len(students):
+            same = students[d:] == students[:-d]
+            if not same.any():
+                break
+            codes.append(courses[:-d][same] * n + courses[d:][same])
+            d += 1
+
+        if not codes:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+
+        pair_codes, counts = np.unique(np.concatenate(codes), return_counts=True)
+        return pair_codes // n, pair_codes % n, counts
+
+    def _build(self) -> None:
+        """Compute weights, adjacency and degrees"""
+        n = len(self.course_ids)
+        rows, cols, counts = self._pair_overlaps()
+        ids = self.course_ids
+
+        for i, j, c in zip(rows.tolist(), cols.tolist(), counts.tolist()):
+            a, b = ids[i], ids[j]
+            self.weights[(a, b) if a < b else (b, a)] = c
+
+        if self.min_overlap <= 0:
+            # Every pair satisfies "overlap >= threshold": complete graph
+            if n > 1:
+                for cid in ids:
+                    self.adjacency[cid] = set(ids)
+                    self.adjacency[cid].discard(cid)
+            self.edge_count = n * (n - 1) // 2
+        else:
+            keep = counts >= self.min_overlap
+            edge_rows = rows[keep].tolist()
+            edge_cols = cols[keep].tolist()
+            for i, j in zip(edge_rows, edge_cols):
+                a, b = ids[i], ids[j]
+                self.adjacency.setdefault(a, set()).add(b)
+                self.adjacency.setdefault(b, set()).add(a)
+            self.edge_count = len(edge_rows)
+
+        self.degrees = {cid: len(self.adjacency.get(cid, ())) for cid in ids}
+
+    def neighbors(self, ders_id: int) -> Set[int]:
+        """Conflicting courses of a course (empty if none)"""
+        return self.adjacency.get(ders_id, set())
+
+    def overlap(self, ders_id1: int, ders_id2: int) -> int:
+        """Number of students shared by two courses"""
+        key = (ders_id1, ders_id2) if ders_id1 < ders_id2 else (ders_id2, ders_id1)
+        return self.weights.get(key, 0)
+
+    def student_ids(self, ders_id: int) -> np.ndarray:
+        """Dense student ids enrolled in a course"""
+        i = self.course_index[ders_id]
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def student_mask(self, ders_id: int) -> int:
+        """Enrolled students of a course as a bitset (bit i = dense student id i)
+
+        Overlap of two courses is popcount(mask_a & mask_b); masks are built
+        once per course and cached.
+        """
+        mask = self._student_masks.get(ders_id)
+        if mask is None:
+            bits = np.zeros(self.student_count, dtype=bool)
+            bits[self.student_ids(ders_id)] = True
+            mask = int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+            self._student_masks[ders_id] = mask
+        return mask
+
+    def student_courses(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Transposed CSR (indptr, course indices): the courses of every student"""
+        if self._student_courses is None:
+            course_of = np.repeat(np.arange(len(self.course_ids), dtype=np.int64), self.course_sizes)
+            order = np.argsort(self.indices, kind='stable')
+            counts = np.bincount(self.indices, minlength=self.student_count)
+            indptr = np.zeros(self.student_count + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            self._student_courses = (indptr, course_of[order])
+        return self._student_courses
+
+    def courses_of_students(self, student_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(course indices, lengths): the courses of each given student, concatenated"""
+        indptr, courses = self.student_courses()
+        starts = indptr[student_ids]
+        lengths = indptr[student_ids + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return courses[:0], lengths
+        # Ragged gather: position k of student j maps to starts[j] + k
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return courses[np.arange(total, dtype=np.int64) + offsets], lengths
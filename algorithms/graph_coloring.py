@@ -0,0 +1,214 @@
+"""
+Graf Renklendirme Motoru (Graph Coloring Engine)
+Greedy, DSatur and TabuCol colorings of the course conflict graph
+"""
+
+import heapq
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+COLORING_ALGORITHMS = ('greedy', 'dsatur', 'tabucol')
+DEFAULT_COLORING_ALGORITHM = 'dsatur'
+
+
+def greedy_coloring(
+    courses: List[int],
+    conflicts: Dict[int, Set[int]],
+    max_colors: int,
+    rng: random.Random
+) -> Optional[Dict[int, int]]:
+    """Largest-degree-first greedy with a 70/30 random color pick (legacy behaviour)"""
+    degrees = {cid: len(conflicts.get(cid, ())) for cid in courses}
+    sorted_courses = sorted(courses, key=lambda x: (-degrees[x], rng.random()))
+
+    coloring: Dict[int, int] = {}
+    for cid in sorted_courses:
+        used_colors = {coloring[n] for n in conflicts.get(cid, ()) if n in coloring}
+
+        # First five free colors are enough for the pick
+        available_colors = []
+        color = 0
+        while color < max_colors and len(available_colors) < 5:
+            if color not in used_colors:
+                available_colors.append(color)
+            color += 1
+
+        if not available_colors:
+            return None
+
+        if rng.random() < 0.7 or len(available_colors) == 1:
+            coloring[cid] = available_colors[0]
+        else:
+            coloring[cid] = rng.choice(available_colors)
+
+    return coloring
+
+
+def dsatur_coloring(
+    courses: List[int],
+    conflicts: Dict[int, Set[int]],
+    rng: random.Random
+) -> Dict[int, int]:
+    """DSatur: always color the uncolored course with the most distinct neighbor colors
+
+    Saturation is tracked in a max-heap with lazy invalidation; ties are broken
+    by degree and then by a per-attempt random key.
+    """
+    degrees = {cid: len(conflicts.get(cid, ())) for cid in courses}
+    tiebreak = {cid: rng.random() for cid in courses}
+    neighbor_colors: Dict[int, Set[int]] = {cid: set() for cid in courses}
+
+    heap = [(0, -degrees[cid], tiebreak[cid], cid) for cid in courses]
+    heapq.heapify(heap)
+
+    coloring: Dict[int, int] = {}
+    while heap:
+        neg_sat, _, _, cid = heapq.heappop(heap)
+        if cid in coloring or -neg_sat != len(neighbor_colors[cid]):
+            continue  # stale entry
+
+        taken = neighbor_colors[cid]
+        color = 0
+        while color in taken:
+            color += 1
+        coloring[cid] = color
+
+        for neighbor in conflicts.get(cid, ()):
+            if neighbor in coloring or neighbor not in neighbor_colors:
+                continue
+            seen = neighbor_colors[neighbor]
+            if color not in seen:
+                seen.add(color)
+                heapq.heappush(heap, (-len(seen), -degrees[neighbor], tiebreak[neighbor], neighbor))
+
+    return coloring
+
+
+def tabucol(
+    courses: List[int],
+    conflicts: Dict[int, Set[int]],
+    initial: Dict[int, int],
+    k: int,
+    rng: random.Random,
+    max_iterations: int = 2000
+) -> Optional[Dict[int, int]]:
+    """TabuCol: search for a conflict-free k-coloring starting from `initial`
+
+    Colors >= k in the initial coloring are re-drawn at random. Returns None if
+    no proper k-coloring is found within the iteration budget.
+    """
+    index = {cid: i for i, cid in enumerate(courses)}
+    adj = [[index[n] for n in conflicts.get(cid, ()) if n in index] for cid in courses]
+    colors = [initial[cid] if initial[cid] < k else rng.randrange(k) for cid in courses]
+
+    # gamma[v][c]: neighbors of v currently colored c
+    gamma = [[0] * k for _ in courses]
+    for v, neighbors in enumerate(adj):
+        row = gamma[v]
+        for u in neighbors:
+            row[colors[u]] += 1
+
+    violations = sum(gamma[v][colors[v]] for v in range(len(courses))) // 2
+    tabu: Dict[tuple, int] = {}
+    best_violations = violations
+
+    for iteration in range(max_iterations):
+        if violations == 0:
+            break
+
+        best_move = None
+        best_delta = None
+        for v in range(len(courses)):
+            current = gamma[v][colors[v]]
+            if current == 0:
+                continue
+            for c in range(k):
+                if c == colors[v]:
+                    continue
+                delta = gamma[v][c] - current
+                is_tabu = tabu.get((v, c), -1) > iteration
+                if is_tabu and violations + delta >= best_violations:
+                    continue  # tabu and no aspiration
+                if best_delta is None or delta < best_delta or (delta == best_delta and rng.random() < 0.5):
+                    best_delta = delta
+                    best_move = (v, c)
+
+        if best_move is None:
+            break
+
+        v, c = best_move
+        old = colors[v]
+        colors[v] = c
+        for u in adj[v]:
+            gamma[u][old] -= 1
+            gamma[u][c] += 1
+        violations += best_delta
+        best_violations = min(best_violations, violations)
+        tabu[(v, old)] = iteration + int(0.6 * violations) + rng.randrange(10) + 1
+
+    if violations != 0:
+        return None
+    return {cid: colors[i] for i, cid in enumerate(courses)}
+
+
+def color_conflict_graph(
+    courses: List[int],
+    conflicts: Dict[int, Set[int]],
+    max_colors: int,
+    algorithm: str = DEFAULT_COLORING_ALGORITHM,
+    rng: Optional[random.Random] = None,
+    tabu_iterations: int = 2000
+) -> Dict:
+    """
+    Color the conflict graph with the selected algorithm
+
+    'tabucol' runs DSatur and then lowers the color count one step at a time
+    with TabuCol until a step fails.
+
+    Returns:
+        {'success', 'coloring', 'colors_used', 'algorithm', 'time_ms', 'message'}
+    """
+    rng = rng or random.Random()
+    max_colors = int(max_colors)
+    if algorithm not in COLORING_ALGORITHMS:
+        logger.warning(f"⚠️ Unknown coloring algorithm '{algorithm}', using {DEFAULT_COLORING_ALGORITHM}")
+        algorithm = DEFAULT_COLORING_ALGORITHM
+
+    start = time.perf_counter()
+    if algorithm == 'greedy':
+        coloring = greedy_coloring(courses, conflicts, max_colors, rng)
+    else:
+        coloring = dsatur_coloring(courses, conflicts, rng)
+        if algorithm == 'tabucol' and coloring:
+            k = max(coloring.values()) + 1
+            while k > 1:
+                reduced = tabucol(courses, conflicts, coloring, k - 1, rng, tabu_iterations)
+                if reduced is None:
+                    break
+                coloring = reduced
+                k -= 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    colors_used = len(set(coloring.values())) if coloring else 0
+    if coloring is None or colors_used > max_colors:
+        return {
+            'success': False,
+            'coloring': None,
+            'colors_used': colors_used,
+            'algorithm': algorithm,
+            'time_ms': elapsed_ms,
+            'message': f"{len(courses)} ders {max_colors} slota çakışmasız yerleştirilemiyor"
+        }
+
+    return {
+        'success': True,
+        'coloring': coloring,
+        'colors_used': colors_used,
+        'algorithm': algorithm,
+        'time_ms': elapsed_ms,
+        'message': f"{colors_used} renk kullanıldı"
+    }
@@ -0,0 +1,550 @@
+"""
+Yerel Arama İyileştirmesi (Local Search)
+Simulated annealing over a finished schedule with incremental score evaluation
+"""
+
+import logging
+import math
+import random
+import time as clock
+from datetime import date, datetime, time
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from algorithms.room_allocation import DP_MAX_ROOMS, best_fit_decreasing, min_waste_subset
+from algorithms.room_catalog import RoomCatalog
+from algorithms.scoring_system import SinavProgramScorer
+
+logger = logging.getLogger(__name__)
+
+# Proposed move kinds and their shares
+MOVE_TYPES = ('move', 'swap', 'room')
+MOVE_WEIGHTS = (0.5, 0.3, 0.2)
+
+# Annealing temperature in score points, lowered geometrically over the run
+START_TEMPERATURE = 0.5
+END_TEMPERATURE = 0.005
+
+# Weight of the shaping term (raw metrics behind the stepwise criteria) in the
+# annealing objective; it lets the search walk across plateaus of equal score
+SHAPING_WEIGHT = 0.5
+
+MINUTES_PER_DAY = 24 * 60
+
+# (day index, start minute, room indices) of one exam
+Placement = Tuple[int, int, Tuple[int, ...]]
+
+
+def longest_runs(occupied: np.ndarray) -> np.ndarray:
+    """Longest run of consecutive True rows per column of a (days × owners) array"""
+    run = np.zeros(occupied.shape[1], dtype=np.int64)
+    best = np.zeros(occupied.shape[1], dtype=np.int64)
+    for row in occupied:
+        run = (run + 1) * row
+        np.maximum(best, run, out=best)
+    return best
+
+
+class LocalSearchImprover:
+    """Improves a finished schedule by moving its exams between times and rooms
+
+    Moves: one exam to another (day, start), two exams swapping their times,
+    one exam swapping a room for a free one. Hard constraints hold after every
+    move: no exams sharing min_conflict_overlap students at overlapping times
+    (no exams at overlapping times at all with no_parallel_exams), rooms free
+    for the exam plus ara_suresi and covering its students, student_per_day_limit
+    and class_per_day_limit. A moved exam gets its rooms re-packed with the
+    min_waste subset of the free rooms.
+
+    The score is evaluated incrementally: per-student daily maxima, longest
+    runs of exam days and min-gap violations are kept in arrays and recomputed
+    only for the students of moved exams, class and room metrics come from
+    small count tables, and SinavProgramScorer.score_metrics turns them into
+    the same total as score_schedule on the rebuilt schedule.
+    """
+
+    def __init__(
+        self,
+        schedule: List[Dict],
+        course_info: Dict[int, Dict],
+        conflict_graph,
+        derslikler: Sequence[Dict],
+        days: Sequence,
+        start_timeline: Tuple[int, List[int]],
+        params: Dict,
+        scorer: Optional[SinavProgramScorer] = None
+    ):
+        self.graph = conflict_graph
+        self.params = params
+        self.scorer = scorer or SinavProgramScorer()
+        self.catalog = RoomCatalog(derslikler)
+        self.capacities: List[int] = [self.catalog.capacity(i) for i in range(len(self.catalog))]
+
+        self.days: List[date] = [d.date() if isinstance(d, datetime) else d for d in days]
+        if not self.days:
+            raise ValueError("Sınav günü yok")
+        day_of_date = {d: i for i, d in enumerate(self.days)}
+        # Calendar offset of every exam day: runs of consecutive days follow the calendar
+        self.cal: List[int] = [(d - self.days[0]).days for d in self.days]
+
+        # Limits, resolved as the planner and the scorer do
+        self.gap = int(params.get('ara_suresi', 15))
+        self.threshold = int(params.get('min_conflict_overlap', 1))
+        self.no_parallel = bool(params.get('no_parallel_exams', False))
+        self.class_limit = params.get('class_per_day_limit', 0) or 3
+        self.hard_student_limit = int(params.get('student_per_day_limit', 0) or 0)
+        self.student_limit = SinavProgramScorer.student_limit(params)
+
+        # Exams of the schedule (one per course, several rooms each), schedule order
+        room_of_id = {rid: i for i, rid in enumerate(self.catalog.room_ids)}
+        self.courses: List[int] = []
+        self._templates: Dict[int, Dict] = {}
+        rooms: Dict[int, List[int]] = {}
+        for exam in schedule:
+            cid = exam['ders_id']
+            if exam.get('derslik_id') not in room_of_id:
+                raise ValueError(f"Derslik kataloğunda yok: {exam.get('derslik_id')}")
+            if cid not in rooms:
+                self.courses.append(cid)
+                self._templates[cid] = exam
+                rooms[cid] = []
+            rooms[cid].append(room_of_id[exam['derslik_id']])
+
+        self.day: Dict[int, int] = {}
+        self.start: Dict[int, int] = {}
+        self.rooms: Dict[int, Tuple[int, ...]] = {}
+        self.duration: Dict[int, int] = {}
+        self.needed: Dict[int, int] = {}
+        self.sinif: Dict[int, int] = {}
+        for cid in self.courses:
+            exam = self._templates[cid]
+            moment = exam['tarih_saat']
+            if isinstance(moment, str):
+                moment = datetime.fromisoformat(moment)
+            if moment.date() not in day_of_date:
+                raise ValueError(f"Sınav günü planlama aralığında yok: {moment.date()}")
+            self.day[cid] = day_of_date[moment.date()]
+            self.start[cid] = moment.hour * 60 + moment.minute
+            self.rooms[cid] = tuple(rooms[cid])
+            self.duration[cid] = int(exam.get('sure', 60))
+            self.needed[cid] = int(course_info.get(cid, {}).get('ogrenci_sayisi', exam.get('ogrenci_sayisi', 0)))
+            self.sinif[cid] = course_info.get(cid, {}).get('sinif', 0)
+
+        # Candidate starts: starts used by the schedule and the first start, if legal
+        first_start, next_start = start_timeline
+        used_starts = set(self.start.values()) | {first_start}
+        self.starts: List[int] = sorted(
+            m for m in used_starts if 0 <= m < len(next_start) and next_start[m] == m
+        )
+
+        # Per-course columns on the graph's dense course indices (for student gaps)
+        n_courses = len(self.graph.course_ids)
+        self.index: Dict[int, int] = {cid: self.graph.course_index[cid] for cid in self.courses}
+        self.scheduled = np.zeros(n_courses, dtype=bool)
+        self.abs_start = np.zeros(n_courses, dtype=np.int64)
+        self.durations = np.zeros(n_courses, dtype=np.int64)
+        for cid in self.courses:
+            k = self.index[cid]
+            self.scheduled[k] = True
+            self.abs_start[k] = self.cal[self.day[cid]] * MINUTES_PER_DAY + self.start[cid]
+            self.durations[k] = self.duration[cid]
+
+        # Occupancy tables
+        n_cal = self.cal[-1] + 1
+        self.day_courses: List[Set[int]] = [set() for _ in self.days]
+        self.class_count: Dict[Tuple[int, int], int] = {}
+        self.classes: List[int] = sorted({s for s in self.sinif.values() if s})
+        self.class_row: Dict[int, int] = {s: r for r, s in enumerate(self.classes)}
+        self.class_day = np.zeros((len(self.classes), n_cal), dtype=np.int64)
+        self.usage = np.zeros(len(self.catalog), dtype=np.int64)
+        self.load = np.zeros((n_cal, self.graph.student_count), dtype=np.int32)
+        for cid in self.courses:
+            d, sinif = self.day[cid], self.sinif[cid]
+            self.day_courses[d].add(cid)
+            self.class_count[(d, sinif)] = self.class_count.get((d, sinif), 0) + 1
+            if sinif:
+                self.class_day[self.class_row[sinif], self.cal[d]] += 1
+            self.usage[list(self.rooms[cid])] += 1
+            self.load[self.cal[d], self.graph.student_ids(cid)] += 1
+
+        # Per-student metrics and their aggregates (histograms give the maxima)
+        n_students = self.graph.student_count
+        indptr, _ = self.graph.student_courses()
+        max_courses = int(np.diff(indptr).max()) if n_students else 0
+        self.smax = np.zeros(n_students, dtype=np.int64)
+        self.srun = np.zeros(n_students, dtype=np.int64)
+        self.sgap = np.zeros(n_students, dtype=np.int64)
+        self.smax_hist = np.zeros(max_courses + 1, dtype=np.int64)
+        self.srun_hist = np.zeros(n_cal + 1, dtype=np.int64)
+        self.smax_hist[0] = self.srun_hist[0] = n_students
+        self.gap_total = 0
+        everyone = np.arange(n_students, dtype=np.int64)
+        self._set_student_stats(everyone, *self._student_stats(everyone, True))
+
+    # ------------------------------------------------------------------ metrics
+
+    def _student_stats(self, ids: np.ndarray, days_changed: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(daily max, longest run of exam days, min-gap violations) of some students"""
+        if days_changed:
+            sub = self.load[:, ids]
+            smax = sub.max(axis=0).astype(np.int64)
+            srun = longest_runs(sub > 0)
+        else:
+            smax, srun = self.smax[ids], self.srun[ids]
+
+        # Each student's exams sorted by start; gap = next start - (start + duration)
+        courses, lengths = self.graph.courses_of_students(ids)
+        owner = np.repeat(np.arange(len(ids), dtype=np.int64), lengths)
+        keep = self.scheduled[courses]
+        courses, owner = courses[keep], owner[keep]
+        starts = self.abs_start[courses]
+        order = np.lexsort((starts, owner))
+        courses, owner, starts = courses[order], owner[order], starts[order]
+        gaps = starts[1:] - starts[:-1] - self.durations[courses[:-1]]
+        violations = (owner[1:] == owner[:-1]) & (gaps < self.gap)
+        sgap = np.bincount(owner[1:][violations], minlength=len(ids))
+        return smax, srun, sgap
+
+    def _set_student_stats(self, ids: np.ndarray, smax: np.ndarray, srun: np.ndarray, sgap: np.ndarray) -> None:
+        hist = self.smax_hist
+        hist -= np.bincount(self.smax[ids], minlength=len(hist))
+        hist += np.bincount(smax, minlength=len(hist))
+        hist = self.srun_hist
+        hist -= np.bincount(self.srun[ids], minlength=len(hist))
+        hist += np.bincount(srun, minlength=len(hist))
+        self.gap_total += int(sgap.sum() - self.sgap[ids].sum())
+        self.smax[ids] = smax
+        self.srun[ids] = srun
+        self.sgap[ids] = sgap
+
+    def metrics(self) -> Dict:
+        """Scorer metrics of the current placement (the keys score_metrics reads)"""
+        metrics: Dict = {}
+
+        # Students: histogram index = value, so sums and maxima come from the counts
+        scheduled = int(len(self.srun) - self.srun_hist[0])
+        values = np.arange(len(self.smax_hist))
+        runs = np.arange(len(self.srun_hist))
+        limit = self.student_limit
+        metrics.update({
+            'max_student_daily': int(values[self.smax_hist > 0].max()) if scheduled else 0,
+            'avg_student_daily': int((values * self.smax_hist).sum()) / scheduled if scheduled else 0,
+            'student_over_limit': int(self.smax_hist[limit + 1:].sum()) if limit else 0,
+            'student_consecutive_total': int((runs * self.srun_hist).sum()),
+            'student_consecutive_max': int(runs[self.srun_hist > 0].max()) if scheduled else 0,
+            'students_with_consecutive': int(self.srun_hist[2:].sum()),
+            'students_scheduled': scheduled,
+            'min_gap_violations': self.gap_total
+        })
+
+        # Classes (sinif 0 is not a class for the scorer)
+        class_day = self.class_day
+        if len(self.classes):
+            class_max = class_day.max(axis=1)
+            class_runs = longest_runs(class_day.T > 0)
+            metrics['max_class_daily'] = int(class_max.max())
+            metrics['avg_class_daily'] = int(class_max.sum()) / len(class_max)
+            metrics['class_over_limit'] = int((class_max > self.class_limit).sum())
+            metrics['class_consecutive_counts'] = dict(zip(self.classes, class_runs.tolist()))
+            rows, cols = np.nonzero(class_day)
+            per_day: Dict[int, Dict[int, int]] = {}
+            for r, c in zip(rows.tolist(), cols.tolist()):
+                per_day.setdefault(c, {})[self.classes[r]] = int(class_day[r, c])
+            metrics['class_exams_per_day'] = per_day
+        else:
+            metrics.update({
+                'max_class_daily': 0, 'avg_class_daily': 0, 'class_over_limit': 0,
+                'class_consecutive_counts': {}, 'class_exams_per_day': {}
+            })
+
+        # Rooms: variance of the usage counts of used rooms
+        used = self.usage[self.usage > 0].tolist()
+        classroom_balance = 0
+        if used:
+            avg_usage = sum(used) / len(used)
+            variance = sum((count - avg_usage) ** 2 for count in used) / len(used)
+            classroom_balance = 100 - min(100, variance)
+        metrics['classroom_balance'] = classroom_balance
+        return metrics
+
+    def _shaping(self, metrics: Dict) -> float:
+        """Raw metrics behind the stepwise criteria, lower is better (about 0-5)"""
+        students = max(1, metrics['students_scheduled'])
+        shaping = (
+            metrics['student_consecutive_total'] / students - 1
+            + metrics['students_with_consecutive'] / students
+            + metrics['min_gap_violations'] / students
+            + (100 - metrics['classroom_balance']) / 100
+        )
+        class_runs = list(metrics['class_consecutive_counts'].values())
+        if class_runs:
+            shaping += sum(class_runs) / len(class_runs) - 1
+        counts = [c for per_class in metrics['class_exams_per_day'].values() for c in per_class.values()]
+        if counts:
+            shaping += float(np.var(counts)) / 10
+        return shaping
+
+    def evaluate(self) -> Tuple[float, float]:
+        """(unrounded total score, shaping) of the current placement"""
+        metrics = self.metrics()
+        total = self.scorer.score_metrics(metrics, self.params)[0]
+        return total, self._shaping(metrics)
+
+    # ------------------------------------------------------------ constraints
+
+    def _clash(self, cid: int, start: int, other: int, other_start: int) -> bool:
+        """Would cid at start and other at other_start (same day) break a hard constraint?"""
+        if other_start >= start + self.duration[cid] or start >= other_start + self.duration[other]:
+            return False
+        return self.no_parallel or self.graph.overlap(cid, other) >= self.threshold
+
+    def _time_feasible(self, proposal: Dict[int, Tuple[int, int]]) -> bool:
+        for cid, (d, m) in proposal.items():
+            for other in self.day_courses[d]:
+                if other not in proposal and self._clash(cid, m, other, self.start[other]):
+                    return False
+            for other, (od, om) in proposal.items():
+                if other != cid and od == d and self._clash(cid, m, other, om):
+                    return False
+        return True
+
+    def _free_rooms(self, cid: int, d: int, m: int, moving: Dict[int, Placement]) -> List[int]:
+        """Rooms free for cid at (d, m) including the ara_suresi turnover
+
+        moving: exams being moved, with the placement already chosen for them
+        (those without rooms yet are ignored).
+        """
+        end = m + self.duration[cid] + self.gap
+        busy: Set[int] = set()
+        for other in self.day_courses[d]:
+            if other in moving:
+                continue
+            om = self.start[other]
+            if om < end and m < om + self.duration[other] + self.gap:
+                busy.update(self.rooms[other])
+        for other, (od, om, rooms) in moving.items():
+            if other != cid and od == d and om < end and m < om + self.duration[other] + self.gap:
+                busy.update(rooms)
+        return [i for i in range(len(self.capacities)) if i not in busy]
+
+    def _pack_rooms(self, cid: int, free: List[int]) -> Optional[Tuple[int, ...]]:
+        """min_waste subset of the free rooms covering the exam (None if impossible)"""
+        usage = self.usage
+        free = sorted(free, key=lambda i: (-self.capacities[i], usage[i], i))
+        capacities = [self.capacities[i] for i in free]
+        if len(free) <= DP_MAX_ROOMS:
+            picked = min_waste_subset(capacities, self.needed[cid])
+        else:
+            picked = best_fit_decreasing(capacities, self.needed[cid])
+        if not picked:
+            return None
+        return tuple(free[p] for p in picked)
+
+    def _limits_hold(self, moved: List[int]) -> bool:
+        """Daily class and student limits on the days exams were moved to"""
+        for cid in moved:
+            d = self.day[cid]
+            if self.class_count.get((d, self.sinif[cid]), 0) > self.class_limit:
+                return False
+            if self.hard_student_limit > 0:
+                student_ids = self.graph.student_ids(cid)
+                if len(student_ids) and self.load[self.cal[d], student_ids].max() > self.hard_student_limit:
+                    return False
+        return True
+
+    # ------------------------------------------------------------------ moves
+
+    def _propose(self, kind: str, rng: random.Random) -> Optional[Dict[int, Placement]]:
+        """New placements of the exams a random move changes, None if infeasible"""
+        if kind == 'move':
+            cid = rng.choice(self.courses)
+            d, m = rng.randrange(len(self.days)), rng.choice(self.starts)
+            if (d, m) == (self.day[cid], self.start[cid]) or not self._time_feasible({cid: (d, m)}):
+                return None
+            rooms = self._pack_rooms(cid, self._free_rooms(cid, d, m, {cid: (d, m, ())}))
+            return {cid: (d, m, rooms)} if rooms else None
+
+        if kind == 'swap':
+            if len(self.courses) < 2:
+                return None
+            a, b = rng.sample(self.courses, 2)
+            target = {a: (self.day[b], self.start[b]), b: (self.day[a], self.start[a])}
+            if target[a] == target[b] or not self._time_feasible(target):
+                return None
+            moving: Dict[int, Placement] = {cid: (d, m, ()) for cid, (d, m) in target.items()}
+            # Larger exam first, as the planner allocates
+            for cid in sorted(target, key=lambda c: -self.needed[c]):
+                d, m = target[cid]
+                rooms = self._pack_rooms(cid, self._free_rooms(cid, d, m, moving))
+                if not rooms:
+                    return None
+                moving[cid] = (d, m, rooms)
+            return moving
+
+        # 'room': trade one room of an exam for a free room that still covers it
+        cid = rng.choice(self.courses)
+        d, m, rooms = self.day[cid], self.start[cid], self.rooms[cid]
+        free = [i for i in self._free_rooms(cid, d, m, {cid: (d, m, ())}) if i not in rooms]
+        if not free:
+            return None
+        out, into = rng.choice(rooms), rng.choice(free)
+        covered = sum(self.capacities[i] for i in rooms)
+        if covered - self.capacities[out] + self.capacities[into] < self.needed[cid]:
+            return None
+        return {cid: (d, m, tuple(into if i == out else i for i in rooms))}
+
+    def _place(self, cid: int, d: int, m: int, rooms: Tuple[int, ...]) -> None:
+        old_day, old_rooms = self.day[cid], self.rooms[cid]
+        if d != old_day:
+            student_ids = self.graph.student_ids(cid)
+            self.load[self.cal[old_day], student_ids] -= 1
+            self.load[self.cal[d], student_ids] += 1
+            self.day_courses[old_day].discard(cid)
+            self.day_courses[d].add(cid)
+            sinif = self.sinif[cid]
+            self.class_count[(old_day, sinif)] -= 1
+            self.class_count[(d, sinif)] = self.class_count.get((d, sinif), 0) + 1
+            if sinif:
+                row = self.class_row[sinif]
+                self.class_day[row, self.cal[old_day]] -= 1
+                self.class_day[row, self.cal[d]] += 1
+        if rooms != old_rooms:
+            self.usage[list(old_rooms)] -= 1
+            self.usage[list(rooms)] += 1
+        self.abs_start[self.index[cid]] = self.cal[d] * MINUTES_PER_DAY + m
+        self.day[cid], self.start[cid], self.rooms[cid] = d, m, rooms
+
+    def _apply(self, changes: Dict[int, Placement]) -> Tuple:
+        """Apply placements; returns the undo record for _undo"""
+        previous = {cid: (self.day[cid], self.start[cid], self.rooms[cid]) for cid in changes}
+        retimed = [cid for cid, (d, m, _) in changes.items() if (d, m) != previous[cid][:2]]
+        days_changed = any(changes[cid][0] != previous[cid][0] for cid in retimed)
+        for cid, placement in changes.items():
+            self._place(cid, *placement)
+
+        saved = None
+        if retimed:
+            ids = np.unique(np.concatenate([self.graph.student_ids(cid) for cid in retimed]))
+            saved = (ids, self.smax[ids].copy(), self.srun[ids].copy(), self.sgap[ids].copy())
+            self._set_student_stats(ids, *self._student_stats(ids, days_changed))
+        return previous, saved
+
+    def _undo(self, record: Tuple) -> None:
+        previous, saved = record
+        for cid, placement in previous.items():
+            self._place(cid, *placement)
+        if saved is not None:
+            self._set_student_stats(*saved)
+
+    # ----------------------------------------------------------------- search
+
+    def run(
+        self,
+        time_budget: float,
+        seed: int = 0,
+        max_iterations: Optional[int] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Dict:
+        """
+        Simulated annealing within time_budget seconds
+
+        With max_iterations the temperature follows the iteration count, so a
+        run that ends on the iteration cap is reproducible for the same seed;
+        otherwise it follows the clock. should_stop() returning True ends the
+        search early (checked with the clock). Returns {'schedule': best schedule
+        found, 'stats': {...}}; the schedule is the input one when nothing
+        better was found.
+        """
+        rng = random.Random(seed)
+        started = clock.perf_counter()
+        deadline = started + max(0.0, float(time_budget))
+
+        score, shaping = self.evaluate()
+        initial_score = score
+        best_score, best_shaping = score, shaping
+        best = self._snapshot()
+        moves = {kind: {'tried': 0, 'accepted': 0} for kind in MOVE_TYPES}
+        iterations = infeasible = improvements = 0
+        best_at = 0.0
+        temperature = START_TEMPERATURE
+
+        while max_iterations is None or iterations < max_iterations:
+            if iterations % 32 == 0:
+                now = clock.perf_counter()
+                if now >= deadline or (should_stop and should_stop()):
+                    break
+                if max_iterations:
+                    progress = iterations / max_iterations
+                else:
+                    progress = (now - started) / max(1e-9, deadline - started)
+                temperature = START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** progress
+            iterations += 1
+
+            kind = rng.choices(MOVE_TYPES, MOVE_WEIGHTS)[0]
+            changes = self._propose(kind, rng)
+            if changes is None:
+                infeasible += 1
+                continue
+            moves[kind]['tried'] += 1
+            moved_days = [cid for cid, placement in changes.items() if placement[0] != self.day[cid]]
+            record = self._apply(changes)
+            if not self._limits_hold(moved_days):
+                self._undo(record)
+                infeasible += 1
+                continue
+
+            new_score, new_shaping = self.evaluate()
+            delta = (new_score - SHAPING_WEIGHT * new_shaping) - (score - SHAPING_WEIGHT * shaping)
+            if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                self._undo(record)
+                continue
+
+            moves[kind]['accepted'] += 1
+            score, shaping = new_score, new_shaping
+            if score > best_score + 1e-9 or (score > best_score - 1e-9 and shaping < best_shaping - 1e-9):
+                best_score, best_shaping = score, shaping
+                best = self._snapshot()
+                best_at = clock.perf_counter() - started
+                improvements += 1
+
+        elapsed = clock.perf_counter() - started
+        logger.info(
+            f"🔧 Yerel arama: {initial_score:.2f} → {best_score:.2f} "
+            f"({iterations} hamle, {improvements} iyileşme, {elapsed:.1f}s)"
+        )
+        return {
+            'schedule': self.build_schedule(best),
+            'stats': {
+                'initial_score': round(initial_score, 2),
+                'score': round(best_score, 2),
+                'iterations': iterations,
+                'infeasible_moves': infeasible,
+                'accepted_moves': sum(m['accepted'] for m in moves.values()),
+                'improvements': improvements,
+                'moves': moves,
+                'time_s': round(elapsed, 3),
+                'time_to_best_s': round(best_at, 3)
+            }
+        }
+
+    def _snapshot(self) -> Dict[int, Placement]:
+        return {cid: (self.day[cid], self.start[cid], self.rooms[cid]) for cid in self.courses}
+
+    def build_schedule(self, placements: Optional[Dict[int, Placement]] = None) -> List[Dict]:
+        """Schedule entries (planner format) of placements, chronological"""
+        placements = placements or self._snapshot()
+        order = {cid: i for i, cid in enumerate(self.courses)}
+        schedule = []
+        for cid in sorted(self.courses, key=lambda c: (placements[c][0], placements[c][1], order[c])):
+            d, m, rooms = placements[cid]
+            slot_time = datetime.combine(self.days[d], time(m // 60, m % 60))
+            for room in map(self.catalog.room, rooms):
+                schedule.append(dict(
+                    self._templates[cid],
+                    tarih_saat=slot_time,
+                    derslik_id=room['derslik_id'],
+                    derslik_kodu=room['derslik_kodu'],
+                    derslik_adi=room['derslik_adi']
+                ))
+        return schedule
@@ -4,15 +4,60 @@ Intelligent seating plan generation with spacing optimization
 """
 
 import logging
+import multiprocessing
+import os
 import random
-from typing import Dict, List, Callable, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Callable, Optional, Tuple
 from models.database import db
 from models.ogrenci_model import OgrenciModel
 from models.derslik_model import DerslikModel
+from models.oturma_model import OturmaModel
 from models.sinav_model import SinavModel
+from algorithms.room_catalog import seat_template
 
 logger = logging.getLogger(__name__)
 
+# Seating runs at 1M+ seats/s in-process (benchmarks/bench_seating_engine), so a
+# worker process only pays off above this many seats (pool start-up and pickling
+# cost more below)
+PARALLEL_MIN_SEATS_PER_WORKER = 50000
+
+# Exams are shipped to the workers in about this many chunks per worker
+CHUNKS_PER_WORKER = 4
+
+CONFLICT_LABELS = {
+    'derslik': "sınava atanmamış derslik",
+    'kapasite': "kapasite aşımı",
+    'ogrenci_tekrar': "tekrarlanan öğrenci",
+    'koltuk': "dolu koltuk",
+    'cakisma': "öğrenci sınav çakışması",
+}
+
+
+def _seat_exam_chunk(jobs: List[Tuple]) -> List[Tuple[int, List[Dict], float]]:
+    """Worker: seat a chunk of (sinav_id, students, derslikler, seed) jobs
+
+    Returns (sinav_id, plan, time_ms) per job; the time covers shuffling and
+    generation in the worker, not the pickling.
+    """
+    results = []
+    for sinav_id, students, derslikler, seed in jobs:
+        start = time.perf_counter()
+        random.Random(seed).shuffle(students)
+        plan = OturmaPlanlama._generate_multi_classroom_plan(students, derslikler)
+        results.append((sinav_id, plan, (time.perf_counter() - start) * 1000))
+    return results
+
+
+def _conflict_message(conflicts: List[Dict]) -> str:
+    counts: Dict[str, int] = {}
+    for conflict in conflicts:
+        counts[conflict['tip']] = counts.get(conflict['tip'], 0) + 1
+    details = ", ".join(f"{n} {CONFLICT_LABELS.get(tip, tip)}" for tip, n in counts.items())
+    return f"❌ Oturma planı kaydedilemedi: {details}"
+
 
 class OturmaPlanlama:
     """Seating plan generation algorithm"""
@@ -21,6 +66,7 @@ class OturmaPlanlama:
         self.ogrenci_model = OgrenciModel(db)
         self.derslik_model = DerslikModel(db)
         self.sinav_model = SinavModel(db)
+        self.oturma_model = OturmaModel(db)
     
     def generate_seating_plan(
         self,
@@ -108,122 +154,378 @@ class OturmaPlanlama:
                 'plan': []
             }
     
+    @staticmethod
     def _generate_multi_classroom_plan(
-        self,
         students: List[Dict],
         derslikler: List[Dict],
         progress_callback: Optional[Callable[[int, str], None]] = None
     ) -> List[Dict]:
         """
         Generate seating plan across multiple classrooms with spacing and balanced distribution
-        
+
+        Round-robin over the classrooms (largest kapasite first): every round
+        seats one student in each classroom that still has a free seat. The
+        per-classroom counts are computed up front (water-filling), then the
+        assignments are emitted in one pass in the round-robin order.
+
         Args:
             students: List of students to seat
             derslikler: List of classrooms
             progress_callback: Progress callback
-            
+
         Returns:
             Complete seating plan
         """
-        complete_plan = []
         total_students = len(students)
-        
+
         # Sort classrooms by capacity (use largest first for initial sorting)
         sorted_derslikler = sorted(derslikler, key=lambda x: x['kapasite'], reverse=True)
-        
-        # Calculate available seats for each classroom
-        classroom_info = []
-        for derslik in sorted_derslikler:
-            satir_sayisi = derslik['satir_sayisi']
-            sutun_sayisi = derslik['sutun_sayisi']
-            sira_yapisi = derslik.get('sira_yapisi', 3)  # 2'li, 3'lü veya 4'lü gruplar
-            
-            # Sıra yapısına göre oturma düzeni
-            available_seats = []
-            
-            for satir in range(1, satir_sayisi + 1):
-                # Her grup için pattern uygula
-                for grup_baslangic in range(1, sutun_sayisi + 1, sira_yapisi):
-                    # Grup içinde hangi sütunlara oturulacak?
-                    if sira_yapisi == 4:
-                        # 4'lü grup: dolu-boş-boş-dolu (1. ve 4. sütun)
-                        offset_sutunlar = [0, 3]
-                    elif sira_yapisi == 3:
-                        # 3'lü grup: dolu-boş-dolu (1. ve 3. sütun)
-                        offset_sutunlar = [0, 2]
-                    elif sira_yapisi == 2:
-                        # 2'li grup: boş-dolu (2. sütun, kapı tarafı/sağdan)
-                        offset_sutunlar = [1]
-                    else:
-                        # Genel durum: ilk sütun
-                        offset_sutunlar = [0]
-                    
-                    # Offsetleri uygula
-                    for offset in offset_sutunlar:
-                        sutun = grup_baslangic + offset
-                        if sutun <= sutun_sayisi:  # Sütun sınırını aşma
-                            available_seats.append((satir, sutun))
-            
-            classroom_info.append({
-                'derslik': derslik,
-                'available_seats': available_seats,
-                'capacity': len(available_seats),
-                'placed_count': 0,
-                'current_seat_index': 0
-            })
-            
-            logger.info(f"  📍 {derslik['derslik_adi']}: {len(available_seats)} koltuk (kapasite: {derslik['kapasite']})")
-        
-        # DENGELI DAĞILIM: Round-robin yerleştirme
-        # Her sınıfa sırayla birer öğrenci yerleştir
+        if not sorted_derslikler:
+            return []
+
+        # Seat patterns are cached per geometry (shared with the planner's capacity rules)
+        seats = [
+            seat_template(d['satir_sayisi'], d['sutun_sayisi'], d.get('sira_yapisi', 3))
+            for d in sorted_derslikler
+        ]
+        capacities = [len(room_seats) for room_seats in seats]
+        for derslik, capacity in zip(sorted_derslikler, capacities):
+            logger.info(f"  📍 {derslik['derslik_adi']}: {capacity} koltuk (kapasite: {derslik['kapasite']})")
+
+        counts = OturmaPlanlama._balanced_counts(capacities, total_students)
+        placed_total = sum(counts)
+        if placed_total < total_students:
+            logger.warning(f"⚠️ Kapasite yetersiz: {total_students - placed_total} öğrenci yerleştirilemedi")
+
+        # DENGELI DAĞILIM: round r seats the r-th student of every classroom with counts > r
+        rooms = [(d['derslik_id'], d['derslik_kodu'], d['derslik_adi']) for d in sorted_derslikler]
+        active = list(range(len(rooms)))
+        thresholds = sorted(set(counts))
+        next_threshold = 0
+        complete_plan = []
+        append = complete_plan.append
         student_index = 0
-        classroom_index = 0
-        
-        while student_index < total_students:
-            # Mevcut sınıf bilgisini al
-            current_classroom = classroom_info[classroom_index]
-            
-            # Bu sınıfta boş koltuk var mı kontrol et
-            if current_classroom['current_seat_index'] < current_classroom['capacity']:
+        last_reported = 0
+
+        for r in range(max(counts)):
+            while thresholds[next_threshold] <= r:
+                next_threshold += 1
+                active = [i for i in active if counts[i] > r]
+            for i in active:
                 student = students[student_index]
-                derslik = current_classroom['derslik']
-                seat = current_classroom['available_seats'][current_classroom['current_seat_index']]
-                satir, sutun = seat
-                
-                complete_plan.append({
+                derslik_id, derslik_kodu, derslik_adi = rooms[i]
+                satir, sutun = seats[i][r]
+                append({
                     'ogrenci_no': student['ogrenci_no'],
                     'ad_soyad': student['ad_soyad'],
-                    'derslik_id': derslik['derslik_id'],
-                    'derslik_kodu': derslik['derslik_kodu'],
-                    'derslik_adi': derslik['derslik_adi'],
+                    'derslik_id': derslik_id,
+                    'derslik_kodu': derslik_kodu,
+                    'derslik_adi': derslik_adi,
                     'satir': satir,
                     'sutun': sutun
                 })
-                
-                current_classroom['placed_count'] += 1
-                current_classroom['current_seat_index'] += 1
                 student_index += 1
-                
-                # Progress callback
-                if progress_callback and student_index % 10 == 0:
-                    percent = 50 + int((student_index / total_students) * 40)
-                    progress_callback(percent, f"Yerleştiriliyor: {student_index}/{total_students}")
-            
-            # Bir sonraki sınıfa geç (round-robin)
-            classroom_index = (classroom_index + 1) % len(classroom_info)
-            
-            # Eğer tüm sınıflar doluysa döngüyü kır
-            all_full = all(c['current_seat_index'] >= c['capacity'] for c in classroom_info)
-            if all_full and student_index < total_students:
-                logger.warning(f"⚠️ Kapasite yetersiz: {total_students - student_index} öğrenci yerleştirilemedi")
-                break
-        
+
+            # Progress callback (about every 10 students, at round boundaries)
+            if progress_callback and student_index - last_reported >= 10:
+                last_reported = student_index
+                percent = 50 + int((student_index / total_students) * 40)
+                progress_callback(percent, f"Yerleştiriliyor: {student_index}/{total_students}")
+
         # Log final distribution
-        for info in classroom_info:
-            logger.info(f"  ✅ {info['derslik']['derslik_adi']}: {info['placed_count']}/{info['capacity']} koltuk dolu")
-        
+        for derslik, count, capacity in zip(sorted_derslikler, counts, capacities):
+            logger.info(f"  ✅ {derslik['derslik_adi']}: {count}/{capacity} koltuk dolu")
+
         return complete_plan
-    
+
+    @staticmethod
+    def _balanced_counts(capacities: List[int], n_students: int) -> List[int]:
+        """Students per classroom after round-robin seating of n_students
+
+        Every classroom gets min(capacity, R) for the largest full round count R
+        that fits; the remaining students go one each to the first classrooms
+        (in order) that still have room - exactly where round R+1 stops.
+        """
+        if not capacities:
+            return []
+        n = min(n_students, sum(capacities))
+        # Binary search on the number of full rounds
+        lo, hi = 0, max(capacities)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if sum(min(c, mid) for c in capacities) <= n:
+                lo = mid
+            else:
+                hi = mid - 1
+        counts = [min(c, lo) for c in capacities]
+        extra = n - sum(counts)
+        for i, capacity in enumerate(capacities):
+            if extra <= 0:
+                break
+            if capacity > lo:
+                counts[i] += 1
+                extra -= 1
+        return counts
+
+    def save_seating_plan(self, sinav_id: int, plan: List[Dict], replace: bool = True) -> Dict:
+        """
+        Persist a generated seating plan in one transaction
+
+        Args:
+            sinav_id: Exam ID
+            plan: The 'plan' list of generate_seating_plan
+            replace: Replace the exam's existing seating
+
+        Returns:
+            {'success', 'message', 'inserted', 'conflicts', 'time_ms'}
+        """
+        if not plan:
+            return {'success': False, 'message': "Kaydedilecek oturma planı yok", 'inserted': 0, 'conflicts': []}
+
+        start = time.perf_counter()
+        try:
+            result = self.oturma_model.bulk_insert_oturma(sinav_id, plan, replace=replace)
+        except Exception as e:
+            logger.error(f"Error saving seating plan: {e}", exc_info=True)
+            return {'success': False, 'message': f"Kaydetme hatası: {str(e)}", 'inserted': 0, 'conflicts': []}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        logger.info(f"⏱️ Seating save: {len(plan)} seats in {elapsed_ms:.1f} ms (exam {sinav_id})")
+
+        if not result['success']:
+            message = _conflict_message(result['conflicts'])
+        else:
+            message = f"✅ {result['inserted']} öğrencinin oturma yeri kaydedildi"
+
+        return {
+            'success': result['success'],
+            'message': message,
+            'inserted': result['inserted'],
+            'conflicts': result['conflicts'],
+            'time_ms': elapsed_ms
+        }
+
+    def load_program_jobs(self, program_id: int) -> List[Dict]:
+        """
+        Load every exam of a program with its students and classrooms in three queries
+
+        Returns:
+            [{'sinav', 'students', 'derslikler'}] in exam order; students carry
+            only ogrenci_no / ad_soyad (what the plan and the workers need)
+        """
+        sinavlar = self.sinav_model.get_sinavlar_by_program(program_id) or []
+
+        derslikler_by_sinav: Dict[int, List[Dict]] = {}
+        for row in self.sinav_model.get_program_derslikleri(program_id) or []:
+            row = dict(row)
+            derslikler_by_sinav.setdefault(row.pop('sinav_id'), []).append(row)
+
+        students_by_sinav: Dict[int, List[Dict]] = {}
+        for row in self.ogrenci_model.get_ogrenciler_by_program(program_id) or []:
+            students_by_sinav.setdefault(row['sinav_id'], []).append(
+                {'ogrenci_no': row['ogrenci_no'], 'ad_soyad': row['ad_soyad']}
+            )
+
+        return [
+            {
+                'sinav': sinav,
+                'students': students_by_sinav.get(sinav['sinav_id'], []),
+                'derslikler': derslikler_by_sinav.get(sinav['sinav_id'], [])
+            }
+            for sinav in sinavlar
+        ]
+
+    def generate_program_plans(
+        self,
+        jobs: List[Dict],
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, str], None]] = None
+    ) -> Dict:
+        """
+        Generate the seating plans of many exams, in worker processes when it pays off
+
+        Args:
+            jobs: load_program_jobs() output
+            workers: Process count (default: CPU count); reduced so that every
+                     worker gets at least PARALLEL_MIN_SEATS_PER_WORKER students
+            seed: Base seed of the student shuffles (exam i uses seed + sinav_id);
+                  None shuffles randomly like generate_seating_plan
+
+        Returns:
+            {'plans': {sinav_id: plan}, 'time_ms': {sinav_id: ms}, 'workers'}
+        """
+        runnable = [job for job in jobs if job['students'] and job['derslikler']]
+        total_students = sum(len(job['students']) for job in runnable)
+
+        requested = workers if workers else (os.cpu_count() or 1)
+        workers = min(
+            int(requested),
+            os.cpu_count() or 1,
+            len(runnable),
+            -(-total_students // PARALLEL_MIN_SEATS_PER_WORKER)
+        )
+        workers = max(1, workers)
+
+        def make_job(job: Dict) -> Tuple:
+            sinav_id = job['sinav']['sinav_id']
+            job_seed = None if seed is None else seed + sinav_id
+            return sinav_id, list(job['students']), job['derslikler'], job_seed
+
+        # Largest exams first, dealt round-robin, so the chunks are about equal in size
+        ordered = sorted(runnable, key=lambda job: len(job['students']), reverse=True)
+        n_chunks = min(len(ordered), workers * CHUNKS_PER_WORKER) if workers > 1 else len(ordered)
+        chunks = [[make_job(job) for job in ordered[i::n_chunks]] for i in range(n_chunks)]
+
+        plans: Dict[int, List[Dict]] = {}
+        times: Dict[int, float] = {}
+
+        def collect(results: List[Tuple[int, List[Dict], float]]) -> None:
+            for sinav_id, plan, time_ms in results:
+                plans[sinav_id] = plan
+                times[sinav_id] = time_ms
+            if progress_callback:
+                percent = 20 + int(len(plans) / max(1, len(runnable)) * 60)
+                progress_callback(percent, f"Oturma planları: {len(plans)}/{len(runnable)} sınav")
+
+        if workers > 1:
+            logger.info(f"🧵 Oturma planları {workers} işlemde oluşturuluyor ({len(runnable)} sınav)")
+            # spawn, not fork: called from ProgramOturmaThread in a multithreaded process
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(_seat_exam_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    collect(future.result())
+        else:
+            for chunk in chunks:
+                collect(_seat_exam_chunk(chunk))
+
+        return {'plans': plans, 'time_ms': times, 'workers': workers}
+
+    def seat_program(
+        self,
+        program_id: int,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        save: bool = True,
+        progress_callback: Optional[Callable[[int, str], None]] = None
+    ) -> Dict:
+        """
+        Seat every exam of a program: bulk load, parallel generation, one bulk save
+
+        Exams without students or classrooms are skipped. The plans of all the
+        other exams replace their existing seating in a single transaction, so
+        either the whole program is seated or nothing changes.
+
+        Returns:
+            {'success', 'message', 'exams': [per-exam counts and time_ms],
+             'placed_count', 'unplaced_count', 'workers', 'timings' (s),
+             'seats_per_sec', 'conflicts', 'plans'}
+        """
+        start = time.perf_counter()
+        try:
+            if progress_callback:
+                progress_callback(5, "Sınavlar, derslikler ve öğrenciler yükleniyor...")
+            jobs = self.load_program_jobs(program_id)
+            if not jobs:
+                raise Exception(f"Programda sınav bulunamadı: {program_id}")
+            loaded = time.perf_counter()
+
+            generated = self.generate_program_plans(jobs, workers, seed, progress_callback)
+            plans, times = generated['plans'], generated['time_ms']
+            generated_at = time.perf_counter()
+
+            exams = []
+            for job in jobs:
+                sinav = job['sinav']
+                plan = plans.get(sinav['sinav_id'])
+                if not job['students']:
+                    skipped = "kayıtlı öğrenci yok"
+                elif not job['derslikler']:
+                    skipped = "derslik ataması yok"
+                else:
+                    skipped = None
+                placed = len(plan) if plan else 0
+                exams.append({
+                    'sinav_id': sinav['sinav_id'],
+                    'ders_kodu': sinav.get('ders_kodu'),
+                    'ogrenci_sayisi': len(job['students']),
+                    'derslik_sayisi': len(job['derslikler']),
+                    'placed_count': placed,
+                    'unplaced_count': len(job['students']) - placed if not skipped else 0,
+                    'time_ms': times.get(sinav['sinav_id'], 0.0),
+                    'skipped': skipped
+                })
+
+            placed_total = sum(e['placed_count'] for e in exams)
+            unplaced_total = sum(e['unplaced_count'] for e in exams)
+
+            result = {'success': True, 'inserted': 0, 'conflicts': []}
+            to_save = {sinav_id: plan for sinav_id, plan in plans.items() if plan}
+            if save and to_save:
+                if progress_callback:
+                    progress_callback(85, f"{placed_total} oturma yeri kaydediliyor...")
+                result = self.oturma_model.bulk_insert_plans(to_save, replace=True)
+            saved_at = time.perf_counter()
+
+            timings = {
+                'load_s': loaded - start,
+                'generate_s': generated_at - loaded,
+                'save_s': saved_at - generated_at,
+                'total_s': saved_at - start
+            }
+            seats_per_sec = placed_total / timings['total_s'] if timings['total_s'] > 0 else 0.0
+
+            for exam in exams:
+                if exam['skipped']:
+                    logger.info(f"  ⏭️ {exam['ders_kodu']}: atlandı ({exam['skipped']})")
+                else:
+                    logger.info(
+                        f"  ⏱️ {exam['ders_kodu']}: {exam['placed_count']}/{exam['ogrenci_sayisi']} öğrenci, "
+                        f"{exam['derslik_sayisi']} derslik, {exam['time_ms']:.1f} ms"
+                    )
+            logger.info(
+                f"⏱️ Program {program_id}: {len(to_save)} sınav, {placed_total} koltuk, "
+                f"{generated['workers']} işlem - yükleme {timings['load_s']:.2f}s, "
+                f"oluşturma {timings['generate_s']:.2f}s, kayıt {timings['save_s']:.2f}s "
+                f"({seats_per_sec:.0f} koltuk/sn)"
+            )
+
+            if not result['success']:
+                message = _conflict_message(result['conflicts'])
+            else:
+                message = f"✅ {len(to_save)} sınav için {placed_total} öğrenci yerleştirildi"
+                skipped_count = sum(1 for e in exams if e['skipped'])
+                if skipped_count:
+                    message += f" (⏭️ {skipped_count} sınav atlandı)"
+                if unplaced_total:
+                    message += f" (⚠️ {unplaced_total} öğrenci yerleştirilemedi - kapasite yetersiz)"
+
+            if progress_callback:
+                progress_callback(100, "Tamamlandı!")
+
+            return {
+                'success': result['success'],
+                'message': message,
+                'exams': exams,
+                'placed_count': placed_total if result['success'] else 0,
+                'unplaced_count': unplaced_total,
+                'workers': generated['workers'],
+                'timings': timings,
+                'seats_per_sec': seats_per_sec,
+                'conflicts': result['conflicts'],
+                'plans': plans
+            }
+
+        except Exception as e:
+            logger.error(f"Error seating program {program_id}: {e}", exc_info=True)
+            return {
+                'success': False,
+                'message': f"Hata: {str(e)}",
+                'exams': [],
+                'placed_count': 0,
+                'conflicts': []
+            }
+
     def validate_seating_plan(self, plan: List[Dict]) -> Dict:
         """Validate seating plan for conflicts"""
         conflicts = []
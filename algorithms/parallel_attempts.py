@@ -0,0 +1,112 @@
+"""
+Paralel Deneme Çalıştırıcı
+Runs planning attempts in a process pool for AttemptManager
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from algorithms.attempt_manager import execute_attempt
+
+logger = logging.getLogger(__name__)
+
+# Per-process state, created once by the pool initializer
+_worker_planner = None
+_worker_scorer = None
+
+
+def _init_worker(snapshot, scorer) -> None:
+    """Pool initializer: build a planner around the shipped snapshot"""
+    global _worker_planner, _worker_scorer
+    from algorithms.sinav_planlama import SinavPlanlama
+
+    _worker_planner = SinavPlanlama()
+    _worker_planner.use_snapshot(snapshot)
+    _worker_scorer = scorer
+
+
+def _run_worker_attempt(params: Dict, attempt_params: Dict) -> Tuple[Dict, Optional[Dict]]:
+    """Run one attempt in a worker and return only what the parent needs"""
+    result, score_result = execute_attempt(
+        _worker_planner.plan_exam_schedule, _worker_scorer, params, attempt_params
+    )
+
+    # Course data and the conflict graph are already known by the parent; don't pickle them back
+    compact = {
+        k: v for k, v in result.items()
+        if k not in ('course_students', 'course_info', 'conflict_graph')
+    }
+    if score_result is None:
+        # Failed attempts keep their partial schedule for failure analysis
+        return compact, None
+
+    # Successful attempts stream back the score only, the parent rebuilds the winner
+    compact['schedule'] = []
+    compact['remote'] = True
+    compact_score = {
+        'total_score': score_result['total_score'],
+        'breakdown': score_result.get('breakdown', {})
+    }
+    return compact, compact_score
+
+
+class ParallelAttemptRunner:
+    """Process-pool execution of schedule attempts
+
+    Attempts are submitted ahead in a bounded window but yielded strictly in
+    attempt order, so the caller's best-score and early-stop logic sees the
+    same sequence as a sequential run, whatever the worker count.
+    """
+
+    def __init__(self, snapshot, scorer, workers: int):
+        self.snapshot = snapshot
+        self.scorer = scorer
+        self.workers = max(1, int(workers))
+
+    def run(
+        self,
+        params: Dict,
+        make_attempt_params: Callable[[int], Dict],
+        max_attempts: int,
+        window: Optional[int] = None
+    ) -> Iterator[Tuple]:
+        """Yield (attempt, attempt_params, result, score_result, error) in attempt order
+
+        window caps how far ahead of the attempt being yielded attempts are
+        submitted (default: twice the worker count).
+        """
+        # spawn, not fork: the pool is started from a QThread of a process with
+        # other threads and open database sockets; workers get the snapshot anyway
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.snapshot, self.scorer)
+        )
+        window = min(self.workers * 2, window) if window else self.workers * 2
+        pending: Dict[int, Tuple[Dict, object]] = {}
+        next_submit = 0
+
+        try:
+            for attempt in range(max_attempts):
+                while next_submit < max_attempts and next_submit < attempt + window:
+                    attempt_params = make_attempt_params(next_submit)
+                    future = executor.submit(_run_worker_attempt, params, attempt_params)
+                    pending[next_submit] = (attempt_params, future)
+                    next_submit += 1
+
+                attempt_params, future = pending.pop(attempt)
+                try:
+                    result, score_result = future.result()
+                except Exception as e:
+                    yield attempt, attempt_params, None, None, e
+                    continue
+                yield attempt, attempt_params, result, score_result, None
+        finally:
+            # Early stop: drop speculative attempts that have not started yet
+            for _, future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            logger.info(f"🧵 Paralel denemeler bitti ({next_submit} gönderildi)")
@@ -0,0 +1,79 @@
+"""
+Planlama Anlık Görüntüsü (Planning Snapshot)
+Loads a department's courses, classrooms and enrollments once per planning run
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class PlanningSnapshot:
+    """Immutable, bulk-loaded planning inputs of a department
+
+    Every attempt of a planning run reads from the same snapshot instead of
+    querying the database once per course. Rows are kept in tuples and student
+    sets in frozensets; callers must treat the course/classroom dicts as read-only.
+    """
+
+    def __init__(
+        self,
+        bolum_id: int,
+        dersler: List[Dict],
+        derslikler: List[Dict],
+        enrollments: Dict[int, FrozenSet[str]]
+    ):
+        self.bolum_id = bolum_id
+        self.dersler: Tuple[Dict, ...] = tuple(dersler or [])
+        self.derslikler: Tuple[Dict, ...] = tuple(derslikler or [])
+        self.enrollments: Dict[int, FrozenSet[str]] = enrollments
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def load(cls, bolum_id: int, ders_model, derslik_model, ogrenci_model) -> 'PlanningSnapshot':
+        """Load a department snapshot with one query per table"""
+        dersler = ders_model.get_dersler_by_bolum(bolum_id) or []
+        derslikler = derslik_model.get_derslikler_by_bolum(bolum_id) or []
+        kayitlar = ogrenci_model.get_ders_kayitlari_by_bolum(bolum_id) or []
+
+        grouped: Dict[int, set] = defaultdict(set)
+        for row in kayitlar:
+            grouped[row['ders_id']].add(row['ogrenci_no'])
+
+        enrollments = {
+            ders['ders_id']: frozenset(grouped.get(ders['ders_id'], ()))
+            for ders in dersler
+        }
+
+        logger.info(
+            f"📦 Planning snapshot loaded: bolum={bolum_id}, {len(dersler)} ders, "
+            f"{len(derslikler)} derslik, {len(kayitlar)} kayıt"
+        )
+        return cls(bolum_id, dersler, derslikler, enrollments)
+
+    def fingerprint(self) -> str:
+        """SHA-256 of the courses, classrooms and enrollments (order-independent)
+
+        Equal fingerprints mean the planner sees exactly the same data, so a
+        cached planning result of the department is still valid.
+        """
+        if self._fingerprint is None:
+            payload = {
+                'bolum_id': self.bolum_id,
+                'dersler': sorted((dict(d) for d in self.dersler), key=lambda d: str(d.get('ders_id'))),
+                'derslikler': sorted((dict(d) for d in self.derslikler), key=lambda d: str(d.get('derslik_id'))),
+                'enrollments': sorted((str(cid), sorted(students)) for cid, students in self.enrollments.items())
+            }
+            # default=str covers dates and Decimals coming from the database
+            data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+            self._fingerprint = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    def get_students(self, ders_id: int) -> FrozenSet[str]:
+        """Enrolled student numbers of a course (empty if none)"""
+        return self.enrollments.get(ders_id, frozenset())
+
@@ -0,0 +1,206 @@
+"""
+Planlama Sonuç Önbelleği (Planning Result Cache)
+On-disk LRU cache of multi-attempt planning results, keyed by input fingerprint
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached result format or the planner's output for the same inputs changes
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.sinav_takvimi', 'planning_cache.sqlite3')
+DEFAULT_MAX_ENTRIES = 50
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Attempt parameters that identify the variant of the best attempt; replaying
+# them under new parameters gives the warm-start attempt
+WARM_START_KEYS = ('order_strategy', 'attempt_number', 'random_seed', 'rotate_days', 'coloring_algorithm')
+
+# A cached run warm-starts a new one if at most this many seed parameters differ
+WARM_START_MAX_CHANGES = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS planning_results (
+    cache_key   TEXT PRIMARY KEY,
+    bolum_id    INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    seed_params TEXT NOT NULL,
+    variant     TEXT NOT NULL,
+    score       REAL NOT NULL,
+    payload     BLOB NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS idx_planning_results_data ON planning_results (bolum_id, fingerprint)"
+
+
+class PlanningResultCache:
+    """SQLite store of successful planning results with LRU eviction
+
+    Entries are keyed by the seed-relevant parameters, the search settings and
+    the department's data fingerprint (PlanningSnapshot.fingerprint), so a hit
+    is exactly the result the same run would compute again. Entries with the
+    same data and a few different parameters are warm-start candidates. The
+    least recently used entries are evicted beyond max_entries / max_bytes.
+
+    Every operation opens its own connection, so one cache can be shared by
+    planning threads. Cache errors are logged and treated as misses - planning
+    never fails because of the cache. Payloads are pickled: the file is a
+    local, per-user cache and must not be shared.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.path = os.path.expanduser(path or os.getenv('PLANNING_CACHE_PATH', DEFAULT_CACHE_PATH))
+        self.max_entries = max(1, int(max_entries or os.getenv('PLANNING_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)))
+        self.max_bytes = max(1, int(max_bytes or os.getenv('PLANNING_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)))
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+        self._ready = False
+
+    @staticmethod
+    def make_key(seed_params: Dict, search_params: Dict, fingerprint: str) -> str:
+        payload = json.dumps(
+            {'v': CACHE_VERSION, 'seed': seed_params, 'search': search_params, 'data': fingerprint},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            conn.execute(_SCHEMA)
+            conn.execute(_INDEX)
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def get(self, cache_key: str) -> Optional[Dict]:
+        """Cached result of a key (None on a miss), marking it recently used"""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT payload FROM planning_results WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row is None:
+                    self.stats['misses'] += 1
+                    return None
+                conn.execute(
+                    "UPDATE planning_results SET last_used = ? WHERE cache_key = ?", (time.time(), cache_key)
+                )
+                conn.commit()
+            result = pickle.loads(row[0])
+        except (sqlite3.Error, OSError, pickle.PickleError, EOFError, AttributeError, ImportError) as e:
+            self.stats['errors'] += 1
+            logger.warning(f"⚠️ Sonuç önbelleği okunamadı: {e}")
+            return None
+        self.stats['hits'] += 1
+        return result
+
+    def put(
+        self,
+        cache_key: str,
+        bolum_id: int,
+        fingerprint: str,
+        seed_params: Dict,
+        variant: Dict,
+        result: Dict
+    ) -> bool:
+        """Store a successful result, then evict beyond the size caps; True if stored"""
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(payload) > self.max_bytes:
+                logger.info(f"💾 Sonuç önbelleğe sığmıyor ({len(payload)} bayt), atlandı")
+                return False
+            now = time.time()
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO planning_results "
+                    "(cache_key, bolum_id, fingerprint, seed_params, variant, score, payload, size, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        cache_key, bolum_id, fingerprint,
+                        json.dumps(seed_params, sort_keys=True, ensure_ascii=False, default=str),
+                        json.dumps(variant, sort_keys=True, default=str),
+                        float(result.get('score', 0)), sqlite3.Binary(payload), len(payload), now, now
+                    )
+                )
+                self._evict(conn)
+                conn.commit()
+        except (sqlite3.Error, OSError, pickle.PickleError, TypeError) as e:
+            self.stats['errors'] += 1
+            logger.warning(f"⚠️ Sonuç önbelleğe yazılamadı: {e}")
+            return False
+        self.stats['stores'] += 1
+        return True
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries beyond max_entries / max_bytes (the newest stays)"""
+        rows = conn.execute("SELECT cache_key, size FROM planning_results ORDER BY last_used DESC").fetchall()
+        total = 0
+        doomed = []
+        for i, (cache_key, size) in enumerate(rows):
+            total += size
+            if i > 0 and (i >= self.max_entries or total > self.max_bytes):
+                doomed.append((cache_key,))
+        if doomed:
+            conn.executemany("DELETE FROM planning_results WHERE cache_key = ?", doomed)
+            self.stats['evictions'] += len(doomed)
+
+    def find_warm_start(self, bolum_id: int, fingerprint: str, seed_params: Dict) -> Optional[Dict]:
+        """Best-attempt variant of the closest cached run on the same data
+
+        Candidates share the department and data fingerprint and differ in at
+        most WARM_START_MAX_CHANGES seed parameters; the fewest changes win,
+        then the most recently used. Returns {'variant', 'score', 'changed'} or None
+        (score: the cached run's best score).
+        """
+        current = json.loads(json.dumps(seed_params, sort_keys=True, ensure_ascii=False, default=str))
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT seed_params, variant, score FROM planning_results "
+                    "WHERE bolum_id = ? AND fingerprint = ? ORDER BY last_used DESC",
+                    (bolum_id, fingerprint)
+                ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            self.stats['errors'] += 1
+            logger.warning(f"⚠️ Sonuç önbelleği okunamadı: {e}")
+            return None
+
+        best = None
+        for cached_params, variant, score in rows:
+            cached = json.loads(cached_params)
+            changed = sorted(k for k in set(cached) | set(current) if cached.get(k) != current.get(k))
+            if len(changed) > WARM_START_MAX_CHANGES:
+                continue
+            if best is None or len(changed) < len(best['changed']):
+                best = {'variant': json.loads(variant), 'score': score, 'changed': changed}
+        return best
+
+    def clear(self) -> None:
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("DELETE FROM planning_results")
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️ Sonuç önbelleği temizlenemedi: {e}")
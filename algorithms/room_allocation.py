@@ -0,0 +1,165 @@
+"""
+Derslik Atama Motoru (Room Allocation Engine)
+Greedy and minimal-waste subset-sum room allocation for the courses of a slot
+"""
+
+import logging
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from algorithms.room_catalog import RoomCatalog
+
+logger = logging.getLogger(__name__)
+
+ROOM_ALLOCATION_STRATEGIES = ('greedy', 'min_waste')
+DEFAULT_ROOM_ALLOCATION = 'greedy'
+
+# Above this many free rooms min_waste switches from the exact DP to best-fit decreasing
+DP_MAX_ROOMS = 48
+
+
+def min_waste_subset(capacities: List[int], needed: int) -> Optional[List[int]]:
+    """Exact subset-sum: positions of a subset with the smallest total >= needed
+
+    Reachable sums are kept as bits of a Python int (one shift/or per room).
+    Only sums below needed + max(capacities) can be minimal, so the bitset is
+    capped there. Backtracking drops rooms from the end of the list first,
+    so among equally tight subsets the earlier rooms are kept; pass rooms in
+    preference order (largest first gives the fewest rooms).
+
+    Returns None if even all rooms together cannot cover needed.
+    """
+    if needed <= 0:
+        return []
+    if not capacities or sum(capacities) < needed:
+        return None
+
+    mask = (1 << (needed + max(capacities))) - 1
+    history = [1]
+    reach = 1
+    for cap in capacities:
+        reach = (reach | (reach << cap)) & mask
+        history.append(reach)
+
+    above = reach >> needed
+    if not above:
+        return None
+    total = needed + (above & -above).bit_length() - 1
+
+    chosen: List[int] = []
+    for i in range(len(capacities) - 1, -1, -1):
+        if (history[i] >> total) & 1:
+            continue  # reachable without room i
+        chosen.append(i)
+        total -= capacities[i]
+    chosen.reverse()
+    return chosen
+
+
+def best_fit_decreasing(capacities: List[int], needed: int) -> Optional[List[int]]:
+    """Heuristic for many rooms: take the largest rooms until the rest fits in
+    one room, then the smallest single room that covers the rest
+
+    capacities must be sorted descending. The waste is below the capacity of
+    the last room taken, and the room count is never above the greedy's.
+    """
+    if needed <= 0:
+        return []
+    ascending = capacities[::-1]
+    n = len(capacities)
+    chosen: List[int] = []
+    remaining = needed
+    largest = 0  # next unused position in descending order
+    while largest < n:
+        # Smallest unused room covering the rest (unused rooms are positions >= largest)
+        pos = bisect_left(ascending, remaining, 0, n - largest)
+        if pos < n - largest:
+            chosen.append(n - 1 - pos)
+            return chosen
+        chosen.append(largest)
+        remaining -= capacities[largest]
+        largest += 1
+        if remaining <= 0:
+            return chosen
+    return None
+
+
+class RoomAllocator:
+    """Allocates rooms of a RoomCatalog to courses, one slot at a time
+
+    'greedy' takes the largest free rooms until the course is covered (the
+    original behaviour). 'min_waste' picks the free-room subset with the
+    fewest empty seats: exact subset-sum DP up to dp_max_rooms free rooms,
+    best-fit decreasing above that. Callers allocate the courses of a slot
+    largest first, so each course is packed tightly and the rooms it leaves
+    stay available for the smaller courses of the same slot.
+
+    Seat counters (needed / allocated) are kept for utilization reports.
+    """
+
+    def __init__(self, catalog: RoomCatalog, strategy: str = DEFAULT_ROOM_ALLOCATION, dp_max_rooms: int = DP_MAX_ROOMS):
+        if strategy not in ROOM_ALLOCATION_STRATEGIES:
+            logger.warning(f"⚠️ Unknown room allocation '{strategy}', using {DEFAULT_ROOM_ALLOCATION}")
+            strategy = DEFAULT_ROOM_ALLOCATION
+        self.catalog = catalog
+        self.strategy = strategy
+        self.dp_max_rooms = int(dp_max_rooms)
+        self.seats_needed = 0
+        self.seats_allocated = 0
+        self.rooms_allocated = 0
+        self.failed = 0
+
+    @property
+    def utilization(self) -> float:
+        """Share of allocated seats actually needed (1.0 = no empty seats)"""
+        return self.seats_needed / self.seats_allocated if self.seats_allocated else 1.0
+
+    def allocate(self, needed: int) -> Tuple[List[int], int]:
+        """Take rooms covering needed seats in the current slot
+
+        Returns (room indices, covered seats). If the slot's free rooms cannot
+        cover needed, nothing is taken and ([], free seats) is returned.
+        """
+        catalog = self.catalog
+        if needed > catalog.available_capacity:
+            self.failed += 1
+            return [], catalog.available_capacity
+
+        if self.strategy == 'greedy':
+            chosen, covered = catalog.allocate(needed)
+        else:
+            chosen, covered = self._allocate_min_waste(needed)
+
+        self.seats_needed += needed
+        self.seats_allocated += covered
+        self.rooms_allocated += len(chosen)
+        return chosen, covered
+
+    def _allocate_min_waste(self, needed: int) -> Tuple[List[int], int]:
+        catalog = self.catalog
+        usage = catalog.usage
+        # Largest first, less used first among equal rooms (catalog order breaks ties)
+        free = sorted(catalog.free_rooms(), key=lambda i: (-catalog.capacity(i), usage[i], i))
+        capacities = [catalog.capacity(i) for i in free]
+
+        if len(free) <= self.dp_max_rooms:
+            picked = min_waste_subset(capacities, needed)
+        else:
+            picked = best_fit_decreasing(capacities, needed)
+        if picked is None:  # cannot happen while needed <= available_capacity
+            return [], catalog.available_capacity
+
+        chosen = [free[p] for p in picked]
+        for i in chosen:
+            catalog.take(i)
+        return chosen, sum(capacities[p] for p in picked)
+
+    def stats(self) -> Dict:
+        return {
+            'strategy': self.strategy,
+            'seats_needed': self.seats_needed,
+            'seats_allocated': self.seats_allocated,
+            'rooms_allocated': self.rooms_allocated,
+            'failed_allocations': self.failed,
+            'utilization': round(self.utilization, 4)
+        }
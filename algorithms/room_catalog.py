@@ -0,0 +1,197 @@
+"""
+Derslik Kataloğu (Room Catalog)
+Seat patterns, effective capacities and per-slot room availability
+"""
+
+import logging
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Occupied column offsets inside one desk group, by sira_yapisi
+# 4'lü: dolu-boş-boş-dolu, 3'lü: dolu-boş-dolu, 2'li: boş-dolu (kapı tarafı)
+SEAT_OFFSETS: Dict[int, Tuple[int, ...]] = {
+    4: (0, 3),
+    3: (0, 2),
+    2: (1,),
+}
+
+
+def seat_offsets(sira_yapisi: int) -> Tuple[int, ...]:
+    """Occupied offsets of a desk group (other group sizes seat only the first column)"""
+    return SEAT_OFFSETS.get(sira_yapisi, (0,))
+
+
+def seat_positions(satir_sayisi: int, sutun_sayisi: int, sira_yapisi: int) -> List[Tuple[int, int]]:
+    """Seatable (satir, sutun) positions of a room, row by row, 1-based"""
+    group = max(1, sira_yapisi)
+    offsets = seat_offsets(sira_yapisi)
+    columns = [
+        start + offset
+        for start in range(1, sutun_sayisi + 1, group)
+        for offset in offsets
+        if start + offset <= sutun_sayisi
+    ]
+    return [(satir, sutun) for satir in range(1, satir_sayisi + 1) for sutun in columns]
+
+
+@lru_cache(maxsize=256)
+def seat_template(satir_sayisi: int, sutun_sayisi: int, sira_yapisi: int) -> Tuple[Tuple[int, int], ...]:
+    """Cached, immutable seat_positions of a room geometry
+
+    A department has a handful of room layouts, so seating a program builds
+    each pattern once instead of once per room per exam.
+    """
+    return tuple(seat_positions(satir_sayisi, sutun_sayisi, sira_yapisi))
+
+
+def seats_per_row(sutun_sayisi: int, sira_yapisi: int) -> int:
+    """Number of seatable columns in one row, without building the positions"""
+    group = max(1, sira_yapisi)
+    full_groups, rem = divmod(sutun_sayisi, group)
+    offsets = seat_offsets(sira_yapisi)
+    return full_groups * len(offsets) + sum(1 for offset in offsets if offset < rem)
+
+
+def seating_capacity(room: Dict) -> int:
+    """Seats left after spacing; rooms without a layout fall back to kapasite"""
+    satir = int(room.get('satir_sayisi', 0) or 0)
+    sutun = int(room.get('sutun_sayisi', 0) or 0)
+    sira = int(room.get('sira_yapisi', 0) or 0)
+    if satir <= 0 or sutun <= 0:
+        return int(room.get('kapasite', 0) or 0)
+    return satir * seats_per_row(sutun, sira)
+
+
+def effective_capacity(room: Dict) -> int:
+    """Seating capacity capped at the room's physical kapasite
+
+    Spacing is independent of exam duration - it is about preventing cheating,
+    so shorter exams do not allow more students per room.
+    """
+    effective = seating_capacity(room)
+    base_capacity = int(room.get('kapasite', 0) or 0)
+    return min(effective, base_capacity) if base_capacity > 0 else effective
+
+
+class RoomCatalog:
+    """Classrooms of a planning run, sorted once by effective capacity
+
+    Rooms are indexed 0..n-1 in (effective capacity, kapasite) descending
+    order and their capacities kept in flat arrays. Per-slot availability is a
+    generation stamp per room, so starting a new slot is O(1) instead of
+    copying and re-sorting the room list; the free effective capacity of the
+    slot is maintained incrementally. Usage counters (how many course-slots a
+    room has served) balance load across the run.
+
+    One catalog belongs to one attempt: it is cheap to build and not thread-safe.
+    """
+
+    def __init__(self, derslikler: Iterable[Dict]):
+        keyed = [(effective_capacity(room), room.get('kapasite', 0), room) for room in derslikler]
+        keyed.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+        self.rooms: Tuple[Dict, ...] = tuple(room for _, _, room in keyed)
+        self.room_ids: Tuple[int, ...] = tuple(room['derslik_id'] for room in self.rooms)
+        self.effective = np.array([eff for eff, _, _ in keyed], dtype=np.int64)
+        self.base = np.array([int(room.get('kapasite', 0) or 0) for room in self.rooms], dtype=np.int64)
+        self.usage = np.zeros(len(self.rooms), dtype=np.int64)
+
+        # Python copies for the scalar hot path (numpy scalar access is slower)
+        self._effective: List[int] = self.effective.tolist()
+        # prefix[k] = seats of the k largest rooms
+        self.prefix: List[int] = [0] + list(accumulate(max(0, eff) for eff in self._effective))
+
+        # Runs of equal effective capacity: [start, end) index ranges
+        self._tiers: List[Tuple[int, int]] = []
+        start = 0
+        for i in range(1, len(self._effective) + 1):
+            if i == len(self._effective) or self._effective[i] != self._effective[start]:
+                if self._effective[start] > 0:
+                    self._tiers.append((start, i))
+                start = i
+
+        self._slot_stamp = [0] * len(self.rooms)
+        self._generation = 1
+        self.available_capacity = self.total_capacity
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    @property
+    def total_capacity(self) -> int:
+        """Effective seats of all rooms"""
+        return self.prefix[-1]
+
+    def min_rooms(self, seats: int) -> int:
+        """Fewest rooms whose effective capacity covers seats (len+1 if impossible), O(log n)"""
+        if seats <= 0:
+            return 0
+        return bisect_left(self.prefix, seats)
+
+    def begin_slot(self) -> None:
+        """Make every room available again for a new time slot, O(1)"""
+        self._generation += 1
+        self.available_capacity = self.total_capacity
+
+    def is_available(self, index: int) -> bool:
+        return self._slot_stamp[index] != self._generation
+
+    def free_rooms(self) -> List[int]:
+        """Indices of rooms with seats that are still free in the current slot, catalog order"""
+        generation = self._generation
+        return [
+            i for start, end in self._tiers for i in range(start, end)
+            if self._slot_stamp[i] != generation
+        ]
+
+    def take(self, index: int) -> None:
+        """Mark a room used in the current slot"""
+        self._slot_stamp[index] = self._generation
+        self.available_capacity -= max(0, self._effective[index])
+        self.usage[index] += 1
+
+    def release(self, index: int) -> None:
+        """Undo take() for a room of the current slot"""
+        self._slot_stamp[index] = 0
+        self.available_capacity += max(0, self._effective[index])
+        self.usage[index] -= 1
+
+    def allocate(self, needed: int) -> Tuple[List[int], int]:
+        """Take the largest free rooms until needed seats are covered
+
+        Among rooms of equal effective capacity the less used ones come first.
+        Returns (room indices, covered seats). If the free rooms of the slot
+        cannot cover needed, nothing is taken and ([], available seats) is
+        returned.
+        """
+        if needed > self.available_capacity:
+            return [], self.available_capacity
+
+        chosen: List[int] = []
+        covered = 0
+        for start, end in self._tiers:
+            if covered >= needed:
+                break
+            free = [i for i in range(start, end) if self._slot_stamp[i] != self._generation]
+            if len(free) > 1:
+                usage = self.usage
+                free.sort(key=lambda i: usage[i])
+            for i in free:
+                if covered >= needed:
+                    break
+                self.take(i)
+                chosen.append(i)
+                covered += self._effective[i]
+        return chosen, covered
+
+    def room(self, index: int) -> Dict:
+        return self.rooms[index]
+
+    def capacity(self, index: int) -> int:
+        return self._effective[index]
@@ -4,17 +4,28 @@ Her deneme için kalite puanı hesaplar
 """
 
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+import numpy as np
+
+from algorithms.vectorized_scoring import calculate_student_metrics
+
 logger = logging.getLogger(__name__)
 
+SCORING_BACKENDS = ('numpy', 'python')
+
 
 class SinavProgramScorer:
     """Sınav programı kalite puanlama sistemi"""
 
-    def __init__(self):
+    def __init__(self, backend: str = 'numpy'):
+        # Öğrenci metrikleri: 'numpy' (vektörel) veya 'python' (referans uygulama)
+        if backend not in SCORING_BACKENDS:
+            raise ValueError(f"Unknown scoring backend: {backend}")
+        self.backend = backend
+
         # Puanlama ağırlıkları (0-100 arası normalize edilecek)
         # Çakışma kontrolü placement algoritmasında hard constraint olarak zaten var
         self.weights = {
@@ -32,11 +43,15 @@ class SinavProgramScorer:
             schedule: List[Dict],
             course_students: Dict[int, Set[str]],
             course_info: Dict[int, Dict],
-            params: Dict
+            params: Dict,
+            conflict_graph=None
     ) -> Dict:
         """
         Sınav programı için toplam kalite puanı hesapla
 
+        conflict_graph: planner's ConflictGraph; the numpy backend reuses its
+        dense student ids (built from course_students when not given)
+
         Returns:
             {
                 'total_score': float (0-100),
@@ -57,71 +72,10 @@ class SinavProgramScorer:
                 }
 
             # Temel metrikler
-            metrics = self._calculate_metrics(schedule, course_students, course_info, params)
+            metrics = self._calculate_metrics(schedule, course_students, course_info, params, conflict_graph)
 
             # Her kriter için puan hesapla
-            scores = {}
-            penalties = []
-            bonuses = []
-
-            # NOT: Çakışma kontrolü placement algoritmasında hard constraint
-            # Buraya gelen her schedule zaten çakışmasız, puanlamaya gerek yok
-
-            # 1. Öğrenci günlük limit
-            student_limit_score, student_details = self._score_student_daily_limit(
-                metrics, params
-            )
-            scores['student_daily_limit'] = student_limit_score
-            penalties.extend(student_details.get('penalties', []))
-            bonuses.extend(student_details.get('bonuses', []))
-
-            # 2. Sınıf günlük limit
-            class_limit_score, class_details = self._score_class_daily_limit(
-                metrics, params
-            )
-            scores['class_daily_limit'] = class_limit_score
-            penalties.extend(class_details.get('penalties', []))
-            bonuses.extend(class_details.get('bonuses', []))
-
-            # 3. Öğrenci sınavları arası boşluk
-            student_gap_score, student_gap_details = self._score_student_gaps(
-                metrics, schedule
-            )
-            scores['student_gaps'] = student_gap_score
-            bonuses.extend(student_gap_details.get('bonuses', []))
-
-            # 4. Sınıf sınavları arası boşluk
-            class_gap_score, class_gap_details = self._score_class_gaps(
-                metrics, schedule
-            )
-            scores['class_gaps'] = class_gap_score
-            bonuses.extend(class_gap_details.get('bonuses', []))
-
-            # 5. Derslik yeniden kullanımı
-            classroom_score, classroom_details = self._score_classroom_usage(
-                metrics
-            )
-            scores['classroom_reuse'] = classroom_score
-            bonuses.extend(classroom_details.get('bonuses', []))
-
-            # 6. Dengeli dağılım
-            balance_score, balance_details = self._score_balanced_distribution(
-                metrics, params
-            )
-            scores['balanced_distribution'] = balance_score
-            bonuses.extend(balance_details.get('bonuses', []))
-
-            # 7. Sınav süresi optimizasyonu
-            duration_score, duration_details = self._score_exam_duration(
-                metrics
-            )
-            scores['exam_duration_opt'] = duration_score
-
-            # Toplam puan hesapla (ağırlıklı ortalama)
-            total_score = sum(
-                scores[key] * (self.weights[key] / 100.0)
-                for key in scores
-            )
+            total_score, scores, penalties, bonuses = self.score_metrics(metrics, params, schedule)
 
             # Breakdown - detaylı puanlama
             breakdown = {
@@ -151,6 +105,91 @@ class SinavProgramScorer:
                 'metrics': {}
             }
 
+    def score_metrics(self, metrics: Dict, params: Dict, schedule: Optional[List[Dict]] = None) -> tuple:
+        """
+        Kriter puanları - criterion scores of already computed metrics
+
+        Returns (total_score, scores, penalties, bonuses) with the unrounded
+        weighted total. score_schedule and the incremental evaluator of the
+        local search stage share it, so both score the same way.
+        """
+        schedule = schedule or []
+        scores = {}
+        penalties = []
+        bonuses = []
+
+        # NOT: Çakışma kontrolü placement algoritmasında hard constraint
+        # Buraya gelen her schedule zaten çakışmasız, puanlamaya gerek yok
+
+        # 1. Öğrenci günlük limit
+        student_limit_score, student_details = self._score_student_daily_limit(
+            metrics, params
+        )
+        scores['student_daily_limit'] = student_limit_score
+        penalties.extend(student_details.get('penalties', []))
+        bonuses.extend(student_details.get('bonuses', []))
+
+        # 2. Sınıf günlük limit
+        class_limit_score, class_details = self._score_class_daily_limit(
+            metrics, params
+        )
+        scores['class_daily_limit'] = class_limit_score
+        penalties.extend(class_details.get('penalties', []))
+        bonuses.extend(class_details.get('bonuses', []))
+
+        # 3. Öğrenci sınavları arası boşluk
+        student_gap_score, student_gap_details = self._score_student_gaps(
+            metrics, schedule
+        )
+        scores['student_gaps'] = student_gap_score
+        bonuses.extend(student_gap_details.get('bonuses', []))
+
+        # 4. Sınıf sınavları arası boşluk
+        class_gap_score, class_gap_details = self._score_class_gaps(
+            metrics, schedule
+        )
+        scores['class_gaps'] = class_gap_score
+        bonuses.extend(class_gap_details.get('bonuses', []))
+
+        # 5. Derslik yeniden kullanımı
+        classroom_score, classroom_details = self._score_classroom_usage(
+            metrics
+        )
+        scores['classroom_reuse'] = classroom_score
+        bonuses.extend(classroom_details.get('bonuses', []))
+
+        # 6. Dengeli dağılım
+        balance_score, balance_details = self._score_balanced_distribution(
+            metrics, params
+        )
+        scores['balanced_distribution'] = balance_score
+        bonuses.extend(balance_details.get('bonuses', []))
+
+        # 7. Sınav süresi optimizasyonu
+        duration_score, duration_details = self._score_exam_duration(
+            metrics
+        )
+        scores['exam_duration_opt'] = duration_score
+
+        # Toplam puan hesapla (ağırlıklı ortalama)
+        total_score = sum(
+            scores[key] * (self.weights[key] / 100.0)
+            for key in scores
+        )
+
+        return total_score, scores, penalties, bonuses
+
+    @staticmethod
+    def student_limit(params: Dict):
+        """Soft per-student daily limit of the scoring (0 = no limit)"""
+        # Prefer explicit student per-day limit if provided
+        # Preserve 0 (no limit) and avoid truthiness fallbacks
+        if 'student_per_day_limit' in params:
+            return params.get('student_per_day_limit')
+        if 'class_per_day_limit' in params:
+            return params.get('class_per_day_limit', 0)
+        return 4
+
     def _extract_classroom_keys(self, exam: Dict) -> List:
         """Extract classroom identifiers for usage metrics.
         Priority: derslik_id -> derslik_ids -> derslikler -> derslik_adi -> derslik_kodu.
@@ -189,15 +228,12 @@ class SinavProgramScorer:
             schedule: List[Dict],
             course_students: Dict[int, Set[str]],
             course_info: Dict[int, Dict],
-            params: Dict
+            params: Dict,
+            conflict_graph=None
     ) -> Dict:
         """Temel metrikleri hesapla"""
         metrics = {}
 
-        # Öğrenci bazlı metrikler
-        student_daily_exams = defaultdict(lambda: defaultdict(int))
-        student_consecutive_days = defaultdict(set)
-
         # Sınıf bazlı metrikler
         class_daily_exams = defaultdict(lambda: defaultdict(int))
         class_consecutive_days = defaultdict(set)
@@ -210,10 +246,8 @@ class SinavProgramScorer:
         exams_per_day = defaultdict(int)
         class_exams_per_day = defaultdict(lambda: defaultdict(int))
         
-        # Min gap violations tracking
-        student_exam_times = defaultdict(list)  # student_no -> [(datetime, duration)]
-        min_gap_violations = 0
-        min_gap_violations_list = []
+        # Unique exams in schedule order: (ders_id, datetime, date, duration)
+        unique_exams = []
 
         # Track unique exams (ders_id, datetime) to avoid counting multi-room as multiple exams
         processed_exams = set()
@@ -238,11 +272,7 @@ class SinavProgramScorer:
                 processed_exams.add(exam_key)
 
                 # Öğrenci metrikleri - only count once per unique exam
-                exam_duration = exam.get('sure', 60)
-                for student_no in course_students.get(ders_id, set()):
-                    student_daily_exams[student_no][exam_date] += 1
-                    student_consecutive_days[student_no].add(exam_date)
-                    student_exam_times[student_no].append((exam_datetime, exam_duration))
+                unique_exams.append((ders_id, exam_datetime, exam_date, exam.get('sure', 60)))
 
                 # Sınıf metrikleri - only count once per unique exam
                 sinif = course_info.get(ders_id, {}).get('sinif', 0)
@@ -260,29 +290,21 @@ class SinavProgramScorer:
                     classroom_usage[ck] += 1
                     classroom_daily_usage[exam_date][ck] += 1
 
-        # Öğrenci maksimum günlük sınav
-        max_student_daily = 0
-        avg_student_daily = 0
-        student_over_limit = 0
-        # Prefer explicit student per-day limit; preserve 0 (means: no limit)
-        if 'student_per_day_limit' in params:
-            student_limit = params.get('student_per_day_limit')
-        elif 'class_per_day_limit' in params:
-            student_limit = params.get('class_per_day_limit', 0)
-        else:
-            student_limit = 4
-
-        if student_daily_exams:
-            daily_counts = []
-            for student_no, daily_counts_dict in student_daily_exams.items():
-                max_for_student = max(daily_counts_dict.values())
-                daily_counts.append(max_for_student)
-                # If limit == 0, treat as unlimited (no over-limit)
-                if student_limit and max_for_student > student_limit:
-                    student_over_limit += 1
+        # Öğrenci metrikleri
+        student_limit = self.student_limit(params)
+        required_gap_minutes = params.get('ara_suresi', 15)
 
-            max_student_daily = max(daily_counts)
-            avg_student_daily = sum(daily_counts) / len(daily_counts)
+        if self.backend == 'numpy':
+            if conflict_graph is None:
+                from algorithms.conflict_graph import ConflictGraph
+                conflict_graph = ConflictGraph(course_students)
+            metrics.update(calculate_student_metrics(
+                unique_exams, conflict_graph, student_limit, required_gap_minutes
+            ))
+        else:
+            metrics.update(self._calculate_student_metrics(
+                unique_exams, course_students, student_limit, required_gap_minutes
+            ))
 
         # Sınıf maksimum günlük sınav
         max_class_daily = 0
@@ -302,37 +324,11 @@ class SinavProgramScorer:
             avg_class_daily = sum(daily_counts) / len(daily_counts)
 
         # Peş peşe gün sayıları
-        student_consecutive_counts = {
-            student_no: self._count_consecutive_days(sorted(days))
-            for student_no, days in student_consecutive_days.items()
-        }
-
         class_consecutive_counts = {
             sinif: self._count_consecutive_days(sorted(days))
             for sinif, days in class_consecutive_days.items()
         }
         
-        # Calculate min gap violations
-        required_gap_minutes = params.get('ara_suresi', 15)
-        for student_no, exam_list in student_exam_times.items():
-            # Sort by time
-            sorted_exams = sorted(exam_list, key=lambda x: x[0])
-            
-            for i in range(len(sorted_exams) - 1):
-                exam1_start, exam1_duration = sorted_exams[i]
-                exam2_start, exam2_duration = sorted_exams[i + 1]
-                
-                exam1_end = exam1_start + timedelta(minutes=exam1_duration)
-                gap_minutes = (exam2_start - exam1_end).total_seconds() / 60
-                
-                if gap_minutes < required_gap_minutes:
-                    min_gap_violations += 1
-                    min_gap_violations_list.append({
-                        'student': student_no,
-                        'gap_minutes': gap_minutes,
-                        'required': required_gap_minutes
-                    })
-
         # Derslik dengeli kullanım
         classroom_balance = 0
         if classroom_usage:
@@ -347,14 +343,6 @@ class SinavProgramScorer:
             variance = sum((count - avg_per_day) ** 2 for count in exams_per_day.values()) / len(exams_per_day)
             day_balance = 100 - min(100, variance * 5)  # Düşük varyans = yüksek puan
 
-        metrics['student_daily_exams'] = dict(student_daily_exams)
-        metrics['max_student_daily'] = max_student_daily
-        metrics['avg_student_daily'] = avg_student_daily
-        metrics['student_over_limit'] = student_over_limit
-        metrics['student_consecutive_counts'] = student_consecutive_counts
-        metrics['min_gap_violations'] = min_gap_violations
-        metrics['min_gap_violations_list'] = min_gap_violations_list[:10]  # First 10 for details
-
         metrics['class_daily_exams'] = dict(class_daily_exams)
         metrics['max_class_daily'] = max_class_daily
         metrics['avg_class_daily'] = avg_class_daily
@@ -371,6 +359,82 @@ class SinavProgramScorer:
 
         return metrics
 
+    def _calculate_student_metrics(
+            self,
+            unique_exams: List[tuple],
+            course_students: Dict[int, Set[str]],
+            student_limit,
+            required_gap_minutes
+    ) -> Dict:
+        """Öğrenci metrikleri - reference implementation of the numpy backend"""
+        student_daily_exams = defaultdict(lambda: defaultdict(int))
+        student_consecutive_days = defaultdict(set)
+        student_exam_times = defaultdict(list)  # student_no -> [(datetime, duration)]
+        min_gap_violations = 0
+        min_gap_violations_list = []
+
+        for ders_id, exam_datetime, exam_date, exam_duration in unique_exams:
+            for student_no in course_students.get(ders_id, set()):
+                student_daily_exams[student_no][exam_date] += 1
+                student_consecutive_days[student_no].add(exam_date)
+                student_exam_times[student_no].append((exam_datetime, exam_duration))
+
+        # Öğrenci maksimum günlük sınav
+        max_student_daily = 0
+        avg_student_daily = 0
+        student_over_limit = 0
+        if student_daily_exams:
+            daily_counts = []
+            for student_no, daily_counts_dict in student_daily_exams.items():
+                max_for_student = max(daily_counts_dict.values())
+                daily_counts.append(max_for_student)
+                # If limit == 0, treat as unlimited (no over-limit)
+                if student_limit and max_for_student > student_limit:
+                    student_over_limit += 1
+
+            max_student_daily = max(daily_counts)
+            avg_student_daily = sum(daily_counts) / len(daily_counts)
+
+        # Peş peşe gün sayıları
+        student_consecutive_counts = {
+            student_no: self._count_consecutive_days(sorted(days))
+            for student_no, days in student_consecutive_days.items()
+        }
+
+        # Calculate min gap violations
+        for student_no, exam_list in student_exam_times.items():
+            # Sort by time
+            sorted_exams = sorted(exam_list, key=lambda x: x[0])
+            
+            for i in range(len(sorted_exams) - 1):
+                exam1_start, exam1_duration = sorted_exams[i]
+                exam2_start, exam2_duration = sorted_exams[i + 1]
+                
+                exam1_end = exam1_start + timedelta(minutes=exam1_duration)
+                gap_minutes = (exam2_start - exam1_end).total_seconds() / 60
+                
+                if gap_minutes < required_gap_minutes:
+                    min_gap_violations += 1
+                    min_gap_violations_list.append({
+                        'student': student_no,
+                        'gap_minutes': gap_minutes,
+                        'required': required_gap_minutes
+                    })
+
+        return {
+            'student_daily_exams': dict(student_daily_exams),
+            'max_student_daily': max_student_daily,
+            'avg_student_daily': avg_student_daily,
+            'student_over_limit': student_over_limit,
+            'student_consecutive_counts': student_consecutive_counts,
+            'student_consecutive_total': sum(student_consecutive_counts.values()),
+            'student_consecutive_max': max(student_consecutive_counts.values(), default=0),
+            'students_with_consecutive': sum(1 for c in student_consecutive_counts.values() if c > 1),
+            'students_scheduled': len(student_consecutive_counts),
+            'min_gap_violations': min_gap_violations,
+            'min_gap_violations_list': min_gap_violations_list[:10]  # First 10 for details
+        }
+
     def _count_consecutive_days(self, sorted_dates: List) -> int:
         """Peş peşe gün sayısını hesapla"""
         if not sorted_dates:
@@ -393,7 +457,8 @@ class SinavProgramScorer:
             self,
             schedule: List[Dict],
             course_students: Dict[int, Set[str]],
-            params: Dict
+            params: Dict,
+            conflict_graph=None
     ) -> tuple:
         """Çakışma puanı (100 = hiç çakışma yok)"""
         penalties = []
@@ -425,10 +490,13 @@ class SinavProgramScorer:
                         ders_id1 = exam1['ders_id']
                         ders_id2 = exam2['ders_id']
 
-                        students1 = course_students.get(ders_id1, set())
-                        students2 = course_students.get(ders_id2, set())
-
-                        overlap = len(students1 & students2)
+                        if conflict_graph is not None:
+                            # Precomputed overlap weights of the planner's graph
+                            overlap = conflict_graph.overlap(ders_id1, ders_id2)
+                        else:
+                            students1 = course_students.get(ders_id1, set())
+                            students2 = course_students.get(ders_id2, set())
+                            overlap = len(students1 & students2)
                         if overlap > 0:
                             total_conflicts += overlap
                             penalties.append(
@@ -447,14 +515,7 @@ class SinavProgramScorer:
         avg_daily = metrics.get('avg_student_daily', 0)
         over_limit = metrics.get('student_over_limit', 0)
 
-        # Prefer explicit student per-day limit if provided
-        # Preserve 0 (no limit) and avoid truthiness fallbacks
-        if 'student_per_day_limit' in params:
-            limit = params.get('student_per_day_limit')
-        elif 'class_per_day_limit' in params:
-            limit = params.get('class_per_day_limit', 0)
-        else:
-            limit = 4
+        limit = self.student_limit(params)
 
         penalties = []
         bonuses = []
@@ -527,22 +588,21 @@ class SinavProgramScorer:
 
     def _score_student_gaps(self, metrics: Dict, schedule: List[Dict]) -> tuple:
         """Öğrenci sınavları arası boşluk puanı - includes min gap violations"""
-        consecutive_counts = metrics.get('student_consecutive_counts', {})
         min_gap_violations = metrics.get('min_gap_violations', 0)
-        min_gap_violations_list = metrics.get('min_gap_violations_list', [])
         penalties = []
         bonuses = []
 
-        if not consecutive_counts:
+        # Summary keys are filled by both backends; per-student dicts only by 'python'
+        total_students = metrics.get('students_scheduled', 0)
+        if not total_students:
             return 100, {'bonuses': [], 'penalties': []}
 
         # Calculate consecutive days statistics
-        avg_consecutive = sum(consecutive_counts.values()) / len(consecutive_counts)
-        max_consecutive = max(consecutive_counts.values())
+        avg_consecutive = metrics['student_consecutive_total'] / total_students
+        max_consecutive = metrics['student_consecutive_max']
         
         # Count how many students have back-to-back exams
-        students_with_consecutive = sum(1 for count in consecutive_counts.values() if count > 1)
-        total_students = len(consecutive_counts)
+        students_with_consecutive = metrics['students_with_consecutive']
         consecutive_ratio = students_with_consecutive / total_students if total_students > 0 else 0
 
         # BASE SCORING from consecutive days
@@ -670,4 +730,146 @@ class SinavProgramScorer:
         # Uzun sınavlar gün sonu varsa puan düşer
 
         # Şimdilik sabit puan
-        return 80, {}
\ No newline at end of file
+        return 80, {}
+
+
+class PartialScoreBound:
+    """Optimistic upper bound on the final SinavProgramScorer score during placement
+
+    Tracks only metrics that can only get worse as exams are added: student and
+    class daily maxima, over-limit counts and the longest runs of consecutive
+    exam days. Every other criterion is assumed to reach its best value, so the
+    real score of the finished schedule never exceeds upper_bound().
+    """
+
+    def __init__(self, params: Dict, scorer: 'SinavProgramScorer' = None):
+        scorer = scorer or SinavProgramScorer()
+        self.weights = scorer.weights
+        self.duration_score = scorer._score_exam_duration({})[0]
+
+        self.student_limit = scorer.student_limit(params)
+        self.hard_student_limit = int(params.get('student_per_day_limit', 0) or 0)
+        self.class_limit = params.get('class_per_day_limit', 0) or 3
+
+        self.max_student_daily = 0
+        self.students_over_limit: Set[int] = set()  # dense student ids
+        self.max_student_run = 0
+
+        self.class_day_counts: Dict[tuple, int] = defaultdict(int)  # (date, sinif) -> count
+        self.max_class_daily = 0
+        self.classes_over_limit: Set[int] = set()
+        self.max_class_run = 0
+
+        self._neighbors: Dict = {}
+        self.bound = 100.0
+
+    def add_course(self, exam_date, sinif: int, student_ids: np.ndarray, day_loads: np.ndarray, day_rows: Dict) -> None:
+        """Account for a placed course
+
+        student_ids are dense student ids of the course; day_loads[day_row, student]
+        are exams per student and day and must already include this course;
+        day_rows maps each exam date to its row in day_loads.
+        """
+        limit = self.student_limit
+        if len(student_ids):
+            counts = day_loads[day_rows[exam_date], student_ids]
+            self.max_student_daily = max(self.max_student_daily, int(counts.max()))
+            if limit:
+                self.students_over_limit.update(student_ids[counts > limit].tolist())
+
+            # First exam of the day: only neighbouring exam days can extend a run
+            first = student_ids[counts == 1]
+            if len(first):
+                run = self._run_lengths(exam_date, first, day_loads, day_rows)
+                self.max_student_run = max(self.max_student_run, int(run.max()))
+
+        if sinif:
+            key = (exam_date, sinif)
+            self.class_day_counts[key] += 1
+            count = self.class_day_counts[key]
+            if count > self.max_class_daily:
+                self.max_class_daily = count
+            if count > self.class_limit:
+                self.classes_over_limit.add(sinif)
+            if count == 1:
+                run = self._run_length(exam_date, sinif, self.class_day_counts)
+                if run > self.max_class_run:
+                    self.max_class_run = run
+
+    def _neighbor_days(self, exam_date) -> tuple:
+        """(previous, next) calendar day, cached per date"""
+        days = self._neighbors.get(exam_date)
+        if days is None:
+            days = self._neighbors[exam_date] = (
+                exam_date - timedelta(days=1), exam_date + timedelta(days=1)
+            )
+        return days
+
+    def _run_lengths(self, exam_date, student_ids: np.ndarray, day_loads: np.ndarray, day_rows: Dict) -> np.ndarray:
+        """Calendar-consecutive exam days around exam_date, per student"""
+        run = np.ones(len(student_ids), dtype=np.int64)
+        for side in (0, 1):
+            active = np.ones(len(student_ids), dtype=bool)
+            day = self._neighbor_days(exam_date)[side]
+            while day in day_rows:
+                active &= day_loads[day_rows[day], student_ids] > 0
+                if not active.any():
+                    break
+                run += active
+                day = self._neighbor_days(day)[side]
+        return run
+
+    def _run_length(self, exam_date, owner, day_counts: Dict[tuple, int]) -> int:
+        """Calendar-consecutive exam days around exam_date"""
+        run = 1
+        for side in (0, 1):
+            day = self._neighbor_days(exam_date)[side]
+            while day_counts.get((day, owner), 0) > 0:
+                run += 1
+                day = self._neighbor_days(day)[side]
+        return run
+
+    def upper_bound(self) -> float:
+        """Best total score still reachable; never increases as placement goes on"""
+        # 1. Öğrenci günlük limit
+        if not self.student_limit:
+            student_limit_score = 100
+        elif self.students_over_limit:
+            student_limit_score = max(0, 100 - len(self.students_over_limit) * 50)
+        else:
+            m = self.max_student_daily
+            if m <= 2:
+                student_limit_score = 100
+            elif m == 3:
+                student_limit_score = 85
+            else:
+                student_limit_score = max(0, 70 - (m - 3) * 10)
+            if not (0 < self.hard_student_limit <= self.student_limit):
+                # A later overload would still score 50
+                student_limit_score = max(student_limit_score, 50)
+
+        # 2. Sınıf günlük limit
+        if self.classes_over_limit:
+            class_limit_score = max(0, 100 - len(self.classes_over_limit) * 30)
+        else:
+            class_limit_score = 100 if self.max_class_daily <= 2 else 85
+
+        # 3-4. Peş peşe günler (best case of each tier)
+        m = self.max_student_run
+        student_gap_score = {0: 100, 1: 100, 2: 95, 3: 70, 4: 50}.get(m, max(20, 100 - m * 15))
+        m = self.max_class_run
+        class_gap_score = {0: 100, 1: 100, 2: 90, 3: 65, 4: 45}.get(m, max(20, 100 - m * 20))
+
+        w = self.weights
+        bound = (
+            student_limit_score * w['student_daily_limit']
+            + class_limit_score * w['class_daily_limit']
+            + student_gap_score * w['student_gaps']
+            + class_gap_score * w['class_gaps']
+            + 100 * w['classroom_reuse']
+            + 100 * w['balanced_distribution']
+            + self.duration_score * w['exam_duration_opt']
+        ) / 100.0 + 1e-9  # float slack so the bound stays >= the real weighted sum
+
+        self.bound = min(self.bound, bound)
+        return self.bound
@@ -9,10 +9,20 @@ import random
 from datetime import datetime, timedelta, time
 from typing import Dict, List, Callable, Optional, Set, Tuple
 from collections import defaultdict
+
+import numpy as np
+
 from models.database import db
 from models.ders_model import DersModel
 from models.derslik_model import DerslikModel
 from models.ogrenci_model import OgrenciModel
+from algorithms.planning_snapshot import PlanningSnapshot
+from algorithms.conflict_graph import ConflictGraph
+from algorithms.graph_coloring import color_conflict_graph, DEFAULT_COLORING_ALGORITHM
+from algorithms.scoring_system import PartialScoreBound
+from algorithms.room_catalog import RoomCatalog, seating_capacity
+from algorithms.room_allocation import RoomAllocator, DEFAULT_ROOM_ALLOCATION, DP_MAX_ROOMS
+from algorithms.local_search import LocalSearchImprover
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +34,44 @@ class SinavPlanlama:
         self.ders_model = DersModel(db)
         self.derslik_model = DerslikModel(db)
         self.ogrenci_model = OgrenciModel(db)
+        # Bulk-loaded planning inputs, reused by every attempt of a run
+        self._snapshots: Dict[int, PlanningSnapshot] = {}
+        self.snapshot_stats = {'hits': 0, 'misses': 0}
+        # Conflict graphs per (bolum_id, course ids, threshold), derived from the snapshots
+        self._conflict_graphs: Dict[Tuple, ConflictGraph] = {}
+
+    def get_snapshot(self, bolum_id: int) -> PlanningSnapshot:
+        """Return the department snapshot, loading it on first use"""
+        snapshot = self._snapshots.get(bolum_id)
+        if snapshot is not None:
+            self.snapshot_stats['hits'] += 1
+            return snapshot
+
+        self.snapshot_stats['misses'] += 1
+        snapshot = PlanningSnapshot.load(
+            bolum_id, self.ders_model, self.derslik_model, self.ogrenci_model
+        )
+        self._snapshots[bolum_id] = snapshot
+        return snapshot
+
+    def use_snapshot(self, snapshot: PlanningSnapshot) -> None:
+        """Install a pre-loaded snapshot (e.g. in a planning worker process)"""
+        self._snapshots[snapshot.bolum_id] = snapshot
+        self._drop_conflict_graphs(snapshot.bolum_id)
+
+    def invalidate_snapshot(self, bolum_id: Optional[int] = None) -> None:
+        """Drop cached snapshots (all, or one department) after data changes"""
+        if bolum_id is None:
+            self._snapshots.clear()
+            self._conflict_graphs.clear()
+        else:
+            self._snapshots.pop(bolum_id, None)
+            self._drop_conflict_graphs(bolum_id)
+
+    def _drop_conflict_graphs(self, bolum_id: int) -> None:
+        """Forget conflict graphs built from a department's snapshot"""
+        for key in [k for k in self._conflict_graphs if k[0] == bolum_id]:
+            del self._conflict_graphs[key]
 
     def plan_exam_schedule(
         self,
@@ -41,7 +89,7 @@ class SinavPlanlama:
             Dictionary with:
                 - success: bool
                 - schedule: List[Dict]
-                - course_students: Dict[int, Set[str]] (FOR SCORING)
+                - course_students: Dict[int, FrozenSet[str]] (FOR SCORING)
                 - course_info: Dict[int, Dict] (FOR SCORING)
                 - message: str
                 - stats: Dict
@@ -50,7 +98,8 @@ class SinavPlanlama:
             if progress_callback:
                 progress_callback(5, "Dersler yükleniyor...")
 
-            dersler = self.ders_model.get_dersler_by_bolum(params['bolum_id'])
+            snapshot = self.get_snapshot(params['bolum_id'])
+            dersler = list(snapshot.dersler)
 
             if not dersler:
                 return {
@@ -71,7 +120,7 @@ class SinavPlanlama:
             if progress_callback:
                 progress_callback(10, "Derslikler yükleniyor...")
 
-            derslikler = self.derslik_model.get_derslikler_by_bolum(params['bolum_id'])
+            derslikler = list(snapshot.derslikler)
 
             if not derslikler:
                 return {
@@ -94,8 +143,7 @@ class SinavPlanlama:
             capacity_errors = []
 
             for ders in dersler:
-                ogrenciler = self.ogrenci_model.get_ogrenciler_by_ders(ders['ders_id'])
-                student_ids = set(o['ogrenci_no'] for o in ogrenciler)
+                student_ids = snapshot.get_students(ders['ders_id'])
                 ogrenci_sayisi = len(student_ids)
 
                 sinav_suresi = ders_sinavlari_suresi.get(ders['ders_id'], varsayilan_sure)
@@ -129,7 +177,8 @@ class SinavPlanlama:
             if progress_callback:
                 progress_callback(25, "Ders çakışma grafiği oluşturuluyor...")
 
-            conflicts = self._build_conflict_graph(course_students, params)
+            conflict_graph = self._get_conflict_graph(course_students, params)
+            conflicts = conflict_graph.adjacency
 
             logger.info(f"📊 Conflict graph: {len(conflicts)} courses with conflicts")
 
@@ -207,17 +256,24 @@ class SinavPlanlama:
                 progress_callback(45, "Dersler slotlara yerleştiriliyor...")
 
             # Graph coloring for initial slot assignment
-            course_slot_assignment = self._graph_coloring(
+            coloring_result = self._graph_coloring(
                 list(course_info.keys()),
                 conflicts,
-                course_info,
                 int(total_slots_estimate),
-                progress_callback
+                params
             )
 
-            if not course_slot_assignment:
-                logger.warning("Coloring failed, falling back to sequential")
-                course_slot_assignment = {cid: idx for idx, cid in enumerate(course_info.keys())}
+            if not coloring_result['success']:
+                return {
+                    'success': False,
+                    'message': f"❌ Çakışma grafiği renklendirilemedi: {coloring_result['message']}\n\n"
+                              f"   • Gereken slot (renk): {coloring_result['colors_used']}\n"
+                              f"   • Tahmini slot sayısı: ~{total_slots_estimate}\n\n"
+                              f"Lütfen tarih aralığını genişletin.",
+                    'course_students': course_students,
+                    'course_info': course_info
+                }
+            course_slot_assignment = coloring_result['coloring']
 
             if progress_callback:
                 progress_callback(70, "Dinamik zaman slotları ve derslikler atanıyor...")
@@ -239,9 +295,24 @@ class SinavPlanlama:
                 params,
                 progress_callback,
                 order_strategy=order_strategy,
-                attempt_number=attempt_number
+                attempt_number=attempt_number,
+                conflict_graph=conflict_graph
             )
 
+            # Optimistic score bound of this attempt (None when not tracked)
+            score_bound = self._score_bound.upper_bound() if getattr(self, '_score_bound', None) else None
+
+            if getattr(self, '_attempt_pruned', False):
+                return {
+                    'success': False,
+                    'pruned': True,
+                    'score_bound': score_bound,
+                    'message': f"✂️ Deneme budandı: puan üst sınırı {score_bound:.2f} < "
+                              f"en iyi {params.get('prune_below'):.2f}",
+                    'course_students': course_students,
+                    'course_info': course_info
+                }
+
             if not schedule:
                 return {
                     'success': False,
@@ -264,33 +335,7 @@ class SinavPlanlama:
                 total_classroom_capacity = sum(int(d.get('kapasite', 0) or 0) for d in derslikler)
                 
                 # Calculate effective capacity with spacing
-                def calc_effective(room):
-                    satir = int(room.get('satir_sayisi', 0) or 0)
-                    sutun = int(room.get('sutun_sayisi', 0) or 0)
-                    sira = int(room.get('sira_yapisi', 0) or 0)
-                    if satir <= 0 or sutun <= 0:
-                        return int(room.get('kapasite', 0) or 0)
-                    if sira == 4:
-                        seats_per_group = 2
-                    elif sira == 3:
-                        seats_per_group = 2
-                    elif sira == 2:
-                        seats_per_group = 1
-                    else:
-                        seats_per_group = 1
-                    full_groups, rem = divmod(sutun, max(1, sira))
-                    if sira == 4:
-                        rem_seats = (1 if rem >= 1 else 0) + (1 if rem >= 4 else 0)
-                    elif sira == 3:
-                        rem_seats = (1 if rem >= 1 else 0) + (1 if rem >= 3 else 0)
-                    elif sira == 2:
-                        rem_seats = 1 if rem >= 2 else 0
-                    else:
-                        rem_seats = 1 if rem >= 1 else 0
-                    seats_per_row = full_groups * seats_per_group + rem_seats
-                    return satir * seats_per_row
-                
-                total_effective_capacity = sum(calc_effective(d) for d in derslikler)
+                total_effective_capacity = sum(seating_capacity(d) for d in derslikler)
                 total_students = sum(info['ogrenci_sayisi'] for info in course_info.values())
                 unscheduled_students = sum(course_info[cid]['ogrenci_sayisi'] for cid in unscheduled)
                 
@@ -336,7 +381,8 @@ class SinavPlanlama:
                     'schedule': schedule,
                     'course_students': course_students,
                     'course_info': course_info,
-                    'unscheduled_courses': list(unscheduled)
+                    'unscheduled_courses': list(unscheduled),
+                    'score_bound': score_bound
                 }
 
             if progress_callback:
@@ -354,10 +400,19 @@ class SinavPlanlama:
                 'schedule': schedule,
                 'course_students': course_students,  # FOR SCORING
                 'course_info': course_info,  # FOR SCORING
+                'conflict_graph': conflict_graph,
+                'score_bound': score_bound,
                 'stats': {
                     'total_courses': len(dersler),
                     'scheduled_courses': len(unique_exams),
-                    'days_used': len(set(s['tarih_saat'].date() if isinstance(s['tarih_saat'], datetime) else datetime.fromisoformat(s['tarih_saat']).date() for s in schedule))
+                    'days_used': len(set(s['tarih_saat'].date() if isinstance(s['tarih_saat'], datetime) else datetime.fromisoformat(s['tarih_saat']).date() for s in schedule)),
+                    'snapshot_cache': dict(self.snapshot_stats),
+                    'coloring': {
+                        'algorithm': coloring_result['algorithm'],
+                        'colors_used': coloring_result['colors_used'],
+                        'time_ms': round(coloring_result['time_ms'], 2)
+                    },
+                    'room_allocation': self._room_allocator.stats()
                 }
             }
 
@@ -368,6 +423,55 @@ class SinavPlanlama:
                 'message': f"Program oluşturma hatası: {str(e)}"
             }
 
+    def improve_schedule(
+        self,
+        result: Dict,
+        params: Dict,
+        time_budget: float,
+        seed: int = 0,
+        scorer=None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Optional[Dict]:
+        """
+        Local search on a successful plan_exam_schedule result
+
+        Moves exams between the planner's days and start times and re-packs
+        their rooms while all hard constraints hold (see LocalSearchImprover).
+        params['local_search_iterations'] caps the moves for reproducible runs.
+        Returns {'schedule', 'stats'} or None if the result cannot be searched.
+        """
+        try:
+            days = self._generate_exam_days(
+                params['baslangic_tarih'],
+                params['bitis_tarih'],
+                params.get('allowed_weekdays', [0, 1, 2, 3, 4])
+            )
+            timeline = self._build_start_timeline(
+                self._parse_time(params.get('gunluk_ilk_sinav', '10:00')),
+                self._parse_time(params.get('gunluk_son_sinav', '19:15')),
+                self._parse_time(params.get('ogle_arasi_baslangic', '12:00')),
+                self._parse_time(params.get('ogle_arasi_bitis', '13:30'))
+            )
+            improver = LocalSearchImprover(
+                result['schedule'],
+                result['course_info'],
+                result['conflict_graph'],
+                self.get_snapshot(params['bolum_id']).derslikler,
+                days,
+                timeline,
+                params,
+                scorer
+            )
+        except (KeyError, ValueError) as e:
+            logger.warning(f"⚠️ Yerel arama atlandı: {e}")
+            return None
+        return improver.run(
+            time_budget,
+            seed=seed,
+            max_iterations=params.get('local_search_iterations'),
+            should_stop=should_stop
+        )
+
     def _parse_time(self, time_str: str) -> time:
         """Parse time string HH:MM to time object"""
         parts = time_str.split(':')
@@ -390,90 +494,94 @@ class SinavPlanlama:
 
         return days
 
-    def _build_conflict_graph(
-        self,
-        course_students: Dict[int, Set[str]],
-        params: Dict
-    ) -> Dict[int, Set[int]]:
-        """Build conflict graph where edges represent student conflicts"""
-        conflicts = defaultdict(set)
-        course_ids = list(course_students.keys())
-        threshold = int(params.get('min_conflict_overlap', 1))
+    @staticmethod
+    def _build_start_timeline(
+        gunluk_ilk: time,
+        gunluk_son: time,
+        ogle_baslangic: time,
+        ogle_bitis: time
+    ) -> Tuple[int, List[int]]:
+        """
+        Integer minute timeline of legal exam start times (same for every day)
 
-        # Get course info
-        course_info = getattr(self, '_current_course_info', {})
+        Returns (first start of the day, next_start) where next_start[m] is the
+        earliest legal start >= minute m, or -1 if none is left before
+        gunluk_son_sinav. Starts inside the lunch break move to its end.
+        """
+        def minutes(t: time) -> int:
+            return t.hour * 60 + t.minute
 
-        for ders_id1 in course_ids:
-            for ders_id2 in course_ids:
-                if ders_id1 >= ders_id2:
-                    continue
+        ilk, son = minutes(gunluk_ilk), minutes(gunluk_son)
+        ogle_bas, ogle_bit = minutes(ogle_baslangic), minutes(ogle_bitis)
 
-                # Check student overlap
-                shared_students = course_students[ders_id1] & course_students[ders_id2]
-                overlap_count = len(shared_students)
+        def lunch_skipped(m: int) -> int:
+            return ogle_bit if ogle_bas <= m < ogle_bit else m
 
-                if overlap_count >= threshold:
-                    conflicts[ders_id1].add(ders_id2)
-                    conflicts[ders_id2].add(ders_id1)
+        next_start = []
+        for m in range(son + 1):
+            start = lunch_skipped(m)
+            next_start.append(start if start <= son else -1)
+        return lunch_skipped(ilk), next_start
 
-        total_edges = sum(len(neighbors) for neighbors in conflicts.values()) // 2
-        logger.info(f"🧮 Conflict Graph: {len(course_ids)} nodes, {total_edges} edges")
+    def _get_conflict_graph(
+        self,
+        course_students: Dict[int, Set[str]],
+        params: Dict
+    ) -> ConflictGraph:
+        """Return the conflict graph of the course set, building it once per snapshot"""
+        threshold = int(params.get('min_conflict_overlap', 1))
+        key = (params.get('bolum_id'), tuple(sorted(course_students)), threshold)
+        graph = self._conflict_graphs.get(key)
+        if graph is None:
+            graph = self._build_conflict_graph(course_students, params)
+            self._conflict_graphs[key] = graph
+        return graph
 
-        return conflicts
+    def _build_conflict_graph(
+        self,
+        course_students: Dict[int, Set[str]],
+        params: Dict
+    ) -> ConflictGraph:
+        """Build conflict graph where edges represent student conflicts"""
+        threshold = int(params.get('min_conflict_overlap', 1))
+        graph = ConflictGraph(course_students, threshold)
+        logger.info(
+            f"🧮 Conflict Graph: {len(graph.course_ids)} nodes, {graph.edge_count} edges, "
+            f"{graph.student_count} students"
+        )
+        return graph
 
     def _graph_coloring(
         self,
         courses: List[int],
         conflicts: Dict[int, Set[int]],
-        course_info: Dict[int, Dict],
         max_colors: int,
-        progress_callback: Optional[Callable[[int, str], None]] = None
-    ) -> Optional[Dict[int, int]]:
-        """Graph coloring using greedy algorithm with randomization"""
-        # Ensure max_colors is integer (safety check)
-        max_colors = int(max_colors)
-        
-        degrees = {ders_id: len(conflicts.get(ders_id, set())) for ders_id in courses}
+        params: Dict
+    ) -> Dict:
+        """Color the conflict graph with the algorithm selected by params['coloring_algorithm']"""
+        algorithm = params.get('coloring_algorithm', DEFAULT_COLORING_ALGORITHM)
+        rng = random.Random(params.get('random_seed', params.get('attempt_number', 0)))
+
+        logger.info(f"🎨 Starting graph coloring for {len(courses)} courses ({algorithm})")
 
-        # Sort by degree with random tiebreaker
-        sorted_courses = sorted(
+        result = color_conflict_graph(
             courses,
-            key=lambda x: (-degrees[x], random.random())
+            conflicts,
+            max_colors,
+            algorithm=algorithm,
+            rng=rng,
+            tabu_iterations=int(params.get('tabu_iterations', 2000))
         )
 
-        logger.info(f"🎨 Starting graph coloring for {len(courses)} courses")
-
-        coloring = {}
-
-        for idx, ders_id in enumerate(sorted_courses):
-            if progress_callback and idx % 5 == 0:
-                percent = 45 + int((idx / len(courses)) * 25)
-                progress_callback(percent, f"Yerleştiriliyor: {course_info[ders_id]['ders_kodu']}")
-
-            # Find available colors
-            used_colors = set()
-            for neighbor_id in conflicts.get(ders_id, set()):
-                if neighbor_id in coloring:
-                    used_colors.add(coloring[neighbor_id])
-
-            available_colors = [c for c in range(max_colors) if c not in used_colors]
-
-            if not available_colors:
-                logger.warning(f"❌ Cannot color {course_info[ders_id]['ders_kodu']}")
-                return None
-
-            # Pick color (70% first available, 30% random from first 5)
-            if random.random() < 0.7 or len(available_colors) == 1:
-                best_slot = available_colors[0]
-            else:
-                choices = available_colors[:min(5, len(available_colors))]
-                best_slot = random.choice(choices)
-
-            coloring[ders_id] = best_slot
-
-        logger.info(f"✅ Coloring successful! Used {len(set(coloring.values()))} slots")
+        if result['success']:
+            logger.info(
+                f"✅ Coloring successful! Used {result['colors_used']} slots "
+                f"in {result['time_ms']:.1f} ms"
+            )
+        else:
+            logger.warning(f"❌ Coloring failed: {result['message']}")
 
-        return coloring
+        return result
 
     def _assign_times_and_classrooms(
         self,
@@ -485,7 +593,8 @@ class SinavPlanlama:
         params: Dict,
         progress_callback: Optional[Callable[[int, str], None]] = None,
         order_strategy: str = 'class_interleaved',
-        attempt_number: int = 0
+        attempt_number: int = 0,
+        conflict_graph: Optional[ConflictGraph] = None
     ) -> List[Dict]:
         """
         Dynamically assign time slots and classrooms
@@ -499,59 +608,21 @@ class SinavPlanlama:
             course_info,
             course_students,
             order_strategy,
-            params
+            params,
+            conflict_graph,
+            course_slot_assignment
         )
 
-        # Pre-compute effective capacities with spacing rules
-        # NOTE: Spacing is INDEPENDENT of exam duration - it's about preventing cheating
-        # Shorter exams don't allow more students per room - spacing stays the same
-        def effective_capacity(room: Dict) -> int:
-            """Calculate effective capacity based on seating structure and spacing rules"""
-            satir = int(room.get('satir_sayisi', 0) or 0)
-            sutun = int(room.get('sutun_sayisi', 0) or 0)
-            sira = int(room.get('sira_yapisi', 0) or 0)
-            
-            if satir <= 0 or sutun <= 0:
-                # Fallback to base capacity
-                return int(room.get('kapasite', 0) or 0)
-            
-            # Calculate seatable positions per row based on sira_yapisi
-            # Spacing rules: leave empty seats between students
-            if sira == 4:
-                seats_per_group = 2  # 1st and 4th position (skip 2nd, 3rd)
-            elif sira == 3:
-                seats_per_group = 2  # 1st and 3rd position (skip 2nd)
-            elif sira == 2:
-                seats_per_group = 1  # Only 2nd position (or alternate)
-            else:
-                seats_per_group = 1  # Conservative fallback
-            
-            # Calculate full groups and remainder
-            full_groups, rem = divmod(sutun, max(1, sira))
-            
-            # Handle remaining columns
-            if sira == 4:
-                rem_seats = 1 if rem >= 1 else 0
-                rem_seats += 1 if rem >= 4 else 0
-            elif sira == 3:
-                rem_seats = 1 if rem >= 1 else 0
-                rem_seats += 1 if rem >= 3 else 0
-            elif sira == 2:
-                rem_seats = 1 if rem >= 2 else 0
-            else:
-                rem_seats = 1 if rem >= 1 else 0
-            
-            seats_per_row = full_groups * seats_per_group + rem_seats
-            
-            # Total effective capacity
-            effective = satir * seats_per_row
-            
-            # Ensure we don't exceed physical capacity
-            base_capacity = int(room.get('kapasite', 0) or 0)
-            return min(effective, base_capacity) if base_capacity > 0 else effective
-
-        # Sort derslikler by effective capacity DESC to minimize room count
-        sorted_derslikler = sorted(derslikler, key=lambda x: (effective_capacity(x), x.get('kapasite', 0)), reverse=True)
+        # Effective capacities (spacing rules) computed and sorted once per attempt;
+        # per-slot availability and room usage balance are tracked by the catalog
+        room_catalog = RoomCatalog(derslikler)
+        # params['room_allocation']: 'greedy' (largest rooms first) or 'min_waste' (subset-sum packing)
+        room_allocator = RoomAllocator(
+            room_catalog,
+            params.get('room_allocation', DEFAULT_ROOM_ALLOCATION),
+            params.get('room_dp_max_rooms', DP_MAX_ROOMS)
+        )
+        self._room_allocator = room_allocator
         ara_suresi = params.get('ara_suresi', 15)
         ogle_baslangic = self._parse_time(params.get('ogle_arasi_baslangic', '12:00'))
         ogle_bitis = self._parse_time(params.get('ogle_arasi_bitis', '13:30'))
@@ -566,9 +637,15 @@ class SinavPlanlama:
             start_idx = attempt_number % len(days)
         rotated_days = days[start_idx:] + days[:start_idx]
         days = rotated_days
+        day_dates = [d.date() for d in days]
+
+        # Slot start times are integer minutes of the day; datetimes are built only for output
+        day_first_start, next_start = self._build_start_timeline(gunluk_ilk, gunluk_son, ogle_baslangic, ogle_bitis)
+        last_start = len(next_start) - 1
+
         schedule = []
         current_day_idx = 0
-        current_time = None
+        current_minute: Optional[int] = None
         day_slot_index = 0
         # Track classes scheduled in the previous slot (to avoid back-to-back same-class exams)
         prev_slot_classes: Set[int] = set()
@@ -585,14 +662,31 @@ class SinavPlanlama:
             f"📋 Limits: class_per_day={class_limit}, student_per_day={student_daily_limit}, "
             f"no_parallel={no_parallel}, conflict_threshold={conflict_threshold}"
         )
-        room_usage_count: Dict[int, int] = defaultdict(int)  # overall balance
         day_class_count: Dict[tuple, int] = defaultdict(int)  # (day_idx, class) -> count
         day_unique_count: Dict[int, int] = defaultdict(int)   # day_idx -> unique exams placed
-        student_day_counts: Dict[tuple, int] = defaultdict(int)  # (date, student_no) -> count
-        student_last_exam_end: Dict[str, datetime] = {}  # student_no -> datetime end
+        day_entry_count: Dict[int, int] = defaultdict(int)    # day_idx -> classroom assignments
+
+        # Student load tracking on dense student ids of the conflict graph:
+        # day_loads[day_idx, student] = exams that day, course_day_max[day_idx, course] =
+        # highest load among the course's students (kept current on placement), and a
+        # bitset of enrolled students per course for the slot overlap check
+        if conflict_graph is None:
+            conflict_graph = ConflictGraph(course_students, conflict_threshold)
+        course_index = conflict_graph.course_index
+        course_mask = {cid: conflict_graph.student_mask(cid) for cid in ordered_courses}
+        day_loads = np.zeros((len(days), conflict_graph.student_count), dtype=np.int32)
+        course_day_max = np.zeros((len(days), len(course_index)), dtype=np.int32)
+        day_rows = {date: idx for idx, date in enumerate(day_dates)}
 
         self._days_exhausted = False
 
+        # Running partial metrics for pruning: AttemptManager passes the best score so far
+        # as 'prune_below' (None before the first success) and the attempt is abandoned
+        # once even an optimistic completion could not beat it
+        self._attempt_pruned = False
+        self._score_bound = PartialScoreBound(params) if 'prune_below' in params else None
+        prune_below = params.get('prune_below')
+
         # Targets guidance per class per day (vector computed in planner)
         class_daily_targets: Dict[int, List[int]] = getattr(self, '_class_daily_targets', {})
         day_total_targets: List[int] = getattr(self, '_day_total_targets', [])
@@ -607,7 +701,7 @@ class SinavPlanlama:
         
         while remaining_courses and loop_iterations < max_iterations:
             loop_iterations += 1
-            if current_time is None:
+            if current_minute is None:
                 if current_day_idx >= len(days):
                     self._days_exhausted = True
                     logger.warning(
@@ -615,19 +709,14 @@ class SinavPlanlama:
                         f"Days used: {current_day_idx}/{len(days)}"
                     )
                     break
-                current_day = days[current_day_idx]
-                current_time = datetime.combine(current_day.date(), gunluk_ilk)
+                # First start of the day (already moved past the lunch break)
+                current_minute = day_first_start
                 day_slot_index = 0
 
-            # Respect lunch break
-            current_time_only = current_time.time()
-            if ogle_baslangic <= current_time_only < ogle_bitis:
-                current_time = datetime.combine(current_time.date(), ogle_bitis)
-
-            slot_time = current_time
-            # Available rooms for this slot
-            available_rooms = list(sorted_derslikler)
-            batch_used_students: Set[str] = set()
+            exam_date = day_dates[current_day_idx]
+            # All rooms are available again in a new slot
+            room_catalog.begin_slot()
+            batch_used_students = 0  # bitset of students already sitting an exam in this slot
             batch_used_classes: Dict[int, int] = defaultdict(int)
 
             # Select courses for this slot (greedy MIS)
@@ -636,7 +725,7 @@ class SinavPlanlama:
             skip_reasons: Dict[str, int] = defaultdict(int)  # Track why courses are skipped
 
             def try_select(consider_targets: bool, avoid_consecutive_class: bool, reset_tracking: bool = False) -> None:
-                nonlocal selected, skipped_due_to_target, skip_reasons
+                nonlocal selected, skipped_due_to_target, skip_reasons, batch_used_students
                 if reset_tracking:
                     skip_reasons.clear()
                     
@@ -647,8 +736,10 @@ class SinavPlanlama:
                         break
 
                     # Student conflict within the same slot
-                    if course_students.get(cid):
-                        overlap = len(course_students[cid] & batch_used_students)
+                    mask = course_mask[cid]
+                    if mask:
+                        shared = mask & batch_used_students
+                        overlap = bin(shared).count('1') if conflict_threshold > 1 else (1 if shared else 0)
                         if overlap >= conflict_threshold:
                             skip_reasons['student_conflict'] += 1
                             continue
@@ -686,17 +777,12 @@ class SinavPlanlama:
                     # Student daily limit enforcement (prevents overload)
                     # HARD CONSTRAINT: Only enforce if student_daily_limit > 0
                     if student_daily_limit > 0:
-                        exam_date = slot_time.date()
-                        # Check if ANY student would exceed daily limit
-                        would_exceed = any(
-                            (student_day_counts[(exam_date, s)] + 1) > student_daily_limit 
-                            for s in course_students.get(cid, set())
-                        )
-                        if would_exceed:
+                        # Check if ANY student would exceed daily limit (busiest enrollee, O(1))
+                        if course_day_max[current_day_idx, course_index[cid]] >= student_daily_limit:
                             skip_reasons['daily_limit'] += 1
                             continue
                     selected.append(cid)
-                    batch_used_students.update(course_students.get(cid, set()))
+                    batch_used_students |= mask
                     batch_used_classes[csinif] += 1
 
             # First pass: honor distribution targets and avoid consecutive same-class
@@ -706,7 +792,7 @@ class SinavPlanlama:
             if not selected and remaining_courses:
                 # Clear and retry without distribution target constraints
                 selected.clear()
-                batch_used_students.clear()
+                batch_used_students = 0
                 batch_used_classes.clear()
                 # Second pass: still avoid consecutive class if possible, but no distribution targets
                 try_select(consider_targets=False, avoid_consecutive_class=True, reset_tracking=True)
@@ -714,7 +800,7 @@ class SinavPlanlama:
             # If still nothing, final pass: allow consecutive class to avoid deadlock
             if not selected and remaining_courses:
                 selected.clear()
-                batch_used_students.clear()
+                batch_used_students = 0
                 batch_used_classes.clear()
                 try_select(consider_targets=False, avoid_consecutive_class=False, reset_tracking=True)
             
@@ -737,7 +823,7 @@ class SinavPlanlama:
                     )
                     # Force day change
                     current_day_idx += 1
-                    current_time = None
+                    current_minute = None
                     continue  # Skip time advancement
             
             # Log if no courses could be selected (expanded logging)
@@ -763,7 +849,7 @@ class SinavPlanlama:
                 max_duration = max(int(course_info[c]['sinav_suresi']) for c in selected)
 
                 # Calculate total available effective capacity for this slot
-                total_slot_capacity = sum(effective_capacity(r) for r in available_rooms)
+                total_slot_capacity = room_catalog.available_capacity
                 total_needed = sum(course_info[c]['ogrenci_sayisi'] for c in selected)
                 
                 # If total capacity is insufficient, log warning and try to fit what we can
@@ -777,42 +863,25 @@ class SinavPlanlama:
 
                 # Track successfully placed courses
                 successfully_placed = []
+                slot_time = datetime.combine(exam_date, time(current_minute // 60, current_minute % 60))
 
                 for cid in selected_sorted:
                     needed = int(course_info[cid]['ogrenci_sayisi'])
-                    assigned_rooms: List[Dict] = []
-                    covered = 0
 
-                    # Choose among currently available rooms, preferring high effective capacity and less used overall
-                    available_rooms.sort(key=lambda r: (effective_capacity(r), -room_usage_count[r['derslik_id']]), reverse=True)
-
-                    for room in list(available_rooms):
-                        if covered >= needed:
-                            break
-                        cap = effective_capacity(room)
-                        if cap <= 0:
-                            continue
-                        assigned_rooms.append(room)
-                        covered += cap
-                        # Mark this room used for this slot
-                        available_rooms.remove(room)
-                        room_usage_count[room['derslik_id']] += 1
+                    # Choose among currently available rooms (strategy from params['room_allocation'])
+                    assigned_rooms, covered = room_allocator.allocate(needed)
 
                     if covered < needed:
-                        # Not enough capacity for this course in this slot
+                        # Not enough capacity for this course in this slot (nothing was taken)
                         shortage = needed - covered
                         logger.warning(
                             f"⚠️ {course_info[cid]['ders_kodu']}: {shortage} öğrenci için yer yok ({needed} gerekli, {covered} bulundu)"
                         )
-                        # Rollback assigned rooms for this course back to availability for fairness
-                        for room in assigned_rooms:
-                            room_usage_count[room['derslik_id']] -= 1
-                            available_rooms.append(room)
                         # Skip placing this course in this slot; will try later
                         continue  # Don't add to successfully_placed
 
                     # Emit schedule entries for each assigned room
-                    for room in assigned_rooms:
+                    for room in map(room_catalog.room, assigned_rooms):
                         schedule.append({
                             'ders_id': cid,
                             'ders_kodu': course_info[cid]['ders_kodu'],
@@ -828,22 +897,31 @@ class SinavPlanlama:
                             'bolum_id': params['bolum_id']
                         })
                     
+                    day_entry_count[current_day_idx] += len(assigned_rooms)
                     successfully_placed.append(cid)
 
                 # Update tracking only for successfully placed courses
                 for cid in successfully_placed:
                     csinif = course_info[cid].get('sinif', 0)
                     day_class_count[(current_day_idx, csinif)] += 1
-                    # Update student last end and daily count
-                    duration = int(course_info[cid]['sinav_suresi'])
-                    end_time = slot_time + timedelta(minutes=duration)
-                    exam_date = slot_time.date()
-                    for s in course_students.get(cid, set()):
-                        student_last_exam_end[s] = end_time
-                        student_day_counts[(exam_date, s)] += 1
+                    # Update student daily loads
+                    student_ids = conflict_graph.student_ids(cid)
+                    loads = day_loads[current_day_idx]
+                    loads[student_ids] += 1
+                    if student_daily_limit > 0 and len(student_ids):
+                        # Raise the busiest-enrollee load of every course these students take
+                        courses, lengths = conflict_graph.courses_of_students(student_ids)
+                        np.maximum.at(course_day_max[current_day_idx], courses, np.repeat(loads[student_ids], lengths))
+                    if self._score_bound is not None:
+                        self._score_bound.add_course(exam_date, csinif, student_ids, day_loads, day_rows)
                 # Track unique exams placed today (count per course, not per room)
                 day_unique_count[current_day_idx] += len(successfully_placed)
 
+                if successfully_placed and prune_below is not None:
+                    if round(self._score_bound.upper_bound(), 2) < prune_below:
+                        self._attempt_pruned = True
+                        break
+
                 # Remember classes scheduled in this slot to avoid them in the next slot (same day)
                 prev_slot_classes = set(course_info[c]['sinif'] for c in successfully_placed if course_info[c].get('sinif'))
 
@@ -863,25 +941,22 @@ class SinavPlanlama:
                     target_for_day = day_total_targets[current_day_idx] if current_day_idx < len(day_total_targets) else 0
                     if target_for_day > 0 and day_unique_count[current_day_idx] >= target_for_day and remaining_courses:
                         current_day_idx += 1
-                        current_time = None
+                        current_minute = None
                         continue
             else:
                 # No courses selected - advance to next slot
                 advance_minutes = ara_suresi
 
-            next_time = current_time + timedelta(minutes=advance_minutes)
-
-            # Check lunch break
-            next_time_only = next_time.time()
-            if ogle_baslangic <= next_time_only < ogle_bitis:
-                next_time = datetime.combine(next_time.date(), ogle_bitis)
+            # Next legal start (lunch break skipped), -1 once past the last exam start of the day
+            next_minute = current_minute + advance_minutes
+            next_minute = next_start[next_minute] if next_minute <= last_start else -1
 
             # Check day limit
-            if next_time.time() > gunluk_son:
+            if next_minute < 0:
                 # Log day summary before moving to next day
                 if remaining_courses and (current_day_idx < 3 or current_day_idx % 2 == 0):
-                    day_placed = len([s for s in schedule if (datetime.fromisoformat(s['tarih_saat']) if isinstance(s['tarih_saat'], str) else s['tarih_saat']).date() == days[current_day_idx].date()])
-                    unique_day_placed = len(set(s['ders_id'] for s in schedule if (datetime.fromisoformat(s['tarih_saat']) if isinstance(s['tarih_saat'], str) else s['tarih_saat']).date() == days[current_day_idx].date()))
+                    day_placed = day_entry_count[current_day_idx]
+                    unique_day_placed = day_unique_count[current_day_idx]
                     
                     # Per-class summary
                     class_summary = []
@@ -898,14 +973,19 @@ class SinavPlanlama:
                     )
                 
                 current_day_idx += 1
-                current_time = None
+                current_minute = None
                 prev_slot_classes.clear()  # reset for new day
             else:
-                current_time = next_time
+                current_minute = next_minute
                 day_slot_index += 1
         
         # Log final placement status
-        if remaining_courses:
+        if self._attempt_pruned:
+            logger.info(
+                f"✂️ Attempt pruned: score bound {self._score_bound.bound:.2f} < best {prune_below:.2f}, "
+                f"{len(remaining_courses)} courses left unplaced"
+            )
+        elif remaining_courses:
             logger.error(
                 f"❌ Failed to place {len(remaining_courses)} courses! "
                 f"Scheduled: {len(set(s['ders_id'] for s in schedule))}/{len(course_info)}, "
@@ -925,10 +1005,11 @@ class SinavPlanlama:
         course_info: Dict[int, Dict],
         course_students: Dict[int, Set[str]],
         strategy: str,
-        params: Dict
+        params: Dict,
+        conflict_graph: Optional[ConflictGraph] = None,
+        course_colors: Optional[Dict[int, int]] = None
     ) -> List[int]:
         """Order courses by given strategy with randomization"""
-        conflict_threshold = int(params.get('min_conflict_overlap', 1))
         
         # Add some randomness to break ties in all strategies
         random_factor = random.random() * 0.1  # Small random component
@@ -940,25 +1021,13 @@ class SinavPlanlama:
 
         elif strategy == 'degree_first':
             # Most conflicts first WITH RANDOM TIEBREAKER
-            conflicts_map = defaultdict(int)
-            for cid in courses:
-                for other_cid in courses:
-                    if cid != other_cid and course_students.get(cid) and course_students.get(other_cid):
-                        if len(course_students[cid] & course_students[other_cid]) >= conflict_threshold:
-                            conflicts_map[cid] += 1
-            # Add random tiebreaker
-            return sorted(courses, key=lambda x: (-(conflicts_map.get(x, 0)), random.random()))
+            degrees = (conflict_graph or self._get_conflict_graph(course_students, params)).degrees
+            return sorted(courses, key=lambda x: (-degrees.get(x, 0), random.random()))
 
         elif strategy == 'reverse_degree':
             # Least conflicts first WITH RANDOM TIEBREAKER
-            conflicts_map = defaultdict(int)
-            for cid in courses:
-                for other_cid in courses:
-                    if cid != other_cid and course_students.get(cid) and course_students.get(other_cid):
-                        if len(course_students[cid] & course_students[other_cid]) >= conflict_threshold:
-                            conflicts_map[cid] += 1
-            # Add random tiebreaker
-            return sorted(courses, key=lambda x: (conflicts_map.get(x, 0), random.random()))
+            degrees = (conflict_graph or self._get_conflict_graph(course_students, params)).degrees
+            return sorted(courses, key=lambda x: (degrees.get(x, 0), random.random()))
 
         elif strategy == 'class_grouped':
             # Group by class WITH SHUFFLE WITHIN SAME SIZE
@@ -990,10 +1059,14 @@ class SinavPlanlama:
                         result.append(by_class[sinif][i])
             return result
 
+        elif strategy == 'color_classes' and course_colors:
+            # Courses of one color class never conflict, keep them together WITH RANDOM TIEBREAKER
+            return sorted(courses, key=lambda x: (course_colors.get(x, 0), random.random()))
+
         elif strategy == 'capacity_aware':
             # Largest capacity first WITH RANDOM TIEBREAKER
             return sorted(courses, key=lambda x: (-course_info[x]['ogrenci_sayisi'], random.random()))
 
         else:
             # Default: class interleaved
-            return self._order_courses_by_strategy(courses, course_info, course_students, 'class_interleaved', params)
\ No newline at end of file
+            return self._order_courses_by_strategy(courses, course_info, course_students, 'class_interleaved', params, conflict_graph, course_colors)
\ No newline at end of file
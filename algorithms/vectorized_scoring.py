@@ -0,0 +1,130 @@
+"""
+Vektörel Öğrenci Metrikleri
+NumPy backend for the per-student metrics of SinavProgramScorer
+"""
+
+from datetime import timedelta
+from typing import Dict, List
+
+import numpy as np
+
+_ONE_US = timedelta(microseconds=1)
+
+
+def _empty_student_metrics() -> Dict:
+    return {
+        'max_student_daily': 0,
+        'avg_student_daily': 0,
+        'student_over_limit': 0,
+        'student_consecutive_total': 0,
+        'student_consecutive_max': 0,
+        'students_with_consecutive': 0,
+        'students_scheduled': 0,
+        'min_gap_violations': 0,
+        'min_gap_violations_list': []
+    }
+
+
+def calculate_student_metrics(
+    unique_exams: List[tuple],
+    conflict_graph,
+    student_limit,
+    required_gap_minutes
+) -> Dict:
+    """
+    Per-student daily counts, consecutive days and min-gap violations on arrays
+
+    Produces the same summary metrics as SinavProgramScorer._calculate_student_metrics
+    (which also returns per-student dicts). Students are the dense ids of the
+    conflict graph; times are integer microseconds so gaps match the timedelta
+    arithmetic of the reference implementation exactly.
+
+    Args:
+        unique_exams: [(ders_id, datetime, date, duration_minutes)] in schedule order
+        conflict_graph: ConflictGraph built from the same course_students
+    """
+    if not unique_exams:
+        return _empty_student_metrics()
+
+    # Per-exam columns
+    reference = unique_exams[0][1]
+    rows = []
+    exam_day = []
+    exam_start = []
+    exam_duration = []
+    for ders_id, exam_datetime, exam_date, duration in unique_exams:
+        if ders_id in conflict_graph.course_index:
+            rows.append(conflict_graph.student_ids(ders_id))
+        else:
+            rows.append(np.empty(0, dtype=np.int64))
+        exam_day.append(exam_date.toordinal())
+        exam_start.append((exam_datetime - reference) // _ONE_US)
+        exam_duration.append(timedelta(minutes=duration) // _ONE_US)
+
+    sizes = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+    if not sizes.sum():
+        return _empty_student_metrics()
+
+    # One event per (exam, enrolled student), in schedule order
+    students = np.concatenate(rows)
+    exam_of = np.repeat(np.arange(len(rows), dtype=np.int64), sizes)
+    days = np.asarray(exam_day, dtype=np.int64)[exam_of]
+
+    # Daily counts: one key per (student, day), sorted by student then day
+    first_day = int(days.min())
+    span = int(days.max()) - first_day + 1
+    pair_keys, pair_counts = np.unique(students * span + (days - first_day), return_counts=True)
+    pair_students = pair_keys // span
+    pair_days = pair_keys % span
+
+    student_starts = np.flatnonzero(np.r_[True, pair_students[1:] != pair_students[:-1]])
+    students_scheduled = len(student_starts)
+    daily_max = np.maximum.reduceat(pair_counts, student_starts)
+
+    # If limit == 0, treat as unlimited (no over-limit)
+    student_over_limit = int((daily_max > student_limit).sum()) if student_limit else 0
+
+    # Longest run of calendar-consecutive exam days per student
+    new_run = np.ones(len(pair_keys), dtype=bool)
+    new_run[1:] = (pair_students[1:] != pair_students[:-1]) | (np.diff(pair_days) != 1)
+    run_starts = np.flatnonzero(new_run)
+    run_lengths = np.diff(np.r_[run_starts, len(pair_keys)])
+    consecutive = np.maximum.reduceat(run_lengths, np.searchsorted(run_starts, student_starts))
+
+    # Min gap: each student's exams sorted by start time (ties keep schedule order)
+    starts = np.asarray(exam_start, dtype=np.int64)[exam_of]
+    order = np.lexsort((exam_of, starts, students))
+    sorted_students = students[order]
+    sorted_starts = starts[order]
+    sorted_exams = exam_of[order]
+
+    same_student = sorted_students[1:] == sorted_students[:-1]
+    durations = np.asarray(exam_duration, dtype=np.int64)
+    gap_us = sorted_starts[1:] - sorted_starts[:-1] - durations[sorted_exams[:-1]]
+    gap_minutes = gap_us / 1e6 / 60
+    violations = np.flatnonzero(same_student & (gap_minutes < required_gap_minutes))
+
+    violations_list = []
+    if len(violations):
+        # Report in the reference order: students by first appearance, then by time
+        seen, first_index = np.unique(students, return_index=True)
+        violation_students = sorted_students[violations]
+        first_seen = first_index[np.searchsorted(seen, violation_students)]
+        for k in violations[np.lexsort((violations, first_seen))][:10].tolist():
+            violations_list.append({
+                'student': conflict_graph.student_numbers[int(sorted_students[k])],
+                'gap_minutes': float(gap_minutes[k]),
+                'required': required_gap_minutes
+            })
+
+    return {
+        'max_student_daily': int(daily_max.max()),
+        'avg_student_daily': int(daily_max.sum()) / students_scheduled,
+        'student_over_limit': student_over_limit,
+        'student_consecutive_total': int(consecutive.sum()),
+        'student_consecutive_max': int(consecutive.max()),
+        'students_with_consecutive': int((consecutive > 1).sum()),
+        'students_scheduled': students_scheduled,
+        'min_gap_violations': len(violations),
+        'min_gap_violations_list': violations_list
+    }
@@ -0,0 +1,101 @@
+"""
+Deneme Zamanlayıcı Performans Testi
+Compares uniform attempt variants with the UCB1 bandit scheduler
+
+Runs AttemptManager with both schedulers on several synthetic departments and
+base seeds (no pruning or local search, so every attempt is scored; the
+manager's early stop still applies). Single runs are dominated by seed luck,
+so the report is the mean best score after N attempts over all runs, how often
+UCB1 is ahead/behind, and the attempts UCB1 needed to reach the final best of
+the uniform run.
+
+Usage (from the project root):
+    python -m benchmarks.bench_attempt_scheduler
+    python -m benchmarks.bench_attempt_scheduler --departments 10 --seeds 3 --attempts 300
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from algorithms.attempt_manager import AttemptManager
+from algorithms.attempt_scheduler import ATTEMPT_SCHEDULERS
+from algorithms.scoring_system import SinavProgramScorer
+from algorithms.sinav_planlama import SinavPlanlama
+from benchmarks.bench_room_allocation import make_snapshot, plan_params
+
+CHECKPOINTS = (25, 50, 100, 150, 300)
+
+
+def run(snapshot, scheduler: str, attempts: int, seed: int) -> Dict:
+    planner = SinavPlanlama()
+    planner.use_snapshot(snapshot)
+    params = plan_params('min_waste', seed)
+    params.update({'attempt_scheduler': scheduler, 'prune_attempts': False})
+    t0 = time.perf_counter()
+    result = AttemptManager(SinavProgramScorer()).run_multiple_attempts(
+        planner.plan_exam_schedule, params, max_attempts=attempts
+    )
+    result['wall_s'] = time.perf_counter() - t0
+    return result
+
+
+def best_after(scores: List[float], n: int) -> float:
+    """Best score of the first n attempts (an early stop keeps the last best)"""
+    return max(scores[:n])
+
+
+def first_reaching(scores: List[float], target: float) -> Optional[int]:
+    for i, score in enumerate(scores):
+        if score >= target:
+            return i + 1
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--courses', type=int, default=80)
+    parser.add_argument('--students', type=int, default=2500)
+    parser.add_argument('--rooms', type=int, default=6)
+    parser.add_argument('--attempts', type=int, default=150)
+    parser.add_argument('--departments', type=int, default=6)
+    parser.add_argument('--seeds', type=int, default=2)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    checkpoints = [n for n in CHECKPOINTS if n <= args.attempts]
+    best = {name: {n: [] for n in checkpoints} for name in ATTEMPT_SCHEDULERS}
+    wall = {name: 0.0 for name in ATTEMPT_SCHEDULERS}
+    reached: List[Optional[int]] = []
+
+    for dept in range(1, args.departments + 1):
+        snapshot = make_snapshot(args.courses, args.students, args.rooms, seed=dept)
+        for seed in range(1, args.seeds + 1):
+            scores = {}
+            for name in ATTEMPT_SCHEDULERS:
+                result = run(snapshot, name, args.attempts, seed)
+                wall[name] += result['wall_s']
+                scores[name] = [entry['score'] for entry in result['attempts_history']['attempts']] or [0.0]
+                for n in checkpoints:
+                    best[name][n].append(best_after(scores[name], n))
+            reached.append(first_reaching(scores['ucb1'], max(scores['uniform'])))
+
+    runs = args.departments * args.seeds
+    print(f"{args.courses} courses, {args.students} students, {args.rooms} rooms, {runs} runs")
+    print(f"{'attempts':>8} {'uniform':>8} {'ucb1':>8} {'ahead':>6} {'behind':>6}")
+    for n in checkpoints:
+        uniform, ucb1 = best['uniform'][n], best['ucb1'][n]
+        ahead = sum(b > u for u, b in zip(uniform, ucb1))
+        behind = sum(b < u for u, b in zip(uniform, ucb1))
+        print(f"{n:>8} {statistics.mean(uniform):8.2f} {statistics.mean(ucb1):8.2f} {ahead:>6} {behind:>6}")
+
+    hits = sorted(r for r in reached if r is not None)
+    median = f"{statistics.median(hits):g}" if hits else '-'
+    print(f"\nUCB1 reached the uniform best in {len(hits)}/{runs} runs, median attempt {median}")
+    print("wall s: " + ", ".join(f"{name} {seconds:.1f}" for name, seconds in wall.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Çakışma Grafiği Performans Testi
+Benchmarks ConflictGraph against the legacy pairwise set-intersection build
+
+Usage (from the project root):
+    python -m benchmarks.bench_conflict_graph
+    python -m benchmarks.bench_conflict_graph --legacy-max 2000
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, FrozenSet, Set
+
+from algorithms.conflict_graph import ConflictGraph
+
+# (courses, students, courses per student)
+SIZES = [
+    (100, 2000, 6),
+    (500, 10000, 6),
+    (1000, 20000, 6),
+    (2000, 40000, 6),
+]
+
+
+def make_enrollments(n_courses: int, n_students: int, per_student: int, seed: int = 42) -> Dict[int, FrozenSet[str]]:
+    """Synthetic enrollments: students take courses mostly from their own class block"""
+    rng = random.Random(seed)
+    block = min(n_courses, max(per_student * 2, n_courses // 4))
+    per_student = min(per_student, block)
+    grouped: Dict[int, Set[str]] = {cid: set() for cid in range(1, n_courses + 1)}
+    for s in range(n_students):
+        ogrenci_no = f"{200000000 + s}"
+        start = rng.randrange(0, max(1, n_courses - block))
+        for cid in rng.sample(range(start + 1, start + block + 1), per_student):
+            grouped[cid].add(ogrenci_no)
+    return {cid: frozenset(students) for cid, students in grouped.items()}
+
+
+def legacy_adjacency(course_students: Dict[int, FrozenSet[str]], threshold: int) -> Dict[int, Set[int]]:
+    """The original O(n²) double loop over course pairs"""
+    conflicts: Dict[int, Set[int]] = {}
+    course_ids = list(course_students.keys())
+    for ders_id1 in course_ids:
+        for ders_id2 in course_ids:
+            if ders_id1 >= ders_id2:
+                continue
+            if len(course_students[ders_id1] & course_students[ders_id2]) >= threshold:
+                conflicts.setdefault(ders_id1, set()).add(ders_id2)
+                conflicts.setdefault(ders_id2, set()).add(ders_id1)
+    return conflicts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threshold', type=int, default=1, help='min_conflict_overlap')
+    parser.add_argument('--legacy-max', type=int, default=1000,
+                        help='largest course count to also time the legacy build on')
+    args = parser.parse_args()
+
+    print(f"{'courses':>8} {'students':>9} {'enroll':>8} {'edges':>9} "
+          f"{'graph s':>9} {'legacy s':>9} {'speedup':>8}  parity")
+    for n_courses, n_students, per_student in SIZES:
+        course_students = make_enrollments(n_courses, n_students, per_student)
+        enrollments = sum(len(s) for s in course_students.values())
+
+        t0 = time.perf_counter()
+        graph = ConflictGraph(course_students, args.threshold)
+        graph_time = time.perf_counter() - t0
+
+        legacy_time = None
+        parity = '-'
+        if n_courses <= args.legacy_max:
+            t0 = time.perf_counter()
+            legacy = legacy_adjacency(course_students, args.threshold)
+            legacy_time = time.perf_counter() - t0
+            parity = 'ok' if legacy == graph.adjacency else 'MISMATCH'
+
+        legacy_col = f"{legacy_time:9.3f}" if legacy_time is not None else f"{'-':>9}"
+        speedup_col = f"{legacy_time / graph_time:7.1f}x" if legacy_time else f"{'-':>8}"
+        print(f"{n_courses:>8} {n_students:>9} {enrollments:>8} {graph.edge_count:>9} "
+              f"{graph_time:9.3f} {legacy_col} {speedup_col}  {parity}")
+
+
+if __name__ == '__main__':
+    main()
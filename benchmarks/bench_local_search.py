@@ -0,0 +1,66 @@
+"""
+Yerel Arama Performans Testi
+Compares blind planning restarts with few restarts plus the local search stage
+
+Runs AttemptManager on a synthetic department twice: once with many attempts
+and no local search (the default 300-attempt run of the coordinator view), once
+with a few attempts followed by local search on the winner. Reports the best
+score and the CPU seconds of each run.
+
+Usage (from the project root):
+    python -m benchmarks.bench_local_search
+    python -m benchmarks.bench_local_search --courses 120 --students 4000 --seconds 5
+"""
+
+import argparse
+import logging
+import time
+
+from algorithms.attempt_manager import AttemptManager
+from algorithms.scoring_system import SinavProgramScorer
+from algorithms.sinav_planlama import SinavPlanlama
+from benchmarks.bench_room_allocation import make_snapshot, plan_params
+
+
+def run(snapshot, attempts: int, seconds: float, seed: int) -> None:
+    planner = SinavPlanlama()
+    planner.use_snapshot(snapshot)
+    params = plan_params('min_waste', seed)
+    params['local_search_seconds'] = seconds
+
+    t0 = time.process_time()
+    result = AttemptManager(SinavProgramScorer()).run_multiple_attempts(
+        planner.plan_exam_schedule, params, max_attempts=attempts
+    )
+    cpu = time.process_time() - t0
+
+    label = f"{attempts} attempts" + (f" + {seconds:g}s search" if seconds else "")
+    if not result['success']:
+        print(f"{label:>24}  failed: {result['message'][:60]}")
+        return
+    search = result.get('local_search') or {}
+    before = f"{search['initial_score']:8.2f}" if search else f"{'-':>8}"
+    print(f"{label:>24} {result['total_attempts']:>5} {before} {result['score']:8.2f} {cpu:8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--courses', type=int, default=80)
+    parser.add_argument('--students', type=int, default=2500)
+    parser.add_argument('--rooms', type=int, default=6)
+    parser.add_argument('--restarts', type=int, default=300)
+    parser.add_argument('--attempts', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    snapshot = make_snapshot(args.courses, args.students, args.rooms, seed=args.seed)
+    print(f"{args.courses} courses, {args.students} students, {args.rooms} rooms")
+    print(f"{'run':>24} {'tried':>5} {'before':>8} {'score':>8} {'cpu s':>8}")
+    run(snapshot, args.restarts, 0, args.seed)
+    run(snapshot, args.attempts, args.seconds, args.seed)
+
+
+if __name__ == '__main__':
+    main()
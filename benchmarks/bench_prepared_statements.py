@@ -0,0 +1,96 @@
+"""
+Hazır İfade Performans Testi
+Per-call latency of the hot model queries with and without server-side prepared statements
+
+Calls the model methods that the planner and the views run in loops for every
+course / exam / program of a department, once with plain queries
+(DB_PREPARED_STATEMENTS=0 behaviour) and once through PREPARE/EXECUTE, on a
+warm connection pool. Reports microseconds per call and the speedup.
+Requires the .env database and a department with data.
+
+Usage (from the project root):
+    python -m benchmarks.bench_prepared_statements
+    python -m benchmarks.bench_prepared_statements --bolum-id 1 --rounds 20
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable, List, Tuple
+
+import models.database as database
+from models.database import db
+from models.ders_model import DersModel
+from models.derslik_model import DerslikModel
+from models.ogrenci_model import OgrenciModel
+from models.sinav_model import SinavModel
+
+
+def pick_department() -> int:
+    rows = db.execute_query(
+        """SELECT bolum_id FROM dersler WHERE aktif = TRUE
+           GROUP BY bolum_id ORDER BY COUNT(*) DESC LIMIT 1"""
+    )
+    if not rows:
+        raise SystemExit("Veritabanında ders yok")
+    return rows[0]['bolum_id']
+
+
+def workloads(bolum_id: int) -> List[Tuple[str, Callable, List[tuple]]]:
+    ders_model, derslik_model = DersModel(db), DerslikModel(db)
+    ogrenci_model, sinav_model = OgrenciModel(db), SinavModel(db)
+
+    dersler = ders_model.get_dersler_by_bolum(bolum_id) or []
+    programs = sinav_model.get_programs_by_bolum(bolum_id) or []
+    sinavlar = [s for p in programs for s in (sinav_model.get_sinavlar_by_program(p['program_id']) or [])]
+    ogrenciler = (ogrenci_model.get_ogrenciler_by_bolum(bolum_id) or [])[:200]
+
+    loads = [
+        ('get_ogrenciler_by_ders', ogrenci_model.get_ogrenciler_by_ders, [(d['ders_id'],) for d in dersler]),
+        ('get_ders_by_kod', ders_model.get_ders_by_kod, [(bolum_id, d['ders_kodu']) for d in dersler]),
+        ('get_ders_by_id', ders_model.get_ders_by_id, [(d['ders_id'],) for d in dersler]),
+        ('get_ogrenci_by_no', ogrenci_model.get_ogrenci_by_no, [(o['ogrenci_no'],) for o in ogrenciler]),
+        ('get_sinavlar_by_program', sinav_model.get_sinavlar_by_program, [(p['program_id'],) for p in programs]),
+        ('get_sinav_derslikleri', sinav_model.get_sinav_derslikleri, [(s['sinav_id'],) for s in sinavlar]),
+        ('get_derslikler_by_bolum', derslik_model.get_derslikler_by_bolum, [(bolum_id,)]),
+        ('get_dersler_by_bolum', ders_model.get_dersler_by_bolum, [(bolum_id,)]),
+    ]
+    return [(name, method, args) for name, method, args in loads if args]
+
+
+def time_calls(method: Callable, args: List[tuple], rounds: int, prepared: bool) -> float:
+    """Microseconds per call"""
+    database.USE_PREPARED_STATEMENTS = prepared
+    for call_args in args[:5]:  # warm-up (and PREPARE on the pooled connections)
+        method(*call_args)
+    calls = 0
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for call_args in args:
+            method(*call_args)
+            calls += 1
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bolum-id', type=int, default=None)
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    bolum_id = args.bolum_id or pick_department()
+    print(f"bolum_id={bolum_id}, {args.rounds} rounds")
+    print(f"{'query':>24} {'calls':>6} {'plain us':>9} {'prep us':>9} {'speedup':>8}")
+    try:
+        for name, method, call_args in workloads(bolum_id):
+            plain = time_calls(method, call_args, args.rounds, prepared=False)
+            prepared = time_calls(method, call_args, args.rounds, prepared=True)
+            print(f"{name:>24} {len(call_args):>6} {plain:9.1f} {prepared:9.1f} {plain / prepared:7.2f}x")
+        print(db.pool_metrics())
+    finally:
+        db.close_all_connections()
+
+
+if __name__ == '__main__':
+    main()
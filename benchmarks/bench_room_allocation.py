@@ -0,0 +1,131 @@
+"""
+Derslik Atama Performans Testi
+Compares the greedy and min_waste room allocation strategies
+
+Part 1 packs random slots (courses allocated largest first, as the planner
+does) and reports placed courses, seat utilization, rooms used and time per
+allocation. Part 2 runs the full planner on a synthetic department with each
+strategy and reports success, seat utilization and wall time.
+
+Usage (from the project root):
+    python -m benchmarks.bench_room_allocation
+    python -m benchmarks.bench_room_allocation --slots 5000 --seeds 10
+"""
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from algorithms.planning_snapshot import PlanningSnapshot
+from algorithms.room_allocation import ROOM_ALLOCATION_STRATEGIES, RoomAllocator
+from algorithms.room_catalog import RoomCatalog
+from algorithms.sinav_planlama import SinavPlanlama
+from benchmarks.bench_conflict_graph import make_enrollments
+
+# (satir, sutun, sira_yapisi) of typical classrooms
+ROOM_SHAPES = [(5, 6, 2), (6, 8, 2), (8, 9, 3), (10, 9, 3), (10, 12, 3), (12, 12, 4), (15, 12, 3), (20, 16, 4)]
+
+
+def make_rooms(n_rooms: int, rng: random.Random) -> List[Dict]:
+    rooms = []
+    for i in range(n_rooms):
+        satir, sutun, sira = rng.choice(ROOM_SHAPES)
+        rooms.append({
+            'derslik_id': 100 + i, 'derslik_kodu': f"R{i}", 'derslik_adi': f"Derslik {i}",
+            'kapasite': satir * sutun, 'satir_sayisi': satir, 'sutun_sayisi': sutun, 'sira_yapisi': sira
+        })
+    return rooms
+
+
+def bench_slots(n_slots: int, n_rooms: int, seed: int) -> None:
+    print(f"Random slots: {n_slots} slots, {n_rooms} rooms")
+    print(f"{'strategy':>10} {'placed':>8} {'util %':>7} {'rooms':>7} {'us/alloc':>9}")
+    for strategy in ROOM_ALLOCATION_STRATEGIES:
+        rng = random.Random(seed)
+        catalog = RoomCatalog(make_rooms(n_rooms, rng))
+        allocator = RoomAllocator(catalog, strategy)
+        placed = total = 0
+        elapsed = 0.0
+        for _ in range(n_slots):
+            catalog.begin_slot()
+            # Demand around the slot's capacity so that packing matters
+            demands = sorted((rng.randint(10, 160) for _ in range(rng.randint(2, 8))), reverse=True)
+            t0 = time.perf_counter()
+            for needed in demands:
+                chosen, covered = allocator.allocate(needed)
+                placed += covered >= needed
+            elapsed += time.perf_counter() - t0
+            total += len(demands)
+        stats = allocator.stats()
+        print(f"{strategy:>10} {placed / total * 100:7.1f}% {stats['utilization'] * 100:6.1f}% "
+              f"{stats['rooms_allocated']:>7} {elapsed / total * 1e6:9.1f}")
+
+
+def make_snapshot(n_courses: int, n_students: int, n_rooms: int, seed: int) -> PlanningSnapshot:
+    enrollments = make_enrollments(n_courses, n_students, 5, seed=seed)
+    dersler = [{
+        'ders_id': cid, 'bolum_id': 1, 'ders_kodu': f"D{cid:03d}", 'ders_adi': f"Ders {cid}",
+        'ogretim_elemani': 'Bench', 'sinif': 1 + (cid - 1) * 4 // n_courses, 'ders_yapisi': 'Zorunlu'
+    } for cid, students in enrollments.items() if students]
+    return PlanningSnapshot(1, dersler, make_rooms(n_rooms, random.Random(seed)), enrollments)
+
+
+def plan_params(strategy: str, seed: int) -> Dict:
+    return {
+        'bolum_id': 1, 'sinav_tipi': 'Final',
+        'baslangic_tarih': datetime(2030, 1, 7, 9, 0), 'bitis_tarih': datetime(2030, 1, 25, 18, 0),
+        'varsayilan_sinav_suresi': 75, 'ara_suresi': 15, 'allowed_weekdays': [0, 1, 2, 3, 4],
+        'gunluk_ilk_sinav': '10:00', 'gunluk_son_sinav': '19:15',
+        'ogle_arasi_baslangic': '12:00', 'ogle_arasi_bitis': '13:30',
+        'class_per_day_limit': 3, 'student_per_day_limit': 0, 'ders_sinavlari_suresi': {},
+        'order_strategy': 'class_interleaved', 'random_seed': seed, 'attempt_number': seed,
+        'room_allocation': strategy
+    }
+
+
+def bench_planner(n_courses: int, n_students: int, n_rooms: int, seeds: int) -> None:
+    print(f"\nPlanner: {n_courses} courses, {n_students} students, {n_rooms} rooms, {seeds} seeds")
+    print(f"{'strategy':>10} {'success':>8} {'util %':>7} {'rooms/exam':>11} {'s/run':>7}")
+    snapshot = make_snapshot(n_courses, n_students, n_rooms, seed=1)
+    for strategy in ROOM_ALLOCATION_STRATEGIES:
+        planner = SinavPlanlama()
+        planner.use_snapshot(snapshot)
+        successes = needed = allocated = rooms = exams = 0
+        t0 = time.perf_counter()
+        for seed in range(seeds):
+            result = planner.plan_exam_schedule(plan_params(strategy, seed))
+            if not result['success']:
+                continue
+            successes += 1
+            stats = result['stats']['room_allocation']
+            needed += stats['seats_needed']
+            allocated += stats['seats_allocated']
+            rooms += len(result['schedule'])
+            exams += result['stats']['scheduled_courses']
+        elapsed = (time.perf_counter() - t0) / seeds
+        util = f"{needed / allocated * 100:6.1f}%" if allocated else f"{'-':>7}"
+        per_exam = f"{rooms / exams:11.2f}" if exams else f"{'-':>11}"
+        print(f"{strategy:>10} {successes:>5}/{seeds:<2} {util} {per_exam} {elapsed:7.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--slots', type=int, default=2000)
+    parser.add_argument('--rooms', type=int, default=12)
+    parser.add_argument('--courses', type=int, default=120)
+    parser.add_argument('--students', type=int, default=4000)
+    parser.add_argument('--planner-rooms', type=int, default=6)
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    bench_slots(args.slots, args.rooms, args.seed)
+    bench_planner(args.courses, args.students, args.planner_rooms, args.seeds)
+
+
+if __name__ == '__main__':
+    main()
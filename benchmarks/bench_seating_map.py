@@ -0,0 +1,174 @@
+"""
+Oturma Haritası Çizim Performans Testi
+Rendering time of the custom-painted seating map against one widget per seat
+
+Generates an exam of N seated students (1,000 by default) over typical
+classrooms, then times:
+  * widgets: the previous QGridLayout map (a styled QPushButton per seat plus
+    corridor/window/door labels), built and painted once
+  * map: SeatingMapView.set_plan plus painting the visible viewport, a zoomed-out
+    full view and scrolling to the last classroom
+Runs offscreen (QT_QPA_PLATFORM=offscreen unless set). No database is needed.
+
+Usage (from the project root):
+    python -m benchmarks.bench_seating_map
+    python -m benchmarks.bench_seating_map --students 1000 5000 --no-widgets
+"""
+
+import argparse
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Tuple
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication, QGridLayout, QLabel, QPushButton, QScrollArea, QVBoxLayout, QWidget
+
+from algorithms.oturma_planlama import OturmaPlanlama
+from algorithms.room_catalog import seating_capacity
+from views.koordinator.seating_map import SeatingMapView
+
+VIEW_SIZE = (1000, 700)
+GEOMETRIES = [(10, 12, 3), (8, 9, 3), (12, 16, 4), (15, 12, 3)]
+
+
+def make_exam(n_students: int, seed: int) -> Tuple[List[Dict], Dict]:
+    """Classrooms and the view's {ogrenci_no: seat} data of an exam"""
+    rng = random.Random(seed)
+    students = [{'ogrenci_no': f"2025{i:05d}", 'ad_soyad': f"Öğrenci Adı {i}"} for i in range(n_students)]
+    rooms, seats = [], 0
+    while seats < n_students:
+        satir, sutun, sira = rng.choice(GEOMETRIES)
+        r = len(rooms) + 1
+        rooms.append({
+            'derslik_id': r, 'derslik_kodu': f"D{r}", 'derslik_adi': f"Derslik {r}",
+            'kapasite': satir * sutun, 'satir_sayisi': satir, 'sutun_sayisi': sutun, 'sira_yapisi': sira
+        })
+        seats += seating_capacity(rooms[-1])
+    plan = OturmaPlanlama._generate_multi_classroom_plan(students, rooms)
+    seating_data = {
+        item['ogrenci_no']: {
+            'derslik_id': item['derslik_id'], 'derslik_adi': item['derslik_adi'],
+            'sira': item['satir'], 'sutun': item['sutun'], 'ad_soyad': item['ad_soyad']
+        }
+        for item in plan
+    }
+    return rooms, seating_data
+
+
+def build_widget_map(classrooms: List[Dict], seating_data: Dict) -> Tuple[QScrollArea, int]:
+    """The previous per-seat widget map (same widgets and style sheets); returns (scroll area, widgets)"""
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    widgets = 0
+    for classroom in classrooms:
+        derslik_id, cols, sira_yapisi = classroom['derslik_id'], classroom['sutun_sayisi'], classroom['sira_yapisi']
+        layout.addWidget(QLabel(f" {classroom['derslik_adi']} (Kapasite: {classroom['kapasite']})"))
+        # The old code scanned seating_data three times per classroom
+        max_used_row = max((d['sira'] for d in seating_data.values() if d['derslik_id'] == derslik_id), default=0)
+        display_rows = max_used_row or min(5, classroom['satir_sayisi'])
+        sum(1 for d in seating_data.values() if d['derslik_id'] == derslik_id)
+        seat_lookup = {(d['sira'], d['sutun']): no for no, d in seating_data.items() if d['derslik_id'] == derslik_id}
+
+        grid = QGridLayout()
+        grid.setSpacing(3)
+        grid.addWidget(QLabel(" TAHTA"), 0, 0, 1, cols + (cols - 1) // sira_yapisi + 2)
+        grid.addWidget(QLabel("P\nE\nN\nC\nE\nR\nE"), 1, 0, display_rows, 1)
+        widgets += 3
+        for row in range(1, display_rows + 1):
+            visual_col = 1
+            for col in range(1, cols + 1):
+                if col > 1 and (col - 1) % sira_yapisi == 0:
+                    spacer = QLabel("│")
+                    spacer.setStyleSheet("color: #d1d5db; font-size: 20px;")
+                    grid.addWidget(spacer, row, visual_col)
+                    visual_col += 1
+                    widgets += 1
+                seat_btn = QPushButton()
+                seat_btn.setFixedSize(65, 65)
+                ogrenci_no = seat_lookup.get((row, col))
+                if ogrenci_no:
+                    seat_btn.setText(f"{ogrenci_no}\n{seating_data[ogrenci_no]['ad_soyad'][:12]}")
+                    seat_btn.setStyleSheet(
+                        "QPushButton { background: #dbeafe; border: 2px solid #3b82f6; border-radius: 6px;"
+                        " font-size: 9px; font-weight: bold; color: #1e40af; }"
+                        " QPushButton:hover { background: #bfdbfe; }"
+                    )
+                else:
+                    seat_btn.setText("✗\nBOŞ")
+                    seat_btn.setStyleSheet(
+                        "QPushButton { background: #fee2e2; border: 2px dashed #ef4444; border-radius: 6px;"
+                        " font-size: 11px; font-weight: bold; color: #991b1b; }"
+                    )
+                grid.addWidget(seat_btn, row, visual_col)
+                visual_col += 1
+                widgets += 1
+        grid.addWidget(QLabel("K\nA\nP\nI"), max(1, display_rows - 3), visual_col, min(4, display_rows), 1)
+        grid_widget = QWidget()
+        grid_widget.setLayout(grid)
+        layout.addWidget(grid_widget)
+        widgets += 2
+
+    scroll = QScrollArea()
+    scroll.setWidgetResizable(True)
+    scroll.setWidget(container)
+    return scroll, widgets
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, nargs='+', default=[1000])
+    parser.add_argument('--no-widgets', action='store_true', help='skip the per-seat widget map')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = QApplication.instance() or QApplication([])
+
+    for n in args.students:
+        classrooms, seating_data = make_exam(n, args.seed)
+        print(f"\n{n} students, {len(classrooms)} classrooms ({VIEW_SIZE[0]}x{VIEW_SIZE[1]} viewport)")
+
+        if not args.no_widgets:
+            holder = {}
+
+            def build_widgets():
+                holder['scroll'], holder['count'] = build_widget_map(classrooms, seating_data)
+                holder['scroll'].resize(*VIEW_SIZE)
+                holder['scroll'].show()
+                holder['scroll'].grab()
+
+            ms = timed(build_widgets)
+            print(f"  widgets: build + first paint {ms:8.1f} ms  ({holder['count']} widgets)")
+            holder['scroll'].close()
+            holder['scroll'].deleteLater()
+            app.processEvents()
+
+        view = SeatingMapView()
+        view.resize(*VIEW_SIZE)
+        view.show()
+        set_ms = timed(lambda: view.set_plan(classrooms, seating_data))
+        paint_ms = timed(view.grab)
+        repaint_ms = timed(view.grab)
+        view.set_zoom(0.15)
+        overview_ms = timed(view.grab)
+        view.set_zoom(1.0)
+        view.verticalScrollBar().setValue(view.verticalScrollBar().maximum())
+        scroll_ms = timed(view.grab)
+        items = len(view.scene().items())
+        print(f"  map:     set_plan {set_ms:8.1f} ms, first paint {paint_ms:6.1f} ms  ({items} items)")
+        print(f"           repaint {repaint_ms:6.1f} ms, zoomed-out overview {overview_ms:6.1f} ms, "
+              f"scrolled to end {scroll_ms:6.1f} ms")
+        view.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Oturma Planı Kayıt Performans Testi
+Times the bulk seating save against the per-row insert_oturma path on a live database
+
+Creates a throw-away department (students, one course, one exam and enough
+classrooms) for each size, saves a generated seating plan with both paths and
+deletes the department again (ON DELETE CASCADE). Requires the .env database.
+
+Usage (from the project root):
+    python -m benchmarks.bench_seating_save
+    python -m benchmarks.bench_seating_save --sizes 100 1000 10000 --legacy-max 1000
+"""
+
+import argparse
+import logging
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+from algorithms.oturma_planlama import OturmaPlanlama
+from models.database import db
+
+ROOM_ROWS = 10
+ROOM_COLS = 12
+ROOM_SIRA = 3  # dolu-boş-dolu: 8 seats per row
+
+
+def create_fixture(n_students: int) -> Tuple[int, int, List[Dict], List[Dict]]:
+    """Department with n students enrolled in one exam; returns (bolum_id, sinav_id, students, rooms)"""
+    tag = uuid.uuid4().hex[:8]
+    seats_per_room = ROOM_ROWS * 8
+    n_rooms = -(-n_students // seats_per_room)
+
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO bolumler (bolum_adi, bolum_kodu) VALUES (%s, %s) RETURNING bolum_id",
+            (f"Bench {tag}", f"B{tag}")
+        )
+        bolum_id = cursor.fetchone()['bolum_id']
+
+        students = [{'ogrenci_no': f"{tag}{i:07d}", 'ad_soyad': f"Öğrenci {i}"} for i in range(n_students)]
+        cursor.executemany(
+            "INSERT INTO ogrenciler (ogrenci_no, bolum_id, ad_soyad, sinif) VALUES (%s, %s, %s, 1)",
+            [(s['ogrenci_no'], bolum_id, s['ad_soyad']) for s in students]
+        )
+
+        cursor.execute(
+            """INSERT INTO dersler (bolum_id, ders_kodu, ders_adi, ogretim_elemani, sinif, ders_yapisi)
+               VALUES (%s, %s, 'Bench', 'Bench', 1, 'Zorunlu') RETURNING ders_id""",
+            (bolum_id, f"BN{tag}")
+        )
+        ders_id = cursor.fetchone()['ders_id']
+        cursor.executemany(
+            "INSERT INTO ders_kayitlari (ogrenci_no, ders_id) VALUES (%s, %s)",
+            [(s['ogrenci_no'], ders_id) for s in students]
+        )
+
+        cursor.execute(
+            """INSERT INTO sinav_programi (bolum_id, program_adi, sinav_tipi, baslangic_tarihi, bitis_tarihi)
+               VALUES (%s, %s, 'Final', '2030-01-07', '2030-01-07') RETURNING program_id""",
+            (bolum_id, f"Bench {tag}")
+        )
+        program_id = cursor.fetchone()['program_id']
+        cursor.execute(
+            """INSERT INTO sinavlar (program_id, ders_id, tarih, baslangic_saati, bitis_saati)
+               VALUES (%s, %s, '2030-01-07', '09:00', '10:15') RETURNING sinav_id""",
+            (program_id, ders_id)
+        )
+        sinav_id = cursor.fetchone()['sinav_id']
+
+        rooms = []
+        for r in range(n_rooms):
+            cursor.execute(
+                """INSERT INTO derslikler (bolum_id, derslik_kodu, derslik_adi, kapasite,
+                                           satir_sayisi, sutun_sayisi, sira_yapisi)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING *""",
+                (bolum_id, f"D{r}", f"Derslik {r}", ROOM_ROWS * ROOM_COLS, ROOM_ROWS, ROOM_COLS, ROOM_SIRA)
+            )
+            room = dict(cursor.fetchone())
+            cursor.execute(
+                "INSERT INTO sinav_derslikleri (sinav_id, derslik_id) VALUES (%s, %s)",
+                (sinav_id, room['derslik_id'])
+            )
+            rooms.append(room)
+
+    return bolum_id, sinav_id, students, rooms
+
+
+def drop_fixture(bolum_id: int) -> None:
+    with db.get_cursor() as cursor:
+        cursor.execute("DELETE FROM bolumler WHERE bolum_id = %s", (bolum_id,))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--legacy-max', type=int, default=1000,
+                        help='largest seat count to also time the per-row path on')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    planner = OturmaPlanlama()
+
+    print(f"{'seats':>7} {'per-row s':>10} {'bulk s':>8} {'speedup':>8}  counters")
+    for size in args.sizes:
+        bolum_id, sinav_id, students, rooms = create_fixture(size)
+        try:
+            plan = planner._generate_multi_classroom_plan(students, rooms)
+
+            legacy_time = None
+            if size <= args.legacy_max:
+                t0 = time.perf_counter()
+                for item in plan:
+                    planner.oturma_model.insert_oturma(dict(item, sinav_id=sinav_id))
+                legacy_time = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            result = planner.save_seating_plan(sinav_id, plan, replace=True)
+            bulk_time = time.perf_counter() - t0
+            if not result['success']:
+                print(f"{size:>7}  {result['message']}")
+                continue
+
+            # yerlesim_sayisi must match the rows written
+            counters = db.execute_query(
+                """SELECT COALESCE(SUM(yerlesim_sayisi), 0) AS toplam
+                   FROM sinav_derslikleri WHERE sinav_id = %s""",
+                (sinav_id,)
+            )[0]['toplam']
+            check = 'ok' if counters == len(plan) else f"MISMATCH ({counters})"
+
+            legacy_col = f"{legacy_time:10.3f}" if legacy_time is not None else f"{'-':>10}"
+            speedup_col = f"{legacy_time / bulk_time:7.1f}x" if legacy_time else f"{'-':>8}"
+            print(f"{size:>7} {legacy_col} {bulk_time:8.3f} {speedup_col}  {check}")
+        finally:
+            drop_fixture(bolum_id)
+
+    db.close_all_connections()
+
+
+if __name__ == '__main__':
+    main()
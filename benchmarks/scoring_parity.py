@@ -0,0 +1,131 @@
+"""
+Puanlama Backend Karşılaştırması
+Checks that the numpy scoring backend matches the python reference exactly,
+then times both on a large synthetic schedule
+
+Usage (from the project root):
+    python -m benchmarks.scoring_parity
+    python -m benchmarks.scoring_parity --cases 500 --courses 2000 --students 40000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List
+
+from algorithms.conflict_graph import ConflictGraph
+from algorithms.scoring_system import SinavProgramScorer
+from benchmarks.bench_conflict_graph import make_enrollments
+
+
+def make_schedule(course_students: Dict[int, FrozenSet[str]], rng: random.Random, days: int = 10) -> List[Dict]:
+    """Random schedule exercising the edge cases the scorer handles"""
+    start = datetime(2025, 1, 6, 9, 0)
+    course_ids = list(course_students.keys())
+    schedule = []
+    for cid in course_ids:
+        # Coarse grid so that equal start times (ties) and short gaps are common
+        tarih_saat = start + timedelta(days=rng.randrange(days), minutes=15 * rng.randrange(40))
+        sure = rng.choice([30, 60, 75, 90, 120])
+        rooms = rng.choice([1, 1, 1, 2, 3])
+        for _ in range(rooms):
+            exam = {
+                'ders_id': cid,
+                'ders_kodu': f"D{cid:03d}",
+                'tarih_saat': tarih_saat.isoformat() if rng.random() < 0.2 else tarih_saat,
+                'derslik_id': rng.randrange(1, 12)
+            }
+            if rng.random() < 0.9:
+                exam['sure'] = sure
+            schedule.append(exam)
+    # Occasionally the same course twice at different times, or an unknown course
+    if rng.random() < 0.3:
+        extra = dict(rng.choice(schedule))
+        extra['tarih_saat'] = start + timedelta(days=rng.randrange(days), hours=3)
+        schedule.append(extra)
+    if rng.random() < 0.3:
+        schedule.append({'ders_id': 10 ** 6, 'tarih_saat': start, 'sure': 60, 'derslik_id': 1})
+    rng.shuffle(schedule)
+    return schedule
+
+
+def make_params(rng: random.Random) -> Dict:
+    params = {'ara_suresi': rng.choice([0, 10, 15, 30])}
+    limit_mode = rng.randrange(3)
+    if limit_mode == 0:
+        params['student_per_day_limit'] = rng.choice([0, 1, 2, 3])
+    elif limit_mode == 1:
+        params['class_per_day_limit'] = rng.choice([0, 2, 3])
+    return params
+
+
+def check_parity(cases: int, seed: int) -> int:
+    rng = random.Random(seed)
+    python_scorer = SinavProgramScorer(backend='python')
+    numpy_scorer = SinavProgramScorer(backend='numpy')
+    failures = 0
+
+    for case in range(cases):
+        n_courses = rng.randrange(1, 60)
+        course_students = make_enrollments(n_courses, rng.randrange(0, 400), rng.randrange(1, 5), seed=case)
+        course_info = {cid: {'sinif': rng.randrange(0, 5)} for cid in course_students}
+        schedule = make_schedule(course_students, rng)
+        params = make_params(rng)
+        graph = ConflictGraph(course_students) if rng.random() < 0.5 else None
+
+        expected = python_scorer.score_schedule(schedule, course_students, course_info, params)
+        actual = numpy_scorer.score_schedule(schedule, course_students, course_info, params, conflict_graph=graph)
+
+        mismatches = []
+        if expected['total_score'] != actual['total_score']:
+            mismatches.append('total_score')
+        if expected['breakdown'] != actual['breakdown']:
+            mismatches.append('breakdown')
+        for key, value in actual['metrics'].items():
+            if expected['metrics'].get(key) != value:
+                mismatches.append(f"metrics.{key}")
+        if expected['penalties'] != actual['penalties'] or expected['bonuses'] != actual['bonuses']:
+            mismatches.append('penalties/bonuses')
+
+        if mismatches:
+            failures += 1
+            print(f"❌ case {case}: {', '.join(mismatches)}")
+
+    print(f"{'✅' if not failures else '❌'} parity: {cases - failures}/{cases} cases identical")
+    return failures
+
+
+def time_backends(n_courses: int, n_students: int, repeats: int) -> None:
+    rng = random.Random(7)
+    course_students = make_enrollments(n_courses, n_students, 6)
+    course_info = {cid: {'sinif': 1 + cid % 4} for cid in course_students}
+    schedule = make_schedule(course_students, rng, days=15)
+    params = {'ara_suresi': 15, 'student_per_day_limit': 3, 'class_per_day_limit': 3}
+    graph = ConflictGraph(course_students)
+
+    for backend in ('python', 'numpy'):
+        scorer = SinavProgramScorer(backend=backend)
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            result = scorer.score_schedule(schedule, course_students, course_info, params, conflict_graph=graph)
+        elapsed = (time.perf_counter() - t0) / repeats
+        print(f"{backend:>7}: {elapsed * 1000:9.1f} ms/score  (total_score={result['total_score']})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--courses', type=int, default=2000)
+    parser.add_argument('--students', type=int, default=40000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    failures = check_parity(args.cases, args.seed)
+    time_backends(args.courses, args.students, args.repeats)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,7 @@ Business logic for student management
 """
 
 import logging
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from models.database import db
 
 logger = logging.getLogger(__name__)
@@ -106,31 +106,172 @@ class OgrenciController:
             logger.error(f"Error deleting student: {e}")
             return {'success': False, 'message': str(e)}
     
-    def bulk_import_students(self, students: List[Dict], bolum_id: int) -> Dict:
-        """Bulk import students"""
+    def import_ogrenciler(
+        self,
+        ogrenciler: List[Dict],
+        bolum_id: int,
+        skip_existing: bool = True,
+        chunk_size: int = 1000,
+        progress_callback: Optional[Callable[[int, str], None]] = None
+    ) -> Dict:
+        """
+        Import an Excel student list in chunks
+
+        Existing student numbers and the department's ders_kodu -> ders_id map
+        are fetched once; students and their course registrations are then
+        written with one transaction per chunk. Rows get the same outcome as
+        create_ogrenci one by one: existing (or repeated) numbers are skipped
+        or reported, rows without number/name are errors, unknown course codes
+        are only logged. If a chunk fails it is retried row by row so the
+        failing rows are reported individually.
+
+        Args:
+            ogrenciler: Parsed rows (ogrenci_no, ad_soyad, sinif, dersler); row i is Excel row i + 2
+            skip_existing: Skip existing students instead of reporting them as errors
+
+        Returns:
+            {'success', 'message', 'success_count', 'skipped_count', 'error_count',
+             'skipped': [row info], 'errors': [row info + 'message']}
+        """
+        from models.ders_model import DersModel
+
+        def report(percent: int, message: str):
+            if progress_callback:
+                progress_callback(percent, message)
+
+        skipped: List[Dict] = []
+        errors: List[Dict] = []
+        success_count = 0
+
         try:
-            success_count = 0
-            error_count = 0
-            errors = []
-            
-            for student in students:
-                student['bolum_id'] = bolum_id
-                result = self.create_ogrenci(student)
-                
-                if result['success']:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    errors.append(f"{student['ogrenci_no']}: {result['message']}")
-            
+            report(0, "Mevcut öğrenciler kontrol ediliyor...")
+            existing = self.ogrenci_model.get_existing_ogrenci_nos(
+                [o.get('ogrenci_no') for o in ogrenciler if o.get('ogrenci_no')]
+            )
+            ders_map = DersModel(db).get_ders_id_map(bolum_id)
+
+            # Decide every row up front; seen numbers behave like existing ones
+            pending: List[Dict] = []
+            unknown_courses = set()
+            for idx, ogrenci in enumerate(ogrenciler, 1):
+                ogrenci['bolum_id'] = bolum_id
+                row_info = {
+                    'row': idx + 1,  # +1 for header row in Excel
+                    'ogrenci_no': ogrenci.get('ogrenci_no'),
+                    'ad_soyad': ogrenci.get('ad_soyad')
+                }
+                ogrenci_no = ogrenci.get('ogrenci_no')
+
+                if skip_existing and ogrenci_no in existing:
+                    skipped.append(row_info)
+                    continue
+                if not ogrenci_no:
+                    errors.append(dict(row_info, message="Öğrenci numarası gereklidir!"))
+                    continue
+                if not ogrenci.get('ad_soyad'):
+                    errors.append(dict(row_info, message="Ad soyad gereklidir!"))
+                    continue
+                if ogrenci_no in existing:
+                    errors.append(dict(row_info, message=f"Öğrenci no '{ogrenci_no}' zaten mevcut!"))
+                    continue
+
+                existing.add(ogrenci_no)
+                ders_ids = []
+                for ders_kodu in ogrenci.get('dersler', []) or []:
+                    ders_id = ders_map.get(ders_kodu.strip())
+                    if ders_id is None:
+                        unknown_courses.add(ders_kodu.strip())
+                    else:
+                        ders_ids.append(ders_id)
+                pending.append({'ogrenci': ogrenci, 'row_info': row_info, 'ders_ids': ders_ids})
+
+            if unknown_courses:
+                logger.warning(f"Ders bulunamadı: {', '.join(sorted(unknown_courses))}")
+
+            total = len(pending)
+            for start in range(0, total, chunk_size):
+                chunk = pending[start:start + chunk_size]
+                report(
+                    5 + int(90 * start / total),
+                    f"Kaydediliyor: {start}/{total}"
+                )
+                success_count += self._import_chunk(chunk, bolum_id, skip_existing, skipped, errors)
+
+            report(100, "Tamamlandı!")
+
+        except Exception as e:
+            logger.error(f"Error importing students: {e}", exc_info=True)
             return {
-                'success': True,
-                'message': f"{success_count} öğrenci başarıyla eklendi, {error_count} hata.",
+                'success': False,
+                'message': str(e),
                 'success_count': success_count,
-                'error_count': error_count,
+                'skipped_count': len(skipped),
+                'error_count': len(errors),
+                'skipped': skipped,
                 'errors': errors
             }
-            
+
+        skipped.sort(key=lambda r: r['row'])
+        errors.sort(key=lambda r: r['row'])
+        logger.info(
+            f"✅ Student import: {success_count} added, {len(skipped)} skipped, {len(errors)} errors"
+        )
+        return {
+            'success': True,
+            'message': f"{success_count} öğrenci başarıyla eklendi, {len(errors)} hata.",
+            'success_count': success_count,
+            'skipped_count': len(skipped),
+            'error_count': len(errors),
+            'skipped': skipped,
+            'errors': errors
+        }
+
+    def _import_chunk(
+        self,
+        chunk: List[Dict],
+        bolum_id: int,
+        skip_existing: bool,
+        skipped: List[Dict],
+        errors: List[Dict]
+    ) -> int:
+        """Write one chunk in a single transaction; falls back to create_ogrenci per row"""
+        rows = [
+            (e['ogrenci']['ogrenci_no'], bolum_id, e['ogrenci']['ad_soyad'], e['ogrenci'].get('sinif', 1))
+            for e in chunk
+        ]
+        kayitlar = [
+            (e['ogrenci']['ogrenci_no'], ders_id)
+            for e in chunk
+            for ders_id in dict.fromkeys(e['ders_ids'])
+        ]
+
+        try:
+            inserted = self.ogrenci_model.bulk_insert_ogrenciler(rows, kayitlar)
         except Exception as e:
-            logger.error(f"Error bulk importing students: {e}")
-            return {'success': False, 'message': str(e)}
+            logger.warning(f"⚠️ Bulk chunk failed, retrying row by row: {e}")
+            count = 0
+            for entry in chunk:
+                result = self.create_ogrenci(entry['ogrenci'])
+                if result['success']:
+                    count += 1
+                else:
+                    errors.append(dict(entry['row_info'], message=result['message']))
+            return count
+
+        # Rows created concurrently since the pre-fetch were not inserted
+        for entry in chunk:
+            if entry['ogrenci']['ogrenci_no'] not in inserted:
+                if skip_existing:
+                    skipped.append(entry['row_info'])
+                else:
+                    errors.append(dict(
+                        entry['row_info'],
+                        message=f"Öğrenci no '{entry['ogrenci']['ogrenci_no']}' zaten mevcut!"
+                    ))
+        return len(inserted)
+
+    def bulk_import_students(self, students: List[Dict], bolum_id: int) -> Dict:
+        """Bulk import students"""
+        result = self.import_ogrenciler(students, bolum_id, skip_existing=False)
+        result['errors'] = [f"{e['ogrenci_no']}: {e['message']}" for e in result['errors']]
+        return result
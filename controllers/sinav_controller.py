@@ -148,36 +148,39 @@ class SinavController:
                 f"{len(grouped_exams)} unique exams"
             )
 
-            # Insert exams
-            success_count = 0
+            # Prepare rows; a group that cannot be prepared counts as an error
+            prepared = []
             error_count = 0
-
             for (ders_id, tarih_saat), exam_group in grouped_exams.items():
                 try:
-                    # Prepare exam data
-                    exam_data = self._prepare_exam_data(
-                        exam_group[0],
-                        program_id
-                    )
-
-                    # Collect classrooms
-                    derslik_ids = self._collect_classroom_ids(exam_group)
-
-                    # Insert exam with classrooms atomically
-                    sinav_id = self.sinav_model.insert_exam_with_classrooms(
-                        exam_data,
-                        derslik_ids
-                    )
-
-                    success_count += 1
-
+                    exam_data = self._prepare_exam_data(exam_group[0], program_id)
+                    exam_data['derslik_ids'] = self._collect_classroom_ids(exam_group)
+                    exam_data['sira'] = len(prepared)
+                    prepared.append(exam_data)
                 except Exception as e:
-                    logger.error(
-                        f"Error saving exam for ders_id {ders_id}: {e}",
-                        exc_info=True
-                    )
+                    logger.error(f"Error preparing exam for ders_id {ders_id}: {e}", exc_info=True)
                     error_count += 1
 
+            # Insert exams: one bulk transaction, per-exam inserts as fallback
+            capacity_warnings = 0
+            try:
+                bulk = self.sinav_model.bulk_insert_exams(program_id, prepared)
+                success_count = len(bulk['inserted'])
+                error_count += len(prepared) - success_count
+                capacity_warnings = len(bulk['capacity_warnings'])
+
+                by_sira = {exam['sira']: exam for exam in prepared}
+                for sira, reason in bulk['rejected'].items():
+                    logger.error(f"Error saving exam for ders_id {by_sira[sira]['ders_id']}: {reason}")
+                for sira in bulk['capacity_warnings']:
+                    logger.warning(
+                        f"⚠️ Classroom capacity below enrollment for ders_id {by_sira[sira]['ders_id']}"
+                    )
+            except Exception as e:
+                logger.warning(f"⚠️ Bulk save failed, saving exams one by one: {e}")
+                success_count, failed = self._save_exams_individually(prepared)
+                error_count += failed
+
             # Result
             success = error_count == 0 and success_count > 0
 
@@ -189,12 +192,16 @@ class SinavController:
                     f"{success_count} başarılı, {error_count} hatalı"
                 )
 
+            if capacity_warnings:
+                message += f"\n⚠️ {capacity_warnings} sınavda derslik kapasitesi öğrenci sayısından az"
+
             return {
                 'success': success,
                 'message': message,
                 'program_id': program_id,
                 'success_count': success_count,
                 'error_count': error_count,
+                'capacity_warnings': capacity_warnings,
             }
 
         except Exception as e:
@@ -204,6 +211,27 @@ class SinavController:
                 'message': f"Kaydetme hatası: {str(e)}"
             }
 
+    def _save_exams_individually(self, prepared: List[Dict]) -> tuple:
+        """Insert prepared exams one transaction each; returns (success_count, error_count)"""
+        success_count = 0
+        error_count = 0
+
+        for exam_data in prepared:
+            try:
+                self.sinav_model.insert_exam_with_classrooms(
+                    exam_data,
+                    exam_data['derslik_ids']
+                )
+                success_count += 1
+            except Exception as e:
+                logger.error(
+                    f"Error saving exam for ders_id {exam_data['ders_id']}: {e}",
+                    exc_info=True
+                )
+                error_count += 1
+
+        return success_count, error_count
+
     def get_schedule_by_program(self, program_id: int) -> List[Dict]:
         """Get full schedule for a program"""
         try:
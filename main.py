@@ -4,6 +4,7 @@ Tek Pencere Mimarisi - Login ve Ana Ekran
 """
 import sys
 import logging
+import multiprocessing
 from datetime import datetime
 from pathlib import Path
 
@@ -315,4 +316,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the process-pool planning mode in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -5,11 +5,15 @@ Thread-safe PostgreSQL connection pooling
 
 import os
 import logging
+import re
+import time
+import weakref
+from collections import deque
 from contextlib import contextmanager
 import threading
-from typing import Optional, Dict, Any, List
+from typing import Callable, NamedTuple, Optional, Dict, Any, List, Set
 import psycopg2
-from psycopg2 import pool, extras
+from psycopg2 import errors, extensions, extras
 from psycopg2.pool import PoolError
 from dotenv import load_dotenv
 
@@ -17,6 +21,260 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Errors after which a connection is not trusted any more
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+# Server-side prepared statements for hot queries; set to 0 behind a
+# transaction-mode pooler (e.g. PgBouncer) where sessions are not kept
+USE_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', '1') != '0'
+
+_STATEMENT_NAME = re.compile(r'^[a-z_][a-z0-9_]*$')
+_PLACEHOLDER = re.compile(r'%%|%s')
+
+
+class PreparedStatement(NamedTuple):
+    """A named query: psycopg2 text (%s placeholders) and its PREPARE / EXECUTE forms"""
+    name: str
+    query: str
+    prepare_sql: str
+    execute_sql: str
+
+    @classmethod
+    def from_query(cls, name: str, query: str) -> 'PreparedStatement':
+        if not _STATEMENT_NAME.match(name):
+            raise ValueError(f"Geçersiz hazır ifade adı: {name!r}")
+        if '%(' in query:
+            raise ValueError(f"{name}: hazır ifadelerde yalnızca %s yer tutucuları desteklenir")
+
+        count = 0
+
+        def positional(match) -> str:
+            nonlocal count
+            if match.group() == '%%':
+                return '%'
+            count += 1
+            return f"${count}"
+
+        body = _PLACEHOLDER.sub(positional, query)
+        args = f" ({', '.join(['%s'] * count)})" if count else ''
+        return cls(name, query, f"PREPARE {name} AS {body}", f"EXECUTE {name}{args}")
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool with a bounded wait queue
+
+    - Checkout is a single locked pop; connections are not tested on every use.
+      A connection is validated with SELECT 1 only if it was idle longer than
+      max_idle_seconds or was returned after an error, and idle connections are
+      re-validated after another connection failed (server restart, network).
+    - session_settings are applied once per connection with set_config(), e.g.
+      {'statement_timeout': '30s', 'application_name': 'sinav_takvimi'}.
+    - When all maxconn connections are busy, getconn() waits up to
+      checkout_timeout seconds for one to be returned before raising PoolError.
+    - metrics() reports size, in-use/idle counts, waits, timeouts and health checks.
+
+    Like psycopg2's pools, at most minconn idle connections are kept open.
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        session_settings: Optional[Dict[str, str]] = None,
+        checkout_timeout: float = 10.0,
+        max_idle_seconds: float = 300.0,
+        connect: Optional[Callable] = None,
+        **connect_kwargs
+    ):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Geçersiz havuz boyutu: minconn={minconn}, maxconn={maxconn}")
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.session_settings = dict(session_settings or {})
+        self.checkout_timeout = float(checkout_timeout)
+        self.max_idle_seconds = float(max_idle_seconds)
+        self._connect = connect or psycopg2.connect
+        self._connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: deque = deque()  # (conn, returned_at, needs_check), most recent last
+        self._in_use: Dict[int, object] = {}  # id(conn) -> conn
+        self._size = 0  # open connections, idle + in use + being opened
+        self._waiting = 0
+        self._failed_at = 0.0  # last connection failure; older idle connections get validated
+        self._closed = False
+        self._stats = {
+            'checkouts': 0, 'waited_checkouts': 0, 'wait_seconds_total': 0.0, 'wait_seconds_max': 0.0,
+            'timeouts': 0, 'created': 0, 'discarded': 0, 'health_checks': 0, 'failed_health_checks': 0,
+            'max_in_use': 0
+        }
+
+        for _ in range(minconn):
+            self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                self._size -= 1
+                self.closeall()
+                raise
+            self._idle.append((conn, time.monotonic(), False))
+
+    def _open(self):
+        conn = self._connect(**self._connect_kwargs)
+        try:
+            if self.session_settings:
+                with conn.cursor() as cursor:
+                    for name, value in self.session_settings.items():
+                        cursor.execute("SELECT set_config(%s, %s, false)", (name, str(value)))
+                conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def _healthy(self, conn) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            conn.rollback()
+            healthy = True
+        except Exception as e:
+            healthy = False
+            logger.warning(f"⚠️ Bozuk bağlantı havuzdan atıldı: {e}")
+        with self._cond:
+            self._stats['health_checks'] += 1
+            self._stats['failed_health_checks'] += not healthy
+        return healthy
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify()
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Check out a connection, waiting up to timeout (default checkout_timeout) seconds"""
+        started = time.monotonic()
+        deadline = started + (self.checkout_timeout if timeout is None else timeout)
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+                    if self._idle:
+                        conn, returned_at, needs_check = self._idle.pop()
+                        break
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolError(
+                            f"connection pool exhausted: {self.maxconn} connections busy for "
+                            f"{time.monotonic() - started:.1f}s"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if conn is None:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._failed_at = time.monotonic()
+                        self._cond.notify()
+                    raise
+            else:
+                # Lazy health check: only after an error or a long idle period
+                stale = (
+                    needs_check or conn.closed
+                    or returned_at <= self._failed_at
+                    or time.monotonic() - returned_at > self.max_idle_seconds
+                )
+                if stale and (conn.closed or not self._healthy(conn)):
+                    self._discard(conn)
+                    continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(conn)] = conn
+                stats = self._stats
+                stats['checkouts'] += 1
+                stats['max_in_use'] = max(stats['max_in_use'], len(self._in_use))
+                if waited > 0.001:
+                    stats['waited_checkouts'] += 1
+                stats['wait_seconds_total'] += waited
+                stats['wait_seconds_max'] = max(stats['wait_seconds_max'], waited)
+            return conn
+
+    def putconn(self, conn, close: bool = False, failed: bool = False) -> None:
+        """Return a connection; close=True drops it, failed=True has it validated on next checkout"""
+        with self._cond:
+            if self._in_use.pop(id(conn), None) is None:
+                raise PoolError("connection not checked out from this pool")
+        if close or conn.closed or self._closed:
+            self._discard(conn)
+            return
+        try:
+            # Same reset as psycopg2's pools: never hand out an open transaction
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            failed = True
+            if conn.closed:
+                self._discard(conn)
+                return
+        with self._cond:
+            if len(self._idle) >= max(self.minconn, self._waiting):
+                keep = False
+            else:
+                keep = True
+                self._idle.append((conn, time.monotonic(), failed))
+                self._cond.notify()
+        if not keep:
+            self._discard(conn)
+
+    def mark_failed(self) -> None:
+        """A connection failed: validate every connection that was idle before now"""
+        with self._cond:
+            self._failed_at = time.monotonic()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size, 'in_use': len(self._in_use), 'idle': len(self._idle),
+                'waiting': self._waiting, 'minconn': self.minconn, 'maxconn': self.maxconn
+            })
+        checkouts = stats['checkouts']
+        stats['wait_ms_avg'] = round(stats['wait_seconds_total'] / checkouts * 1000, 3) if checkouts else 0.0
+        stats['wait_ms_max'] = round(stats.pop('wait_seconds_max') * 1000, 3)
+        stats.pop('wait_seconds_total')
+        return stats
+
+    def closeall(self) -> None:
+        """Close idle connections now and checked-out ones when they are returned"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
 
 class DatabaseManager:
     """Thread-safe veritabanı bağlantı havuzu yöneticisi"""
@@ -24,21 +282,37 @@ class DatabaseManager:
     _pool = None
     _lock = threading.Lock()
 
+    # Prepared statement registry (name -> statement) and, per live connection,
+    # the names already PREPAREd on it; a new connection starts empty
+    _statements: Dict[str, PreparedStatement] = {}
+    _prepared = weakref.WeakKeyDictionary()
+    _statement_lock = threading.Lock()
+    _statement_stats = {'prepared_executes': 0, 'prepares': 0, 'reprepares': 0}
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self):
-        if self._pool is None:
-            self._initialize_pool()
+        # Pool is created lazily on first use (see _ensure_pool) so that importing
+        # this module - e.g. in planning worker processes - opens no connections.
+        pass
 
     def _initialize_pool(self):
         """Connection pool'u başlat"""
         try:
+            # Applied once per connection; empty values are skipped
+            session_settings = {
+                'statement_timeout': os.getenv('DB_STATEMENT_TIMEOUT', ''),  # e.g. 30s (default: none)
+                'application_name': os.getenv('DB_APPLICATION_NAME', 'sinav_takvimi')
+            }
             db_config = {
                 'minconn': int(os.getenv('DB_POOL_SIZE', 5)),
                 'maxconn': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+                'session_settings': {k: v for k, v in session_settings.items() if v},
+                'checkout_timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                'max_idle_seconds': float(os.getenv('DB_POOL_MAX_IDLE', 300)),
                 'host': os.getenv('DB_HOST', 'localhost'),
                 'port': int(os.getenv('DB_PORT', 5432)),
                 'database': os.getenv('DB_NAME', 'sinav_takvimi_db'),
@@ -49,49 +323,45 @@ class DatabaseManager:
             
             logger.info(f"Initializing connection pool: {db_config['user']}@{db_config['host']}:{db_config['port']}/{db_config['database']}")
             
-            self._pool = psycopg2.pool.ThreadedConnectionPool(**db_config)
+            self._pool = ConnectionPool(**db_config)
             logger.info("✅ Database connection pool initialized successfully")
         except Exception as e:
             logger.error(f"❌ Database connection pool initialization failed: {str(e)}", exc_info=True)
             raise
 
-    def _ensure_pool(self):
-        """Ensure pool exists and is usable; reinitialize if needed."""
-        if self._pool is None:
+    def _ensure_pool(self) -> ConnectionPool:
+        """Create the pool on first use; no per-checkout round trip (the pool validates lazily)"""
+        pool = self._pool
+        if pool is None:
             with self._lock:
                 if self._pool is None:
                     self._initialize_pool()
-            return
-        try:
-            test_conn = self._pool.getconn()
-            if test_conn:
-                self._pool.putconn(test_conn)
-        except PoolError:
-            logger.warning("⚠️ Connection pool is closed; reinitializing...")
-            with self._lock:
-                self._initialize_pool()
+                pool = self._pool
+        return pool
 
     @contextmanager
     def get_connection(self):
         """Context manager ile güvenli bağlantı"""
-        conn = None
+        pool = self._ensure_pool()
+        conn = pool.getconn()
+        broken = failed = False
         try:
-            self._ensure_pool()
-            try:
-                conn = self._pool.getconn()
-            except PoolError:
-                logger.warning("⚠️ PoolError on getconn; reinitializing and retrying once...")
-                self._ensure_pool()
-                conn = self._pool.getconn()
             yield conn
         except Exception as e:
-            if conn:
-                conn.rollback()
+            failed = True
+            broken = isinstance(e, CONNECTION_ERRORS) or bool(conn.closed)
+            if broken:
+                # Server gone or connection dropped: idle connections are suspect too
+                pool.mark_failed()
+            else:
+                try:
+                    conn.rollback()
+                except Exception:
+                    broken = True
             logger.error(f"Veritabanı işlem hatası: {e}")
             raise
         finally:
-            if conn:
-                self._pool.putconn(conn)
+            pool.putconn(conn, close=broken, failed=failed)
 
     @contextmanager
     def get_cursor(self, commit=True):
@@ -123,6 +393,65 @@ class DatabaseManager:
             cursor.executemany(query, params_list)
             return cursor.rowcount
 
+    def execute_prepared(
+        self,
+        name: str,
+        query: str,
+        params: tuple = None,
+        fetch: bool = True
+    ) -> Optional[List[Dict]]:
+        """Run a hot query as the server-side prepared statement `name`
+
+        The statement is registered on first use and PREPAREd once per pooled
+        connection (again after a reconnect), then run with EXECUTE, so the
+        server skips parsing and planning. Same result as execute_query(query,
+        params); with DB_PREPARED_STATEMENTS=0 it is exactly that.
+        """
+        statement = self._register_statement(name, query)
+        if not USE_PREPARED_STATEMENTS:
+            return self.execute_query(query, params, fetch)
+
+        with self.get_cursor() as cursor:
+            conn = cursor.connection
+            with self._statement_lock:
+                prepared = self._prepared.setdefault(conn, set())
+            try:
+                self._execute_statement(cursor, prepared, statement, params or ())
+            except (errors.InvalidSqlStatementName, errors.FeatureNotSupported):
+                # Session reset behind our back (DISCARD ALL, pooler) or a table
+                # changed under a cached plan: start over on this connection
+                conn.rollback()
+                cursor.execute("DEALLOCATE ALL")
+                prepared.clear()
+                self._count_statement('reprepares')
+                self._execute_statement(cursor, prepared, statement, params or ())
+            if fetch:
+                return cursor.fetchall()
+            return None
+
+    def _register_statement(self, name: str, query: str) -> PreparedStatement:
+        statement = self._statements.get(name)
+        if statement is None:
+            with self._statement_lock:
+                statement = self._statements.get(name)
+                if statement is None:
+                    statement = self._statements[name] = PreparedStatement.from_query(name, query)
+        if statement.query != query:
+            raise ValueError(f"Hazır ifade {name!r} farklı bir sorguyla kayıtlı")
+        return statement
+
+    def _execute_statement(self, cursor, prepared: Set[str], statement: PreparedStatement, params: tuple) -> None:
+        if statement.name not in prepared:
+            cursor.execute(statement.prepare_sql)
+            prepared.add(statement.name)
+            self._count_statement('prepares')
+        cursor.execute(statement.execute_sql, params)
+        self._count_statement('prepared_executes')
+
+    def _count_statement(self, key: str) -> None:
+        with self._statement_lock:
+            self._statement_stats[key] += 1
+
     def set_user_context(self, user_id: int):
         """RLS (Row Level Security) için kullanıcı context'i ayarla"""
         with self.get_cursor() as cursor:
@@ -137,13 +466,17 @@ class DatabaseManager:
             result = cursor.fetchone()
             return result['result'] if result else None
 
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Connection pool metrics (checkout waits, in-use, health checks) and prepared statement counters"""
+        pool = self._pool
+        metrics = pool.metrics() if pool is not None else {}
+        with self._statement_lock:
+            metrics.update(self._statement_stats, statements=len(self._statements))
+        return metrics
+
     def test_connection(self) -> bool:
         """Bağlantı testi"""
         try:
-            if not self._pool:
-                logger.error("Connection pool not initialized")
-                return False
-                
             with self.get_cursor() as cursor:
                 cursor.execute("SELECT 1 as test")
                 result = cursor.fetchone()
@@ -158,8 +491,12 @@ class DatabaseManager:
     def close_all_connections(self):
         """Tüm bağlantıları kapat"""
         if self._pool:
+            metrics = self._pool.metrics()
             self._pool.closeall()
-            logger.info("Tüm veritabanı bağlantıları kapatıldı")
+            logger.info(
+                f"Tüm veritabanı bağlantıları kapatıldı ({metrics['checkouts']} kullanım, "
+                f"ort. bekleme {metrics['wait_ms_avg']:.1f} ms, {metrics['timeouts']} zaman aşımı)"
+            )
             self._pool = None
 
 
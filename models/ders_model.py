@@ -23,7 +23,7 @@ class DersModel:
             WHERE bolum_id = %s AND aktif = TRUE
             ORDER BY sinif, ders_kodu
         """
-        return self.db.execute_query(query, (bolum_id,))
+        return self.db.execute_prepared('dersler_by_bolum', query, (bolum_id,))
     
     def get_ders_by_id(self, ders_id: int) -> Optional[Dict]:
         """Get course by ID"""
@@ -33,7 +33,7 @@ class DersModel:
             JOIN bolumler b ON d.bolum_id = b.bolum_id
             WHERE d.ders_id = %s
         """
-        result = self.db.execute_query(query, (ders_id,))
+        result = self.db.execute_prepared('ders_by_id', query, (ders_id,))
         return result[0] if result else None
     
     def get_ders_by_kod(self, bolum_id: int, ders_kodu: str) -> Optional[Dict]:
@@ -42,9 +42,18 @@ class DersModel:
             SELECT * FROM dersler
             WHERE bolum_id = %s AND ders_kodu = %s AND aktif = TRUE
         """
-        result = self.db.execute_query(query, (bolum_id, ders_kodu))
+        result = self.db.execute_prepared('ders_by_kod', query, (bolum_id, ders_kodu))
         return result[0] if result else None
     
+    def get_ders_id_map(self, bolum_id: int) -> Dict[str, int]:
+        """ders_kodu -> ders_id for all active courses of a department"""
+        query = """
+            SELECT ders_kodu, ders_id FROM dersler
+            WHERE bolum_id = %s AND aktif = TRUE
+        """
+        result = self.db.execute_query(query, (bolum_id,))
+        return {row['ders_kodu']: row['ders_id'] for row in result}
+    
     def insert_ders(self, ders_data: Dict) -> int:
         """Insert new course"""
         query = """
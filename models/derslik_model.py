@@ -32,7 +32,7 @@ class DerslikModel:
                   AND aktif = TRUE
                 ORDER BY derslik_kodu \
                 """
-        return self.db.execute_query(query, (bolum_id,))
+        return self.db.execute_prepared('derslikler_by_bolum', query, (bolum_id,))
 
     def get_derslik_by_id(self, derslik_id: int) -> Optional[Dict]:
         """ID'ye göre derslik getir"""
@@ -43,7 +43,7 @@ class DerslikModel:
                          JOIN bolumler b ON d.bolum_id = b.bolum_id
                 WHERE d.derslik_id = %s \
                 """
-        result = self.db.execute_query(query, (derslik_id,))
+        result = self.db.execute_prepared('derslik_by_id', query, (derslik_id,))
         return result[0] if result else None
 
     def get_derslik_by_kod(self, bolum_id: int, derslik_kodu: str) -> Optional[Dict]:
@@ -55,7 +55,7 @@ class DerslikModel:
                   AND derslik_kodu = %s \
                   AND aktif = TRUE \
                 """
-        result = self.db.execute_query(query, (bolum_id, derslik_kodu))
+        result = self.db.execute_prepared('derslik_by_kod', query, (bolum_id, derslik_kodu))
         return result[0] if result else None
 
     def insert_derslik(self, derslik_data: Dict) -> int:
@@ -0,0 +1,102 @@
+"""
+İstatistik Model - Dashboard Counters
+Aggregate counts of the dashboard, cached with a TTL
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from models.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached set of counters is served without querying again
+DEFAULT_STATS_TTL = 60.0
+
+ADMIN_SCOPE = ('admin',)
+
+
+class IstatistikModel:
+    """Dashboard counters in one aggregate query per scope, cached with a TTL
+
+    A department's counters (programs, active courses, classrooms, students)
+    and the admin counters (active users, departments, coordinators) are each
+    a single SELECT of COUNT subqueries answered from the partial "aktif"
+    indexes - no rows are fetched. Results are kept per scope for ttl
+    seconds; peek() returns a cached value even when stale, so a view can
+    show it at once and refresh in the background. invalidate() after data
+    changes. Thread-safe: refreshes run on worker threads.
+    """
+
+    def __init__(self, db: DatabaseManager, ttl: Optional[float] = None):
+        self.db = db
+        self.ttl = float(ttl if ttl is not None else os.getenv('DASHBOARD_STATS_TTL', DEFAULT_STATS_TTL))
+        self._cache: Dict[Tuple, Tuple[float, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bolum_scope(bolum_id: int) -> Tuple:
+        return ('bolum', bolum_id)
+
+    def _query(self, scope: Tuple) -> Dict[str, int]:
+        if scope == ADMIN_SCOPE:
+            query = """
+                SELECT
+                    (SELECT COUNT(*) FROM users WHERE aktif = TRUE) AS kullanici_sayisi,
+                    (SELECT COUNT(*) FROM bolumler WHERE aktif = TRUE) AS bolum_sayisi,
+                    (SELECT COUNT(*) FROM users
+                     WHERE aktif = TRUE AND role = 'Bölüm Koordinatörü') AS koordinator_sayisi
+            """
+            result = self.db.execute_query(query)
+        else:
+            query = """
+                SELECT
+                    (SELECT COUNT(*) FROM sinav_programi WHERE bolum_id = %(bolum_id)s) AS program_sayisi,
+                    (SELECT COUNT(*) FROM dersler WHERE bolum_id = %(bolum_id)s AND aktif = TRUE) AS ders_sayisi,
+                    (SELECT COUNT(*) FROM derslikler WHERE bolum_id = %(bolum_id)s AND aktif = TRUE) AS derslik_sayisi,
+                    (SELECT COUNT(*) FROM ogrenciler WHERE bolum_id = %(bolum_id)s AND aktif = TRUE) AS ogrenci_sayisi
+            """
+            result = self.db.execute_query(query, {'bolum_id': scope[1]})
+        return {key: int(value) for key, value in dict(result[0]).items()}
+
+    def get(self, scope: Tuple, max_age: Optional[float] = None) -> Dict[str, int]:
+        """Counters of a scope, queried if the cached ones are older than max_age (default: ttl)"""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            cached = self._cache.get(scope)
+        if cached and time.monotonic() - cached[0] <= max_age:
+            return cached[1]
+        return self.refresh(scope)
+
+    def refresh(self, scope: Tuple) -> Dict[str, int]:
+        """Query a scope's counters and cache them"""
+        start = time.perf_counter()
+        stats = self._query(scope)
+        with self._lock:
+            self._cache[scope] = (time.monotonic(), stats)
+        logger.debug(f"📊 İstatistikler yenilendi {scope}: {(time.perf_counter() - start) * 1000:.1f} ms")
+        return stats
+
+    def peek(self, scope: Tuple) -> Tuple[Optional[Dict[str, int]], bool]:
+        """(cached counters or None, whether they are still fresh) - never queries"""
+        with self._lock:
+            cached = self._cache.get(scope)
+        if cached is None:
+            return None, False
+        return cached[1], time.monotonic() - cached[0] <= self.ttl
+
+    def invalidate(self, scope: Optional[Tuple] = None) -> None:
+        """Mark a scope's counters (default: all) stale; peek() keeps returning them"""
+        with self._lock:
+            scopes = [scope] if scope is not None else list(self._cache)
+            for key in scopes:
+                if key in self._cache:
+                    self._cache[key] = (float('-inf'), self._cache[key][1])
+
+    def get_bolum_stats(self, bolum_id: int) -> Dict[str, int]:
+        return self.get(self.bolum_scope(bolum_id))
+
+    def get_admin_stats(self) -> Dict[str, int]:
+        return self.get(ADMIN_SCOPE)
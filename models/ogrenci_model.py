@@ -3,7 +3,8 @@
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
+from psycopg2 import extras
 from models.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ class OgrenciModel:
             WHERE bolum_id = %s AND aktif = TRUE
             ORDER BY sinif, ogrenci_no
         """
-        return self.db.execute_query(query, (bolum_id,))
+        return self.db.execute_prepared('ogrenciler_by_bolum', query, (bolum_id,))
     
     def get_ogrenci_by_no(self, ogrenci_no: str) -> Optional[Dict]:
         """Get student by student number"""
@@ -33,7 +34,7 @@ class OgrenciModel:
             JOIN bolumler b ON o.bolum_id = b.bolum_id
             WHERE o.ogrenci_no = %s
         """
-        result = self.db.execute_query(query, (ogrenci_no,))
+        result = self.db.execute_prepared('ogrenci_by_no', query, (ogrenci_no,))
         return result[0] if result else None
     
     def get_ogrenciler_by_ders(self, ders_id: int) -> List[Dict]:
@@ -45,7 +46,30 @@ class OgrenciModel:
             WHERE dk.ders_id = %s AND o.aktif = TRUE
             ORDER BY o.ad_soyad
         """
-        return self.db.execute_query(query, (ders_id,))
+        return self.db.execute_prepared('ogrenciler_by_ders', query, (ders_id,))
+
+    def get_ogrenciler_by_program(self, program_id: int) -> List[Dict]:
+        """Get the students of every exam in a program (rows carry sinav_id)"""
+        query = """
+            SELECT DISTINCT s.sinav_id, o.*
+            FROM sinavlar s
+            JOIN ders_kayitlari dk ON dk.ders_id = s.ders_id
+            JOIN ogrenciler o ON o.ogrenci_no = dk.ogrenci_no
+            WHERE s.program_id = %s AND o.aktif = TRUE
+            ORDER BY s.sinav_id, o.ad_soyad
+        """
+        return self.db.execute_query(query, (program_id,))
+    
+    def get_ders_kayitlari_by_bolum(self, bolum_id: int) -> List[Dict]:
+        """Get all (ders_id, ogrenci_no) enrollments of a department's active courses in one query"""
+        query = """
+            SELECT DISTINCT dk.ders_id, dk.ogrenci_no
+            FROM ders_kayitlari dk
+            JOIN dersler d ON dk.ders_id = d.ders_id
+            JOIN ogrenciler o ON dk.ogrenci_no = o.ogrenci_no
+            WHERE d.bolum_id = %s AND d.aktif = TRUE AND o.aktif = TRUE
+        """
+        return self.db.execute_query(query, (bolum_id,))
     
     def get_dersler_by_ogrenci(self, ogrenci_no: str) -> List[Dict]:
         """Get all courses taken by a student"""
@@ -56,7 +80,7 @@ class OgrenciModel:
             WHERE dk.ogrenci_no = %s AND d.aktif = TRUE
             ORDER BY d.ders_kodu
         """
-        return self.db.execute_query(query, (ogrenci_no,))
+        return self.db.execute_prepared('dersler_by_ogrenci', query, (ogrenci_no,))
     
     def insert_ogrenci(self, ogrenci_data: Dict) -> str:
         """Insert new student"""
@@ -77,6 +101,56 @@ class OgrenciModel:
         logger.info(f"✅ Student created: {ogrenci_data['ogrenci_no']}")
         return result[0]['ogrenci_no']
     
+    def get_existing_ogrenci_nos(self, ogrenci_nos: List[str]) -> Set[str]:
+        """Which of the given student numbers already exist (any department), in one query"""
+        if not ogrenci_nos:
+            return set()
+        query = "SELECT ogrenci_no FROM ogrenciler WHERE ogrenci_no = ANY(%s)"
+        result = self.db.execute_query(query, (list(ogrenci_nos),))
+        return {row['ogrenci_no'] for row in result}
+    
+    def bulk_insert_ogrenciler(self, ogrenciler: List[Tuple], kayitlar: List[Tuple]) -> Set[str]:
+        """Insert a chunk of students and their course registrations in one transaction
+
+        Args:
+            ogrenciler: [(ogrenci_no, bolum_id, ad_soyad, sinif)]
+            kayitlar: [(ogrenci_no, ders_id)]
+
+        Returns:
+            Student numbers actually inserted (rows that already existed are left untouched)
+        """
+        with self.db.get_cursor() as cursor:
+            inserted = extras.execute_values(
+                cursor,
+                """
+                INSERT INTO ogrenciler (ogrenci_no, bolum_id, ad_soyad, sinif)
+                VALUES %s
+                ON CONFLICT (ogrenci_no) DO NOTHING
+                RETURNING ogrenci_no
+                """,
+                ogrenciler,
+                page_size=len(ogrenciler) or 1,
+                fetch=True,
+            )
+            inserted_nos = {row['ogrenci_no'] for row in inserted}
+
+            # Only register courses of students created by this chunk
+            kayitlar = [k for k in kayitlar if k[0] in inserted_nos]
+            if kayitlar:
+                extras.execute_values(
+                    cursor,
+                    """
+                    INSERT INTO ders_kayitlari (ogrenci_no, ders_id)
+                    VALUES %s
+                    ON CONFLICT (ogrenci_no, ders_id) DO NOTHING
+                    """,
+                    kayitlar,
+                    page_size=1000,
+                )
+
+        logger.info(f"✅ Students bulk inserted: {len(inserted_nos)} students, {len(kayitlar)} registrations")
+        return inserted_nos
+    
     def update_ogrenci(self, ogrenci_no: str, ogrenci_data: Dict) -> bool:
         """Update student"""
         query = """
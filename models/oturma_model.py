@@ -4,6 +4,7 @@ Oturma Model - CRUD Operations
 
 import logging
 from typing import List, Dict, Optional
+from psycopg2 import extras
 from models.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,165 @@ class OturmaModel:
         result = self.db.execute_query(query, params)
         return result[0]['oturma_id']
     
+    def bulk_insert_oturma(self, sinav_id: int, plan: List[Dict], replace: bool = True) -> Dict:
+        """Write a whole seating plan for one exam in a single transaction.
+
+        Args:
+            plan: [{'ogrenci_no', 'derslik_id', 'satir', 'sutun'}] as produced by
+                  OturmaPlanlama (satir_no/sutun_no are accepted too)
+            replace: Delete the exam's existing seating first
+
+        Returns:
+            {'success': bool, 'inserted': int, 'conflicts': [{'tip', ...}]}
+        """
+        return self.bulk_insert_plans({sinav_id: plan}, replace=replace)
+
+    def bulk_insert_plans(self, plans: Dict[int, List[Dict]], replace: bool = True) -> Dict:
+        """Write the seating plans of several exams in a single transaction.
+
+        The plans are staged with execute_values and checked once with set-based
+        queries instead of the per-row triggers (bypassed via ``app.bulk_load``):
+        classroom assigned to the exam, duplicate students/seats, classroom
+        capacity and overlapping exams of the same students - against the
+        stored seating and the other staged exams. ``yerlesim_sayisi`` is then
+        set with one aggregate UPDATE. Nothing is written if any check fails.
+
+        Args:
+            plans: {sinav_id: plan}, plan items as for bulk_insert_oturma
+            replace: Delete the existing seating of these exams first
+
+        Returns:
+            {'success': bool, 'inserted': int, 'conflicts': [{'tip', 'sinav_id', ...}]}
+        """
+        sinav_ids = list(plans)
+        rows = [
+            (
+                sinav_id,
+                item['ogrenci_no'],
+                item['derslik_id'],
+                item.get('satir', item.get('satir_no')),
+                item.get('sutun', item.get('sutun_no'))
+            )
+            for sinav_id, plan in plans.items()
+            for item in plan
+        ]
+
+        check_sql = """
+            SELECT 'derslik' AS tip, st.sinav_id, st.derslik_id, NULL::VARCHAR AS ogrenci_no, COUNT(*) AS sayi
+            FROM tmp_oturma_stage st
+            LEFT JOIN sinav_derslikleri sd ON sd.sinav_id = st.sinav_id AND sd.derslik_id = st.derslik_id
+            WHERE sd.id IS NULL
+            GROUP BY st.sinav_id, st.derslik_id
+            UNION ALL
+            SELECT 'kapasite', st.sinav_id, st.derslik_id, NULL, COUNT(*) + MAX(COALESCE(mevcut.sayi, 0))
+            FROM tmp_oturma_stage st
+            JOIN derslikler dr ON dr.derslik_id = st.derslik_id
+            LEFT JOIN (
+                SELECT sinav_id, derslik_id, COUNT(*) AS sayi
+                FROM oturma_planlari
+                WHERE sinav_id = ANY(%(sinav_ids)s)
+                GROUP BY sinav_id, derslik_id
+            ) mevcut ON mevcut.sinav_id = st.sinav_id AND mevcut.derslik_id = st.derslik_id
+            GROUP BY st.sinav_id, st.derslik_id, dr.kapasite
+            HAVING COUNT(*) + MAX(COALESCE(mevcut.sayi, 0)) > dr.kapasite
+            UNION ALL
+            SELECT 'ogrenci_tekrar', st.sinav_id, NULL, st.ogrenci_no, COUNT(*)
+            FROM tmp_oturma_stage st
+            GROUP BY st.sinav_id, st.ogrenci_no
+            HAVING COUNT(*) > 1
+                OR BOOL_OR(EXISTS (
+                    SELECT 1 FROM oturma_planlari op
+                    WHERE op.sinav_id = st.sinav_id AND op.ogrenci_no = st.ogrenci_no
+                ))
+            UNION ALL
+            SELECT 'koltuk', st.sinav_id, st.derslik_id, NULL, COUNT(*)
+            FROM tmp_oturma_stage st
+            GROUP BY st.sinav_id, st.derslik_id, st.satir_no, st.sutun_no
+            HAVING COUNT(*) > 1
+                OR BOOL_OR(EXISTS (
+                    SELECT 1 FROM oturma_planlari op
+                    WHERE op.sinav_id = st.sinav_id AND op.derslik_id = st.derslik_id
+                      AND op.satir_no = st.satir_no AND op.sutun_no = st.sutun_no
+                ))
+            UNION ALL
+            SELECT 'cakisma', st.sinav_id, NULL, st.ogrenci_no, COUNT(*)
+            FROM tmp_oturma_stage st
+            JOIN (
+                SELECT sinav_id, ogrenci_no FROM oturma_planlari
+                UNION ALL
+                SELECT sinav_id, ogrenci_no FROM tmp_oturma_stage
+            ) diger ON diger.ogrenci_no = st.ogrenci_no AND diger.sinav_id != st.sinav_id
+            JOIN sinavlar s1 ON s1.sinav_id = diger.sinav_id
+            JOIN sinavlar s2 ON s2.sinav_id = st.sinav_id
+            WHERE s1.tarih = s2.tarih
+              AND (s1.baslangic_saati, s1.bitis_saati) OVERLAPS (s2.baslangic_saati, s2.bitis_saati)
+            GROUP BY st.sinav_id, st.ogrenci_no
+        """
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT set_config('app.bulk_load', 'on', TRUE)")
+                if replace:
+                    cursor.execute("DELETE FROM oturma_planlari WHERE sinav_id = ANY(%s)", (sinav_ids,))
+
+                cursor.execute("""
+                    CREATE TEMP TABLE tmp_oturma_stage (
+                        sinav_id INT NOT NULL,
+                        ogrenci_no VARCHAR(20) NOT NULL,
+                        derslik_id INT NOT NULL,
+                        satir_no INT NOT NULL,
+                        sutun_no INT NOT NULL
+                    ) ON COMMIT DROP
+                """)
+                extras.execute_values(
+                    cursor,
+                    "INSERT INTO tmp_oturma_stage (sinav_id, ogrenci_no, derslik_id, satir_no, sutun_no) VALUES %s",
+                    rows,
+                    page_size=1000,
+                )
+                if len(sinav_ids) > 1:
+                    cursor.execute("ANALYZE tmp_oturma_stage")
+
+                cursor.execute(check_sql, {'sinav_ids': sinav_ids})
+                conflicts = [dict(row) for row in cursor.fetchall()]
+                if conflicts:
+                    conn.rollback()
+                    logger.warning(f"⚠️ Seating plan rejected ({len(sinav_ids)} exams): {len(conflicts)} conflicts")
+                    return {'success': False, 'inserted': 0, 'conflicts': conflicts}
+
+                cursor.execute("""
+                    INSERT INTO oturma_planlari (sinav_id, ogrenci_no, derslik_id, satir_no, sutun_no)
+                    SELECT sinav_id, ogrenci_no, derslik_id, satir_no, sutun_no
+                    FROM tmp_oturma_stage
+                """)
+                inserted = cursor.rowcount
+
+                # Seat counters of all the exams' classrooms in one aggregate
+                cursor.execute("""
+                    UPDATE sinav_derslikleri sd
+                    SET yerlesim_sayisi = k.sayi
+                    FROM (
+                        SELECT d.sinav_id, d.derslik_id, COUNT(op.oturma_id) AS sayi
+                        FROM sinav_derslikleri d
+                        LEFT JOIN oturma_planlari op
+                            ON op.sinav_id = d.sinav_id AND op.derslik_id = d.derslik_id
+                        WHERE d.sinav_id = ANY(%(sinav_ids)s)
+                        GROUP BY d.sinav_id, d.derslik_id
+                    ) k
+                    WHERE sd.sinav_id = k.sinav_id AND sd.derslik_id = k.derslik_id
+                """, {'sinav_ids': sinav_ids})
+
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"❌ Bulk seating insert failed ({len(sinav_ids)} exams): {e}")
+                raise
+            finally:
+                cursor.close()
+
+        return {'success': True, 'inserted': inserted, 'conflicts': []}
+
     def delete_by_sinav(self, sinav_id: int) -> bool:
         """Delete all seating for an exam"""
         query = "DELETE FROM oturma_planlari WHERE sinav_id = %s"
@@ -3,11 +3,21 @@ Sınav Model - CRUD Operations
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from psycopg2 import extras
 from models.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Reasons returned by the bulk validation query (per staged exam)
+BULK_REJECT_MESSAGES = {
+    'ders': "Ders bulunamadı",
+    'saat': "Bitiş saati başlangıç saatinden sonra olmalı",
+    'tekrar': "Ders bu programda zaten var",
+    'derslik': "Derslik bulunamadı",
+    'cakisma': "Derslik çakışması tespit edildi",
+}
+
 
 class SinavModel:
     """Exam data access layer"""
@@ -27,6 +37,59 @@ class SinavModel:
         """
         return self.db.execute_query(query, (bolum_id,))
     
+    def get_sinavlar_page(self, bolum_id: int, after: Optional[Tuple] = None, limit: int = 200) -> List[Dict]:
+        """Get one page of the exams of all a department's programs, newest program first
+
+        Keyset pagination on (program_baslangic DESC, program_id DESC, tarih,
+        baslangic_saati, sinav_id): pass the sinav_page_key() of the last row
+        of a page as `after` to get the next one. Room names are aggregated
+        per exam after the LIMIT, so a page costs the same however many
+        programs the department has.
+        """
+        select = """
+            SELECT s.sinav_id, s.program_id, s.ders_id, s.tarih,
+                   s.baslangic_saati, s.bitis_saati, s.ogrenci_sayisi,
+                   d.ders_kodu, d.ders_adi, d.ogretim_elemani,
+                   dr.derslik_kodu, dr.derslik_adi,
+                   (s.tarih || ' ' || s.baslangic_saati) as tarih_saat,
+                   sp.program_adi, sp.baslangic_tarihi as program_baslangic
+            FROM sinav_programi sp
+            JOIN sinavlar s ON s.program_id = sp.program_id
+            JOIN dersler d ON s.ders_id = d.ders_id
+            LEFT JOIN LATERAL (
+                SELECT STRING_AGG(x.derslik_kodu, ', ') as derslik_kodu,
+                       STRING_AGG(x.derslik_adi, ', ') as derslik_adi
+                FROM sinav_derslikleri sd
+                JOIN derslikler x ON sd.derslik_id = x.derslik_id
+                WHERE sd.sinav_id = s.sinav_id
+            ) dr ON TRUE
+            WHERE sp.bolum_id = %s
+        """
+        order = """
+            ORDER BY sp.baslangic_tarihi DESC, sp.program_id DESC,
+                     s.tarih, s.baslangic_saati, s.sinav_id
+            LIMIT %s
+        """
+        if after is None:
+            return self.db.execute_prepared('sinavlar_by_bolum_first', select + order, (bolum_id, limit))
+
+        program_baslangic, program_id, tarih, baslangic_saati, sinav_id = after
+        keyset = """
+              AND (sp.baslangic_tarihi < %s
+                   OR (sp.baslangic_tarihi = %s AND sp.program_id < %s)
+                   OR (sp.program_id = %s AND (s.tarih, s.baslangic_saati, s.sinav_id) > (%s, %s, %s)))
+        """
+        params = (
+            bolum_id, program_baslangic, program_baslangic, program_id,
+            program_id, tarih, baslangic_saati, sinav_id, limit
+        )
+        return self.db.execute_prepared('sinavlar_by_bolum_after', select + keyset + order, params)
+
+    @staticmethod
+    def sinav_page_key(row: Dict) -> Tuple:
+        """Keyset cursor of a get_sinavlar_page row"""
+        return (row['program_baslangic'], row['program_id'], row['tarih'], row['baslangic_saati'], row['sinav_id'])
+
     def get_sinavlar_by_program(self, program_id: int) -> List[Dict]:
         """Get all exams in a program"""
         query = """
@@ -44,7 +107,7 @@ class SinavModel:
             GROUP BY s.sinav_id, d.ders_kodu, d.ders_adi, d.ogretim_elemani
             ORDER BY s.tarih, s.baslangic_saati
         """
-        return self.db.execute_query(query, (program_id,))
+        return self.db.execute_prepared('sinavlar_by_program', query, (program_id,))
     
     def create_program(self, program_data: Dict) -> int:
         """Create exam program"""
@@ -152,6 +215,211 @@ class SinavModel:
                 )
                 raise
     
+    def bulk_insert_exams(self, program_id: int, exams: List[Dict]) -> Dict:
+        """Insert a whole program's exams and classroom assignments in one transaction.
+
+        Rows are loaded with execute_values into temporary staging tables and
+        validated together: unknown courses/classrooms, bad time ranges, repeated
+        courses and overlaps with saved exams are detected by a single set-based
+        query instead of the per-row triggers, which are bypassed via
+        ``app.bulk_load`` for this transaction. Classroom overlaps within the batch
+        are fetched as pairs and resolved first come first served (by 'sira')
+        among the rows that are not rejected otherwise. ``ogrenci_sayisi`` is
+        filled from one grouped aggregate.
+
+        Args:
+            exams: [{'sira', 'ders_id', 'tarih', 'baslangic_saati', 'bitis_saati',
+                     'derslik_ids'}] where 'sira' is a unique row key
+
+        Returns:
+            {'inserted': {sira: sinav_id}, 'rejected': {sira: message},
+             'capacity_warnings': [sira, ...]}
+        """
+        exam_rows = [
+            (e['sira'], e['ders_id'], e['tarih'], e['baslangic_saati'], e['bitis_saati'])
+            for e in exams
+        ]
+        room_rows = [
+            (e['sira'], did)
+            for e in exams
+            for did in dict.fromkeys(e.get('derslik_ids') or [])
+            if isinstance(did, int)
+        ]
+
+        validate_sql = """
+            SELECT st.sira, 'ders' AS sebep
+            FROM tmp_sinav_stage st
+            LEFT JOIN dersler d ON d.ders_id = st.ders_id
+            WHERE d.ders_id IS NULL
+            UNION ALL
+            SELECT st.sira, 'saat'
+            FROM tmp_sinav_stage st
+            WHERE st.bitis_saati <= st.baslangic_saati
+            UNION ALL
+            SELECT st.sira, 'tekrar'
+            FROM tmp_sinav_stage st
+            WHERE EXISTS (
+                SELECT 1 FROM tmp_sinav_stage o
+                WHERE o.ders_id = st.ders_id AND o.sira < st.sira
+            ) OR EXISTS (
+                SELECT 1 FROM sinavlar s
+                WHERE s.program_id = %(program_id)s AND s.ders_id = st.ders_id
+            )
+            UNION ALL
+            SELECT sd.sira, 'derslik'
+            FROM tmp_sinav_derslik_stage sd
+            LEFT JOIN derslikler dr ON dr.derslik_id = sd.derslik_id
+            WHERE dr.derslik_id IS NULL
+            UNION ALL
+            SELECT sd.sira, 'cakisma'
+            FROM tmp_sinav_derslik_stage sd
+            JOIN tmp_sinav_stage st ON st.sira = sd.sira
+            JOIN sinav_derslikleri x ON x.derslik_id = sd.derslik_id
+            JOIN sinavlar s ON s.sinav_id = x.sinav_id
+            WHERE s.tarih = st.tarih
+              AND (s.baslangic_saati, s.bitis_saati) OVERLAPS (st.baslangic_saati, st.bitis_saati)
+            UNION ALL
+            SELECT st.sira, 'kapasite'
+            FROM tmp_sinav_stage st
+            JOIN (
+                SELECT sd.sira, SUM(dr.kapasite) AS kapasite
+                FROM tmp_sinav_derslik_stage sd
+                JOIN derslikler dr ON dr.derslik_id = sd.derslik_id
+                GROUP BY sd.sira
+            ) k ON k.sira = st.sira
+            WHERE k.kapasite < st.ogrenci_sayisi
+        """
+
+        # Staged rows sharing a classroom at overlapping times (earlier sira first)
+        batch_overlap_sql = """
+            SELECT DISTINCT sd1.sira AS onceki_sira, sd2.sira
+            FROM tmp_sinav_derslik_stage sd1
+            JOIN tmp_sinav_stage st1 ON st1.sira = sd1.sira
+            JOIN tmp_sinav_derslik_stage sd2 ON sd2.derslik_id = sd1.derslik_id AND sd2.sira > sd1.sira
+            JOIN tmp_sinav_stage st2 ON st2.sira = sd2.sira
+            WHERE st1.tarih = st2.tarih
+              AND (st1.baslangic_saati, st1.bitis_saati) OVERLAPS (st2.baslangic_saati, st2.bitis_saati)
+        """
+
+        inserted: Dict[int, int] = {}
+        rejected: Dict[int, str] = {}
+        capacity_warnings: List[int] = []
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT set_config('app.bulk_load', 'on', TRUE)")
+                cursor.execute("""
+                    CREATE TEMP TABLE tmp_sinav_stage (
+                        sira INT PRIMARY KEY,
+                        ders_id INT NOT NULL,
+                        tarih DATE NOT NULL,
+                        baslangic_saati TIME NOT NULL,
+                        bitis_saati TIME NOT NULL,
+                        ogrenci_sayisi INT NOT NULL DEFAULT 0
+                    ) ON COMMIT DROP
+                """)
+                cursor.execute("""
+                    CREATE TEMP TABLE tmp_sinav_derslik_stage (
+                        sira INT NOT NULL,
+                        derslik_id INT NOT NULL,
+                        PRIMARY KEY (sira, derslik_id)
+                    ) ON COMMIT DROP
+                """)
+                extras.execute_values(
+                    cursor,
+                    "INSERT INTO tmp_sinav_stage (sira, ders_id, tarih, baslangic_saati, bitis_saati) VALUES %s",
+                    exam_rows,
+                    page_size=1000,
+                )
+                if room_rows:
+                    extras.execute_values(
+                        cursor,
+                        "INSERT INTO tmp_sinav_derslik_stage (sira, derslik_id) VALUES %s",
+                        room_rows,
+                        page_size=1000,
+                    )
+
+                # Enrollment counts for all staged courses in one grouped aggregate
+                cursor.execute("""
+                    UPDATE tmp_sinav_stage st
+                    SET ogrenci_sayisi = k.sayi
+                    FROM (
+                        SELECT dk.ders_id, COUNT(*) AS sayi
+                        FROM ders_kayitlari dk
+                        WHERE dk.ders_id IN (SELECT ders_id FROM tmp_sinav_stage)
+                        GROUP BY dk.ders_id
+                    ) k
+                    WHERE k.ders_id = st.ders_id
+                """)
+
+                cursor.execute(validate_sql, {'program_id': program_id})
+                for row in cursor.fetchall():
+                    sira, sebep = row['sira'], row['sebep']
+                    if sebep == 'kapasite':
+                        capacity_warnings.append(sira)
+                    else:
+                        rejected.setdefault(sira, BULK_REJECT_MESSAGES[sebep])
+
+                # A row only loses to an earlier row that is itself inserted; rows are
+                # decided in sira order, so every earlier row's outcome is final
+                cursor.execute(batch_overlap_sql)
+                onceki: Dict[int, List[int]] = {}
+                for row in cursor.fetchall():
+                    onceki.setdefault(row['sira'], []).append(row['onceki_sira'])
+                for sira in sorted(onceki):
+                    if sira not in rejected and any(o not in rejected for o in onceki[sira]):
+                        rejected[sira] = BULK_REJECT_MESSAGES['cakisma']
+
+                if rejected:
+                    cursor.execute(
+                        "DELETE FROM tmp_sinav_stage WHERE sira = ANY(%s)", (list(rejected),)
+                    )
+                    cursor.execute(
+                        "DELETE FROM tmp_sinav_derslik_stage WHERE sira = ANY(%s)", (list(rejected),)
+                    )
+
+                cursor.execute("""
+                    INSERT INTO sinavlar
+                    (program_id, ders_id, tarih, baslangic_saati, bitis_saati, ogrenci_sayisi)
+                    SELECT %s, ders_id, tarih, baslangic_saati, bitis_saati, ogrenci_sayisi
+                    FROM tmp_sinav_stage
+                    ORDER BY sira
+                    RETURNING sinav_id, ders_id
+                """, (program_id,))
+                sinav_by_ders = {row['ders_id']: row['sinav_id'] for row in cursor.fetchall()}
+
+                cursor.execute("""
+                    INSERT INTO sinav_derslikleri (sinav_id, derslik_id)
+                    SELECT s.sinav_id, sd.derslik_id
+                    FROM tmp_sinav_derslik_stage sd
+                    JOIN tmp_sinav_stage st ON st.sira = sd.sira
+                    JOIN sinavlar s ON s.program_id = %s AND s.ders_id = st.ders_id
+                """, (program_id,))
+
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"❌ Bulk exam insert failed for program_id={program_id}: {e}")
+                raise
+            finally:
+                cursor.close()
+
+        for e in exams:
+            sinav_id = sinav_by_ders.get(e['ders_id'])
+            if e['sira'] not in rejected and sinav_id is not None:
+                inserted[e['sira']] = sinav_id
+
+        logger.info(
+            f"✅ Bulk insert: {len(inserted)} exams, {len(room_rows)} classroom rows staged, "
+            f"{len(rejected)} rejected"
+        )
+        return {
+            'inserted': inserted,
+            'rejected': rejected,
+            'capacity_warnings': capacity_warnings,
+        }
+
     def delete_program(self, program_id: int) -> bool:
         """Delete exam program"""
         query = "DELETE FROM sinav_programi WHERE program_id = %s"
@@ -170,7 +438,7 @@ class SinavModel:
             JOIN dersler d ON s.ders_id = d.ders_id
             WHERE s.sinav_id = %s
         """
-        result = self.db.execute_query(query, (sinav_id,))
+        result = self.db.execute_prepared('sinav_by_id', query, (sinav_id,))
         return result[0] if result else None
     
     def get_sinav_derslikleri(self, sinav_id: int) -> List[Dict]:
@@ -183,7 +451,21 @@ class SinavModel:
             WHERE sd.sinav_id = %s
             ORDER BY dr.derslik_kodu
         """
-        return self.db.execute_query(query, (sinav_id,))
+        return self.db.execute_prepared('sinav_derslikleri', query, (sinav_id,))
+
+    def get_program_derslikleri(self, program_id: int) -> List[Dict]:
+        """Get the classrooms of every exam in a program (rows carry sinav_id)"""
+        query = """
+            SELECT sd.sinav_id, dr.derslik_id, dr.derslik_kodu, dr.derslik_adi,
+                   dr.kapasite, dr.satir_sayisi, dr.sutun_sayisi, dr.sira_yapisi
+            FROM sinavlar s
+            JOIN sinav_derslikleri sd ON sd.sinav_id = s.sinav_id
+            JOIN derslikler dr ON sd.derslik_id = dr.derslik_id
+            WHERE s.program_id = %s
+            ORDER BY sd.sinav_id, dr.derslik_kodu
+        """
+        return self.db.execute_query(query, (program_id,))
+
 def get_program_by_id(self, program_id: int) -> Optional[Dict]:
     """Get program details by ID"""
     query = """
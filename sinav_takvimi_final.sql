@@ -306,20 +306,28 @@ CREATE TABLE import_logs (
 CREATE INDEX idx_import_logs_user ON import_logs(user_id);
 CREATE INDEX idx_import_logs_created ON import_logs(created_at DESC);
 CREATE OR REPLACE FUNCTION trg_sinav_ogrenci_sayisi()
-RETURNS TRIGGER AS $
+RETURNS TRIGGER AS $$
 BEGIN
+    -- Toplu kayıt (SinavModel.bulk_insert_exams) sayıyı tek sorguda hesaplar
+    IF current_setting('app.bulk_load', TRUE) = 'on' THEN
+        RETURN NEW;
+    END IF;
     NEW.ogrenci_sayisi := (
         SELECT COUNT(*) FROM ders_kayitlari WHERE ders_id = NEW.ders_id
     );
     RETURN NEW;
 END;
-$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql;
 CREATE TRIGGER trg_set_ogrenci_sayisi
 BEFORE INSERT OR UPDATE OF ders_id ON sinavlar
 FOR EACH ROW EXECUTE FUNCTION trg_sinav_ogrenci_sayisi();
 CREATE OR REPLACE FUNCTION trg_derslik_cakisma_kontrol()
 RETURNS TRIGGER AS $$
 BEGIN
+    -- Toplu kayıt çakışmaları küme tabanlı tek sorguda doğrular
+    IF current_setting('app.bulk_load', TRUE) = 'on' THEN
+        RETURN NEW;
+    END IF;
     IF EXISTS (
         SELECT 1
         FROM sinav_derslikleri sd
@@ -341,6 +349,10 @@ FOR EACH ROW EXECUTE FUNCTION trg_derslik_cakisma_kontrol();
 CREATE OR REPLACE FUNCTION trg_ogrenci_cakisma_kontrol()
 RETURNS TRIGGER AS $$
 BEGIN
+    -- Toplu oturma kaydı (OturmaModel.bulk_insert_oturma) küme tabanlı kontrol eder
+    IF current_setting('app.bulk_load', TRUE) = 'on' THEN
+        RETURN NEW;
+    END IF;
     IF EXISTS (
         SELECT 1
         FROM oturma_planlari op
@@ -365,6 +377,10 @@ DECLARE
     v_kapasite INT;
     v_yerlesim_sayisi INT;
 BEGIN
+    -- Toplu oturma kaydı (OturmaModel.bulk_insert_oturma) küme tabanlı kontrol eder
+    IF current_setting('app.bulk_load', TRUE) = 'on' THEN
+        RETURN NEW;
+    END IF;
     SELECT d.kapasite, COALESCE(sd.yerlesim_sayisi, 0)
     INTO v_kapasite, v_yerlesim_sayisi
     FROM derslikler d
@@ -383,6 +399,10 @@ FOR EACH ROW EXECUTE FUNCTION trg_derslik_kapasite_kontrol();
 CREATE OR REPLACE FUNCTION trg_update_yerlesim_sayaci()
 RETURNS TRIGGER AS $$
 BEGIN
+    -- Toplu oturma kaydı sayacı tek bir toplu UPDATE ile günceller
+    IF current_setting('app.bulk_load', TRUE) = 'on' THEN
+        RETURN NULL;
+    END IF;
     IF (TG_OP = 'INSERT') THEN
         UPDATE sinav_derslikleri
         SET yerlesim_sayisi = yerlesim_sayisi + 1
@@ -5,14 +5,35 @@ Parse Excel files for course and student data with flexible formatting
 
 import logging
 import re
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
+import numpy as np
 import openpyxl
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+def _cell_text(value) -> str:
+    """Cell value as stripped text; integral floats (e.g. 2020123456.0) lose the '.0'"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ''
+        if value.is_integer():
+            return str(int(value))
+    return str(value).strip()
+
+
+def _normalize_header(value) -> str:
+    """Lowercase header text with Turkish characters folded ('Öğrenci No' -> 'ogrenci no')"""
+    text = _cell_text(value).lower()
+    text = text.replace('ı', 'i').replace('ş', 's').replace('ğ', 'g')
+    return text.replace('ü', 'u').replace('ö', 'o').replace('ç', 'c')
+
+
 class ExcelParser:
     """Excel file parser for importing data"""
 
@@ -29,16 +50,16 @@ class ExcelParser:
             List of course dictionaries
         """
         try:
-            # Read Excel file without assuming header row
-            df = pd.read_excel(file_path, header=None, sheet_name=0)
+            # Only the first rows are needed to detect the format
+            first_rows = list(islice(ExcelParser.iter_sheet_rows(file_path), 5))
 
             # Try to detect the format
             # Check if it has standard column headers in first few rows
             has_header = False
             header_row = 0
 
-            for i in range(min(5, len(df))):
-                row_text = ' '.join([str(x).lower() for x in df.iloc[i].values if pd.notna(x)])
+            for i, row in enumerate(first_rows):
+                row_text = ' '.join([str(x).lower() for x in row if x is not None])
                 if 'ders kodu' in row_text or 'ders kod' in row_text:
                     has_header = True
                     header_row = i
@@ -48,8 +69,7 @@ class ExcelParser:
                 return ExcelParser._parse_with_repeating_headers(file_path, header_row)
             else:
                 # No header found - show helpful error
-                first_rows = df.head(3).values.tolist()
-                sample_text = "\n".join([" | ".join([str(x) for x in row if pd.notna(x)]) for row in first_rows])
+                sample_text = "\n".join([" | ".join([str(x) for x in row if x is not None]) for row in first_rows[:3]])
                 
                 error_msg = (
                     "❌ Excel formatı tanınamadı!\n\n"
@@ -78,8 +98,6 @@ class ExcelParser:
           - Kolon başlıkları: DERS KODU | DERSİN ADI | DERSİ VEREN ÖĞR. ELEMANI (sıra değişebilir)
           - Alt başlıklar: SEÇMELİ DERS, SEÇMELİK DERS, vb.
         """
-        df = pd.read_excel(file_path, header=None, sheet_name=0)
-
         dersler = []
         errors = []
         warnings = []
@@ -97,9 +115,9 @@ class ExcelParser:
         skipped_empty = 0
         skipped_bad_code = 0
 
-        for idx, row in df.iterrows():
-            excel_row = idx + 1
-            row_values = [str(x).strip() if pd.notna(x) else '' for x in row.values]
+        # Rows are streamed; the parser below is a line-by-line state machine
+        for excel_row, row in enumerate(ExcelParser.iter_sheet_rows(file_path), start=1):
+            row_values = [_cell_text(x) for x in (row or ())]
             row_text = ' '.join(row_values).lower()
             
             # Normalize for pattern matching
@@ -455,169 +473,290 @@ class ExcelParser:
         logger.info(f"✅ {len(dersler)} ders Excel'den yüklendi (metin formatı)")
         return dersler
 
+    # Header names (after _normalize_header) -> field names of the student list
+    OGRENCI_COLUMNS = {
+        'ogrenci no': 'ogrenci_no',
+        'ogrencino': 'ogrenci_no',
+        'no': 'ogrenci_no',
+        'numara': 'ogrenci_no',
+        'ad soyad': 'ad_soyad',
+        'adsoyad': 'ad_soyad',
+        'ad': 'ad_soyad',
+        'isim': 'ad_soyad',
+        'sinif': 'sinif',
+        'sinifi': 'sinif',
+        'ders': 'ders',
+        'ders kodu': 'ders',
+        'derskodu': 'ders'
+    }
+
     @staticmethod
-    def parse_ogrenci_listesi(file_path: str) -> List[Dict]:
+    def iter_sheet_rows(file_path: str) -> Iterator[tuple]:
         """
-        Parse student list from Excel file
-        Supports standard tabular format: Öğrenci No | Ad Soyad | Sınıf | Ders
-
-        Args:
-            file_path: Path to Excel file
+        Stream the rows of the first sheet as tuples of cell values
 
-        Returns:
-            List of student dictionaries with enrolled courses
+        .xlsx files are read with openpyxl in read-only mode, so rows are never
+        all in memory at once; other formats (.xls) fall back to pandas.
         """
-        try:
-            # Try reading with first row as header
-            df = pd.read_excel(file_path)
-
-            # Normalize column names
-            df.columns = df.columns.str.strip().str.lower()
-
-            # Remove Turkish characters for matching
-            df.columns = df.columns.str.replace('ı', 'i').str.replace('ş', 's').str.replace('ğ', 'g')
-            df.columns = df.columns.str.replace('ü', 'u').str.replace('ö', 'o').str.replace('ç', 'c')
-
-            # Check for common mistakes BEFORE mapping
-            detected_issues = []
-            for col in df.columns:
-                if 'ders adi' in col or 'dersadi' in col or 'dersin adi' in col:
-                    detected_issues.append(
-                        f"❌ Yanlış kolon ismi: '{col}'\n"
-                        f"   'Ders Adı' yerine 'Ders' veya 'Ders Kodu' kullanın!\n"
-                        f"   Bu kolonda ders KODU olmalı (örn: MAT101, BLM205)"
-                    )
-            
-            if detected_issues:
-                raise ValueError("\n\n".join(detected_issues))
-            
-            # Column mapping - STRICT for course column
-            column_mapping = {
-                'ogrenci no': 'ogrenci_no',
-                'ogrencino': 'ogrenci_no',
-                'no': 'ogrenci_no',
-                'numara': 'ogrenci_no',
-                'ad soyad': 'ad_soyad',
-                'adsoyad': 'ad_soyad',
-                'ad': 'ad_soyad',
-                'isim': 'ad_soyad',
-                'sinif': 'sinif',
-                'sinifi': 'sinif',
-                'ders': 'ders',
-                'ders kodu': 'ders',
-                'derskodu': 'ders'
-            }
+        if Path(file_path).suffix.lower() in ('.xlsx', '.xlsm'):
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                sheet = workbook.worksheets[0]
+                for row in sheet.iter_rows(values_only=True):
+                    yield row
+            finally:
+                workbook.close()
+        else:
+            df = pd.read_excel(file_path, header=None, sheet_name=0)
+            for row in df.itertuples(index=False, name=None):
+                yield tuple(None if pd.isna(v) else v for v in row)
 
-            # Rename columns
-            for old_name, new_name in column_mapping.items():
-                if old_name in df.columns:
-                    df.rename(columns={old_name: new_name}, inplace=True)
+    @staticmethod
+    def _map_ogrenci_header(header: tuple) -> Dict[str, int]:
+        """Column index of each student list field; raises ValueError like the tabular parser always did"""
+        names = [_normalize_header(h) for h in header]
+
+        # Check for common mistakes BEFORE mapping
+        detected_issues = []
+        for col in names:
+            if 'ders adi' in col or 'dersadi' in col or 'dersin adi' in col:
+                detected_issues.append(
+                    f"❌ Yanlış kolon ismi: '{col}'\n"
+                    f"   'Ders Adı' yerine 'Ders' veya 'Ders Kodu' kullanın!\n"
+                    f"   Bu kolonda ders KODU olmalı (örn: MAT101, BLM205)"
+                )
 
-            # Validate required columns
-            required = ['ogrenci_no', 'ad_soyad']
-            missing = [col for col in required if col not in df.columns]
+        if detected_issues:
+            raise ValueError("\n\n".join(detected_issues))
+
+        col_index = {}
+        for idx, name in enumerate(names):
+            if name in ExcelParser.OGRENCI_COLUMNS.values() and name not in col_index:
+                col_index[name] = idx
+        for old_name, new_name in ExcelParser.OGRENCI_COLUMNS.items():
+            if old_name in names and new_name not in col_index:
+                col_index[new_name] = names.index(old_name)
+
+        # Validate required columns
+        required = ['ogrenci_no', 'ad_soyad']
+        missing = [col for col in required if col not in col_index]
+
+        if missing:
+            # Provide helpful error message
+            original_columns = [ExcelParser.OGRENCI_COLUMNS.get(n, n) for n in names]
+            error_msg = f"❌ Eksik sütunlar: {', '.join(missing)}\n\n"
+            error_msg += "Excel'deki mevcut sütunlar:\n"
+            error_msg += "\n".join([f"  • {col}" for col in original_columns[:10]])
+            if len(original_columns) > 10:
+                error_msg += f"\n  ... ve {len(original_columns) - 10} sütun daha"
+            error_msg += "\n\nGerekli sütunlar:\n"
+            error_msg += "  • Öğrenci No (veya No, Numara)\n"
+            error_msg += "  • Ad Soyad (veya Ad, İsim)\n"
+            error_msg += "  • Ders (veya Ders Kodu) - İSTEĞE BAĞLI\n"
+            error_msg += "  • Sınıf - İSTEĞE BAĞLI"
+            raise ValueError(error_msg)
+
+        # Check if ders column was expected but not found - MAKE IT AN ERROR
+        if 'ders' not in col_index:
+            error_msg = (
+                "❌ 'Ders' kolonu bulunamadı!\n\n"
+                "Öğrenci-ders eşleştirmesi için 'Ders' veya 'Ders Kodu' kolonu gereklidir.\n\n"
+                "Excel'de şu kolon isimlerinden birini kullanın:\n"
+                "  • Ders\n"
+                "  • Ders Kodu\n"
+                "  • DersKodu\n\n"
+                "Bu kolonda ders KODLARI olmalı (örn: MAT101, BLM205, FIZ203)\n\n"
+                "NOT: 'Ders Adı' yerine 'Ders Kodu' kullanmalısınız!"
+            )
+            raise ValueError(error_msg)
 
-            if missing:
-                # Provide helpful error message
-                original_columns = list(df.columns)
-                error_msg = f"❌ Eksik sütunlar: {', '.join(missing)}\n\n"
-                error_msg += "Excel'deki mevcut sütunlar:\n"
-                error_msg += "\n".join([f"  • {col}" for col in original_columns[:10]])
-                if len(original_columns) > 10:
-                    error_msg += f"\n  ... ve {len(original_columns) - 10} sütun daha"
-                error_msg += "\n\nGerekli sütunlar:\n"
-                error_msg += "  • Öğrenci No (veya No, Numara)\n"
-                error_msg += "  • Ad Soyad (veya Ad, İsim)\n"
-                error_msg += "  • Ders (veya Ders Kodu) - İSTEĞE BAĞLI\n"
-                error_msg += "  • Sınıf - İSTEĞE BAĞLI"
-                raise ValueError(error_msg)
+        return col_index
 
-            # Group by student to collect their courses
-            ogrenciler_dict = {}
-            errors = []
-            warnings = []
-            has_ders_column = 'ders' in df.columns
+    @staticmethod
+    def _validate_ogrenci_chunk(columns: Dict[str, list]) -> Dict:
+        """
+        Validate one chunk of student rows with column operations
 
-            for idx, row in df.iterrows():
-                excel_row = idx + 2  # +2 because Excel starts from 1 and we have header
-                
-                row_errors = []
-                row_warnings = []
-                
-                # Get values
-                ogrenci_no = str(row['ogrenci_no']).strip() if pd.notna(row.get('ogrenci_no')) else ''
-                ad_soyad = str(row['ad_soyad']).strip() if pd.notna(row.get('ad_soyad')) else ''
-
-                # Validation
-                if not ogrenci_no or ogrenci_no == 'nan':
-                    row_errors.append("Öğrenci numarası eksik")
-                elif not re.match(r'^\d+$', ogrenci_no):
-                    row_errors.append(f"Geçersiz öğrenci no: '{ogrenci_no}' (Sadece rakam olmalı)")
-                
-                if not ad_soyad or ad_soyad == 'nan':
-                    row_errors.append("Ad soyad eksik")
-                elif len(ad_soyad.split()) < 2:
-                    row_errors.append(f"Ad soyad eksik: '{ad_soyad}' (En az ad ve soyad olmalı)")
-                
-                # If there are errors, log and skip
-                if row_errors:
-                    error_msg = f"Satır {excel_row}: {', '.join(row_errors)}"
-                    errors.append(error_msg)
-                    logger.warning(error_msg)
-                    continue
+        Args:
+            columns: Raw cell values per field plus their Excel row numbers ('_row'), equal lengths
 
-                # Extract class number
-                sinif_val = str(row.get('sinif', '1')).strip()
-                sinif_match = re.search(r'(\d+)', sinif_val)
-                sinif = int(sinif_match.group(1)) if sinif_match else 1
-
-                # Get course if exists - WITH VALIDATION
-                ders = None
-                if has_ders_column:
-                    ders_val = str(row.get('ders', '')).strip() if pd.notna(row.get('ders')) else ''
-                    if ders_val and ders_val != 'nan' and ders_val != '':
-                        # Validate course code format (ABC123)
-                        if re.match(r'^[A-Z]{3}\d{3}$', ders_val.upper()):
-                            ders = ders_val.upper()
-                        else:
-                            row_warnings.append(f"Geçersiz ders kodu: '{ders_val}' (Beklenen format: ABC123)")
-                
-                # Log warnings
-                if row_warnings:
-                    warning_msg = f"Satır {excel_row} ({ogrenci_no}): {', '.join(row_warnings)}"
-                    warnings.append(warning_msg)
-                    logger.warning(warning_msg)
+        Returns:
+            {'rows': [(ogrenci_no, ad_soyad, sinif, ders or '')], 'errors': [...], 'warnings': [...]}
+        """
+        no = pd.Series(columns['ogrenci_no'], dtype=object).map(_cell_text)
+        ad = pd.Series(columns['ad_soyad'], dtype=object).map(_cell_text)
+        ders = pd.Series(columns['ders'], dtype=object).map(_cell_text)
+        excel_rows = columns['_row']
 
-                # Add or update student
-                if ogrenci_no not in ogrenciler_dict:
-                    ogrenciler_dict[ogrenci_no] = {
+        no_missing = no.eq('') | no.eq('nan')
+        no_invalid = ~no_missing & ~no.str.fullmatch(r'\d+').astype(bool)
+        ad_missing = ad.eq('') | ad.eq('nan')
+        ad_short = ~ad_missing & (ad.str.split().str.len() < 2)
+        bad = (no_missing | no_invalid | ad_missing | ad_short).to_numpy()
+
+        errors = []
+        for i in np.flatnonzero(bad):
+            row_errors = []
+            if no_missing.iat[i]:
+                row_errors.append("Öğrenci numarası eksik")
+            elif no_invalid.iat[i]:
+                row_errors.append(f"Geçersiz öğrenci no: '{no.iat[i]}' (Sadece rakam olmalı)")
+            if ad_missing.iat[i]:
+                row_errors.append("Ad soyad eksik")
+            elif ad_short.iat[i]:
+                row_errors.append(f"Ad soyad eksik: '{ad.iat[i]}' (En az ad ve soyad olmalı)")
+            errors.append(f"Satır {excel_rows[i]}: {', '.join(row_errors)}")
+
+        # Extract class number
+        if 'sinif' in columns:
+            sinif_text = pd.Series(columns['sinif'], dtype=object).map(_cell_text)
+            sinif = sinif_text.str.extract(r'(\d+)', expand=False).fillna('1').astype(int)
+        else:
+            sinif = pd.Series(1, index=no.index)
+
+        # Course codes - WITH VALIDATION
+        ders_upper = ders.str.upper()
+        ders_present = ~(ders.eq('') | ders.eq('nan'))
+        ders_valid = ders_present & ders_upper.str.fullmatch(r'[A-Z]{3}\d{3}').astype(bool)
+        ders_warn = (ders_present & ~ders_valid).to_numpy() & ~bad
+
+        warnings = [
+            f"Satır {excel_rows[i]} ({no.iat[i]}): "
+            f"Geçersiz ders kodu: '{ders.iat[i]}' (Beklenen format: ABC123)"
+            for i in np.flatnonzero(ders_warn)
+        ]
+
+        keep = ~bad
+        rows = list(zip(
+            no[keep].tolist(),
+            ad[keep].tolist(),
+            sinif[keep].tolist(),
+            ders_upper.where(ders_valid, '')[keep].tolist()
+        ))
+        return {'rows': rows, 'errors': errors, 'warnings': warnings}
+
+    @staticmethod
+    def _iter_ogrenci_chunks(file_path: str, chunk_size: int) -> Iterator[Dict]:
+        """Stream the sheet and yield _validate_ogrenci_chunk results every chunk_size rows"""
+        rows = ExcelParser.iter_sheet_rows(file_path)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("Excel dosyası boş!")
+        col_index = ExcelParser._map_ogrenci_header(header)
+
+        columns: Dict[str, list] = {f: [] for f in list(col_index) + ['_row']}
+        width = max(col_index.values()) + 1
+        rows_read = 0
+
+        for excel_row, row in enumerate(rows, start=2):  # row 1 is the header
+            rows_read += 1
+            if not row or all(v is None or str(v).strip() == '' for v in row):
+                continue  # blank line
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            for field, idx in col_index.items():
+                columns[field].append(row[idx])
+            columns['_row'].append(excel_row)
+
+            if len(columns['_row']) >= chunk_size:
+                checked = ExcelParser._validate_ogrenci_chunk(columns)
+                checked['rows_read'] = rows_read
+                yield checked
+                for values in columns.values():
+                    values.clear()
+
+        checked = ExcelParser._validate_ogrenci_chunk(columns)
+        checked['rows_read'] = rows_read
+        yield checked
+
+    @staticmethod
+    def iter_ogrenci_batches(file_path: str, batch_size: int = 5000) -> Iterator[Dict]:
+        """
+        Stream a student list in validated batches
+
+        Reads batch_size sheet rows at a time and yields the students found in
+        them, each with its course codes merged. A student whose rows continue
+        past the end of a batch is carried into the next one, so exports sorted
+        by student yield every student exactly once and batches can be passed
+        straight to OgrenciController.import_ogrenciler. If a student's rows are
+        scattered through the file, a later batch yields another record with
+        the remaining courses (use parse_ogrenci_listesi for such files).
+
+        Yields:
+            {'ogrenciler': [...], 'errors': [...], 'warnings': [...], 'rows_read': int}
+        """
+        carry: Optional[Dict] = None
+        for checked in ExcelParser._iter_ogrenci_chunks(file_path, batch_size):
+            batch: Dict[str, Dict] = {}
+            if carry is not None:
+                batch[carry['ogrenci_no']] = carry
+            for ogrenci_no, ad_soyad, sinif, ders in checked['rows']:
+                ogrenci = batch.get(ogrenci_no)
+                if ogrenci is None:
+                    ogrenci = batch[ogrenci_no] = {
                         'ogrenci_no': ogrenci_no,
                         'ad_soyad': ad_soyad,
                         'sinif': sinif,
                         'dersler': []
                     }
-
-                # Add course if valid
                 if ders:
-                    ogrenciler_dict[ogrenci_no]['dersler'].append(ders)
+                    ogrenci['dersler'].append(ders)
+
+            # The last student may continue in the next batch
+            carry = batch.pop(checked['rows'][-1][0]) if checked['rows'] else None
+            yield {
+                'ogrenciler': list(batch.values()),
+                'errors': checked['errors'],
+                'warnings': checked['warnings'],
+                'rows_read': checked['rows_read']
+            }
+
+        if carry is not None:
+            yield {'ogrenciler': [carry], 'errors': [], 'warnings': [], 'rows_read': checked['rows_read']}
+
+    @staticmethod
+    def parse_ogrenci_listesi(file_path: str, batch_size: int = 5000) -> List[Dict]:
+        """
+        Parse student list from Excel file
+        Supports standard tabular format: Öğrenci No | Ad Soyad | Sınıf | Ders
+
+        The sheet is streamed and validated in column batches (see
+        iter_ogrenci_batches); students are merged across the whole file.
+
+        Args:
+            file_path: Path to Excel file
+
+        Returns:
+            List of student dictionaries with enrolled courses
+        """
+        try:
+            ogrenciler_dict: Dict[str, Dict] = {}
+            errors = []
+            warnings = []
+
+            for checked in ExcelParser._iter_ogrenci_chunks(file_path, batch_size):
+                errors.extend(checked['errors'])
+                warnings.extend(checked['warnings'])
+
+                # Add or update student
+                for ogrenci_no, ad_soyad, sinif, ders in checked['rows']:
+                    ogrenci = ogrenciler_dict.get(ogrenci_no)
+                    if ogrenci is None:
+                        ogrenci = ogrenciler_dict[ogrenci_no] = {
+                            'ogrenci_no': ogrenci_no,
+                            'ad_soyad': ad_soyad,
+                            'sinif': sinif,
+                            'dersler': []
+                        }
+                    if ders:
+                        ogrenci['dersler'].append(ders)
+
+            for message in errors + warnings:
+                logger.warning(message)
 
             # Convert to list
             ogrenciler = list(ogrenciler_dict.values())
 
-            # Check if ders column was expected but not found - MAKE IT AN ERROR
-            if not has_ders_column:
-                error_msg = (
-                    "❌ 'Ders' kolonu bulunamadı!\n\n"
-                    "Öğrenci-ders eşleştirmesi için 'Ders' veya 'Ders Kodu' kolonu gereklidir.\n\n"
-                    "Excel'de şu kolon isimlerinden birini kullanın:\n"
-                    "  • Ders\n"
-                    "  • Ders Kodu\n"
-                    "  • DersKodu\n\n"
-                    "Bu kolonda ders KODLARI olmalı (örn: MAT101, BLM205, FIZ203)\n\n"
-                    "NOT: 'Ders Adı' yerine 'Ders Kodu' kullanmalısınız!"
-                )
-                raise ValueError(error_msg)
-
             # Report results
             error_and_warning_summary = ""
             
@@ -677,12 +816,8 @@ class ExcelParser:
             List of classroom dictionaries
         """
         try:
-            df = pd.read_excel(file_path)
-            df.columns = df.columns.str.strip().str.lower()
-
-            # Remove Turkish characters
-            df.columns = df.columns.str.replace('ı', 'i').str.replace('ş', 's').str.replace('ğ', 'g')
-            df.columns = df.columns.str.replace('ü', 'u').str.replace('ö', 'o').str.replace('ç', 'c')
+            rows = ExcelParser.iter_sheet_rows(file_path)
+            header = [_normalize_header(h) for h in (next(rows, None) or ())]
 
             column_mapping = {
                 'derslik kodu': 'derslik_kodu',
@@ -701,28 +836,41 @@ class ExcelParser:
                 'sira': 'sira_yapisi'
             }
 
+            col_index = {}
             for old_name, new_name in column_mapping.items():
-                if old_name in df.columns:
-                    df.rename(columns={old_name: new_name}, inplace=True)
+                if old_name in header and new_name not in col_index:
+                    col_index[new_name] = header.index(old_name)
 
             required = ['derslik_kodu', 'derslik_adi', 'kapasite']
-            missing = [col for col in required if col not in df.columns]
+            missing = [col for col in required if col not in col_index]
 
             if missing:
                 raise ValueError(f"Eksik sütunlar: {', '.join(missing)}")
 
-            derslikler = []
-            for _, row in df.iterrows():
-                kapasite = int(row['kapasite'])
-                derslik = {
-                    'derslik_kodu': str(row['derslik_kodu']).strip().upper(),
-                    'derslik_adi': str(row['derslik_adi']).strip(),
-                    'kapasite': kapasite,
-                    'satir_sayisi': int(row.get('satir_sayisi', 10)),
-                    'sutun_sayisi': int(row.get('sutun_sayisi', 6)),
-                    'sira_yapisi': int(row.get('sira_yapisi', 3))
-                }
-                derslikler.append(derslik)
+            # Collect columns, skipping blank lines
+            width = max(col_index.values()) + 1
+            columns: Dict[str, list] = {field: [] for field in col_index}
+            for row in rows:
+                if not row or all(v is None or str(v).strip() == '' for v in row):
+                    continue
+                row = tuple(row) + (None,) * max(0, width - len(row))
+                for field, idx in col_index.items():
+                    columns[field].append(row[idx])
+
+            count = len(columns['derslik_kodu'])
+            defaults = {'satir_sayisi': 10, 'sutun_sayisi': 6, 'sira_yapisi': 3}
+            table = {
+                'derslik_kodu': pd.Series(columns['derslik_kodu'], dtype=object).map(_cell_text).str.upper(),
+                'derslik_adi': pd.Series(columns['derslik_adi'], dtype=object).map(_cell_text),
+                'kapasite': pd.to_numeric(pd.Series(columns['kapasite'], dtype=object)).astype(int),
+            }
+            for field, default in defaults.items():
+                if field in columns:
+                    table[field] = pd.to_numeric(pd.Series(columns[field], dtype=object)).astype(int)
+                else:
+                    table[field] = pd.Series([default] * count, dtype=int)
+
+            derslikler = pd.DataFrame(table).to_dict('records')
 
             logger.info(f"✅ {len(derslikler)} derslik Excel'den yüklendi")
             return derslikler
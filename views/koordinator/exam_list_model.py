@@ -0,0 +1,247 @@
+"""
+Sınav Listesi Modeli - Exam List Model
+Paged, thread-loaded table model of a department's exams for the seating view
+"""
+
+import logging
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate
+from PySide6.QtCore import (
+    QAbstractTableModel, QEvent, QModelIndex, QObject, QRectF, Qt, QThread, Signal, Slot
+)
+from PySide6.QtGui import QColor, QFont, QPainter
+
+from models.database import db
+from models.sinav_model import SinavModel
+
+logger = logging.getLogger(__name__)
+
+# Rows per keyset page (one more is fetched to know whether another page exists)
+EXAM_PAGE_SIZE = 200
+
+EXAM_COLUMNS = ['Ders Kodu', 'Ders Adı', 'Tarih/Saat', 'Derslikler', 'İşlem']
+ACTION_COLUMN = 4
+ACTION_TEXT = "Derslik Değiştir"
+
+
+def format_tarih_saat(tarih_saat) -> str:
+    if isinstance(tarih_saat, str):
+        try:
+            return datetime.fromisoformat(tarih_saat).strftime('%d.%m.%Y %H:%M')
+        except ValueError:
+            return tarih_saat
+    if hasattr(tarih_saat, 'strftime'):
+        return tarih_saat.strftime('%d.%m.%Y %H:%M')
+    return str(tarih_saat or '')
+
+
+def _stop_thread(thread: QThread) -> None:
+    if thread.isRunning():
+        thread.quit()
+        thread.wait()
+
+
+class ExamPageLoader(QObject):
+    """Runs the page queries on the model's worker thread"""
+    page_loaded = Signal(int, list, bool)  # generation, rows, has_more
+    failed = Signal(int, str)
+
+    def __init__(self, bolum_id: int):
+        super().__init__()
+        self.bolum_id = bolum_id
+        self.sinav_model = SinavModel(db)
+
+    @Slot(int, object)
+    def load_page(self, generation: int, after) -> None:
+        try:
+            rows = self.sinav_model.get_sinavlar_page(self.bolum_id, after, EXAM_PAGE_SIZE + 1) or []
+            has_more = len(rows) > EXAM_PAGE_SIZE
+            self.page_loaded.emit(generation, [dict(row) for row in rows[:EXAM_PAGE_SIZE]], has_more)
+        except Exception as e:
+            logger.error(f"Error loading exam page: {e}", exc_info=True)
+            self.failed.emit(generation, str(e))
+
+
+class ExamListModel(QAbstractTableModel):
+    """Exams of all the department's programs, loaded a page at a time
+
+    The view asks for more rows when it scrolls to the end (canFetchMore /
+    fetchMore); pages are queried on a worker thread and appended when they
+    arrive. reload() starts over; pages of an older load are dropped.
+    Display strings are formatted once per row, Qt.UserRole returns the exam.
+    The worker thread is a child of the model and is stopped when the model
+    is destroyed (e.g. with its page) or the application quits.
+    """
+    page_requested = Signal(int, object)  # generation, keyset cursor
+    loading_changed = Signal(bool)
+    load_failed = Signal(str)
+
+    def __init__(self, bolum_id: int, parent=None):
+        super().__init__(parent)
+        self._exams: List[Dict] = []
+        self._display: List[tuple] = []
+        self._generation = 0
+        self._has_more = False
+        self._loading = False
+
+        self._thread = QThread(self)
+        self._loader = ExamPageLoader(bolum_id)
+        self._loader.moveToThread(self._thread)
+        self.page_requested.connect(self._loader.load_page)
+        self._loader.page_loaded.connect(self._on_page_loaded)
+        self._loader.failed.connect(self._on_failed)
+        # destroyed is emitted before the children (the thread) are deleted;
+        # the slot must not touch the model, which is already being torn down
+        self.destroyed.connect(partial(_stop_thread, self._thread))
+        self._thread.start()
+
+        app = QApplication.instance()
+        self._quit_connected = app is not None
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._exams)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(EXAM_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return EXAM_COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._display[index.row()][index.column()]
+        if role == Qt.UserRole:
+            return self._exams[index.row()]
+        if role == Qt.ToolTipRole and index.column() != ACTION_COLUMN:
+            exam = self._exams[index.row()]
+            return f"{exam.get('program_adi', '')}\n{self._display[index.row()][index.column()]}"
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        after = SinavModel.sinav_page_key(self._exams[-1]) if self._exams else None
+        self._set_loading(True)
+        self.page_requested.emit(self._generation, after)
+
+    # Loading
+
+    def reload(self) -> None:
+        """Drop the rows and load the first page again"""
+        self._generation += 1
+        self.beginResetModel()
+        self._exams, self._display = [], []
+        self._has_more = True
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def is_loading(self) -> bool:
+        return self._loading
+
+    def exam_at(self, row: int) -> Optional[Dict]:
+        return self._exams[row] if 0 <= row < len(self._exams) else None
+
+    def row_of(self, sinav_id: int) -> int:
+        """Row of a loaded exam, -1 if not (yet) loaded"""
+        for row, exam in enumerate(self._exams):
+            if exam.get('sinav_id') == sinav_id:
+                return row
+        return -1
+
+    def _set_loading(self, loading: bool) -> None:
+        if self._loading != loading:
+            self._loading = loading
+            self.loading_changed.emit(loading)
+
+    @Slot(int, list, bool)
+    def _on_page_loaded(self, generation: int, rows: List[Dict], has_more: bool) -> None:
+        if generation != self._generation:
+            return  # a reload started after this page was requested
+        if rows:
+            first = len(self._exams)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            for exam in rows:
+                self._exams.append(exam)
+                self._display.append((
+                    exam.get('ders_kodu') or '',
+                    exam.get('ders_adi') or '',
+                    format_tarih_saat(exam.get('tarih_saat')),
+                    exam.get('derslik_adi') or exam.get('derslik_kodu') or '',
+                    ACTION_TEXT,
+                ))
+            self.endInsertRows()
+        self._has_more = has_more
+        self._set_loading(False)
+        logger.info(f"Oturma Planı: {len(self._exams)} sınav yüklendi{' (devamı var)' if has_more else ''}")
+
+    @Slot(int, str)
+    def _on_failed(self, generation: int, message: str) -> None:
+        if generation != self._generation:
+            return
+        self._has_more = False
+        self._set_loading(False)
+        self.load_failed.emit(message)
+
+    def shutdown(self) -> None:
+        """Stop the worker thread; no pages are loaded afterwards"""
+        _stop_thread(self._thread)
+        app = QApplication.instance()
+        if self._quit_connected and app is not None:
+            app.aboutToQuit.disconnect(self.shutdown)
+        self._quit_connected = False
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints a button in a cell and emits clicked(row), instead of a QPushButton per row
+
+    The view needs mouse tracking for the hover colour.
+    """
+    clicked = Signal(int)
+
+    def __init__(self, parent=None, color: str = '#f59e0b', hover_color: str = '#d97706'):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.hover_color = QColor(hover_color)
+        self.font = QFont("Segoe UI", 8, QFont.Bold)
+
+    def _button_rect(self, option) -> QRectF:
+        return QRectF(option.rect).adjusted(4, 4, -4, -4)
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        rect = self._button_rect(option)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.hover_color if option.state & QStyle.State_MouseOver else self.color)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor('white'))
+        painter.setFont(self.font)
+        painter.drawText(rect, Qt.AlignCenter, index.data(Qt.DisplayRole) or '')
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and self._button_rect(option).contains(event.position())
+        ):
+            self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QHeaderView, QFrame,
     QFileDialog, QGroupBox, QLineEdit, QSplitter,
-    QSpinBox, QFormLayout, QDialog, QDialogButtonBox
+    QSpinBox, QFormLayout, QDialog, QDialogButtonBox, QProgressBar
 )
 
 from controllers.ogrenci_controller import OgrenciController
@@ -42,6 +42,33 @@ class OgrenciLoadThread(QThread):
             self.error.emit(str(e))
 
 
+class OgrenciSaveThread(QThread):
+    """Thread for importing students into the database"""
+    progress = Signal(int, str)
+    finished = Signal(dict)
+    error = Signal(str)
+    
+    def __init__(self, controller, ogrenciler, bolum_id, skip_existing=True):
+        super().__init__()
+        self.controller = controller
+        self.ogrenciler = ogrenciler
+        self.bolum_id = bolum_id
+        self.skip_existing = skip_existing
+    
+    def run(self):
+        try:
+            result = self.controller.import_ogrenciler(
+                self.ogrenciler,
+                self.bolum_id,
+                skip_existing=self.skip_existing,
+                progress_callback=self.progress.emit
+            )
+            self.finished.emit(result)
+        except Exception as e:
+            logger.error(f"Student import thread error: {e}", exc_info=True)
+            self.error.emit(str(e))
+
+
 class OgrenciYukleView(QWidget):
     """Student upload and management view"""
     
@@ -55,6 +82,7 @@ class OgrenciYukleView(QWidget):
         self.ogrenci_controller = OgrenciController(self.ogrenci_model)
         
         self.pending_ogrenciler = []
+        self.save_thread = None
         
         self.setup_ui()
         self.load_existing_ogrenciler()
@@ -342,6 +370,25 @@ class OgrenciYukleView(QWidget):
         self.stats_label.setStyleSheet("color: #374151; padding: 4px;")
         stats_group_layout.addWidget(self.stats_label)
         
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setFixedHeight(20)
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid #cbd5e1;
+                border-radius: 4px;
+                text-align: center;
+                background: #f8fafc;
+                font-size: 11px;
+            }
+            QProgressBar::chunk {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #3b82f6, stop:1 #2563eb);
+                border-radius: 3px;
+            }
+        """)
+        stats_group_layout.addWidget(self.progress_bar)
+        
         # Info group box
         info_group = QGroupBox("💡 Excel Format Bilgisi")
         info_group.setStyleSheet("""
@@ -445,15 +492,17 @@ class OgrenciYukleView(QWidget):
             ModernMessageBox.warning(self, "Uyarı", "Excel dosyasında öğrenci bulunamadı!")
             return
         
-        # Check for existing students
+        # Check for existing students (one query for the whole file)
         existing_count = 0
         new_count = 0
         existing_details = []
+        existing_nos = self.ogrenci_model.get_existing_ogrenci_nos(
+            [o.get('ogrenci_no') for o in ogrenciler if o.get('ogrenci_no')]
+        )
         
         for idx, ogrenci in enumerate(ogrenciler, start=1):
             excel_row = idx + 1  # +1 for header row
-            existing = self.ogrenci_model.get_ogrenci_by_no(ogrenci.get('ogrenci_no', ''))
-            if existing:
+            if ogrenci.get('ogrenci_no', '') in existing_nos:
                 existing_count += 1
                 existing_details.append(
                     f"Satır {excel_row}: {ogrenci.get('ogrenci_no')} - {ogrenci.get('ad_soyad')} - {ogrenci.get('sinif', '?')}. Sınıf"
@@ -507,99 +556,118 @@ class OgrenciYukleView(QWidget):
         )
     
     def save_ogrenciler(self, skip_existing=True):
-        """Save students to database with detailed error reporting"""
-        if not self.pending_ogrenciler:
+        """Save students to database in a background thread"""
+        if not self.pending_ogrenciler or self.save_thread is not None:
             return
         
-        try:
-            success_count = 0
-            skipped_count = 0
-            error_count = 0
-            error_details = []
-            skipped_details = []
-            
-            for idx, ogrenci in enumerate(self.pending_ogrenciler, 1):
-                excel_row = idx + 1  # +1 for header row in Excel
-                ogrenci['bolum_id'] = self.bolum_id
-                
-                # Check if student already exists
-                if skip_existing:
-                    existing = self.ogrenci_model.get_ogrenci_by_no(ogrenci.get('ogrenci_no', ''))
-                    if existing:
-                        skipped_count += 1
-                        skipped_details.append(f"Satır {excel_row}: {ogrenci.get('ogrenci_no')} - {ogrenci.get('ad_soyad')}")
-                        logger.info(f"Skipped existing student at row {excel_row}: {ogrenci.get('ogrenci_no')}")
-                        continue
-                
-                result = self.ogrenci_controller.create_ogrenci(ogrenci)
-                
-                if result['success']:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    # Track which row failed
-                    error_msg = f"Satır {excel_row} ({ogrenci.get('ogrenci_no', '?')} - {ogrenci.get('ad_soyad', '?')}): {result['message']}"
-                    error_details.append(error_msg)
-                    logger.warning(error_msg)
-            
-            # Show detailed results
-            result_message = []
-            if success_count > 0:
-                result_message.append(f"✅ {success_count} yeni öğrenci kaydedildi")
-            if skipped_count > 0:
-                result_message.append(f"⏭️ {skipped_count} mevcut öğrenci atlandı")
-            if error_count > 0:
-                result_message.append(f"❌ {error_count} öğrenci kaydedilemedi")
-            
-            # Prepare detailed text
-            detailed_parts = []
-            
-            if skipped_count > 0:
-                skipped_text = "⏭️ ATLANAN ÖĞRENCİLER:\n" + "\n".join(skipped_details[:15])
-                if len(skipped_details) > 15:
-                    skipped_text += f"\n... ve {len(skipped_details) - 15} öğrenci daha"
-                detailed_parts.append(skipped_text)
-            
-            if error_count > 0:
-                error_text = "❌ HATA OLUŞAN KAYITLAR:\n" + "\n".join(error_details[:15])
-                if len(error_details) > 15:
-                    error_text += f"\n... ve {len(error_details) - 15} hata daha"
-                detailed_parts.append(error_text)
-            
-            detailed_text = "\n\n".join(detailed_parts) if detailed_parts else None
-            
-            if error_count > 0:
-                ModernMessageBox.warning(
-                    self,
-                    "Kaydetme Sonuçları",
-                    "\n".join(result_message),
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        
+        self.save_thread = OgrenciSaveThread(
+            self.ogrenci_controller,
+            self.pending_ogrenciler,
+            self.bolum_id,
+            skip_existing=skip_existing
+        )
+        self.save_thread.progress.connect(self.on_save_progress)
+        self.save_thread.finished.connect(self.on_save_finished)
+        self.save_thread.error.connect(self.on_save_error)
+        self.save_thread.start()
+    
+    def on_save_progress(self, percent, message):
+        """Update import progress"""
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{message}  %p%")
+    
+    def _finish_save_thread(self):
+        self.progress_bar.setVisible(False)
+        if self.save_thread:
+            self.save_thread.quit()
+            self.save_thread.wait()
+            self.save_thread = None
+    
+    def on_save_error(self, error_msg):
+        """Handle import thread error"""
+        self._finish_save_thread()
+        ModernMessageBox.error(self, "Hata", "Öğrenciler kaydedilirken oluştu", error_msg)
+    
+    def on_save_finished(self, result):
+        """Show detailed import results"""
+        self._finish_save_thread()
+        
+        if not result.get('success'):
+            logger.error(f"Error saving students: {result.get('message')}")
+            ModernMessageBox.error(self, "Hata", "Öğrenciler kaydedilirken oluştu", f"{result.get('message')}")
+            return
+        
+        success_count = result['success_count']
+        skipped_count = result['skipped_count']
+        error_count = result['error_count']
+        skipped_details = [
+            f"Satır {r['row']}: {r['ogrenci_no']} - {r['ad_soyad']}"
+            for r in result['skipped']
+        ]
+        error_details = [
+            f"Satır {r['row']} ({r.get('ogrenci_no') or '?'} - {r.get('ad_soyad') or '?'}): {r['message']}"
+            for r in result['errors']
+        ]
+        for msg in error_details:
+            logger.warning(msg)
+        
+        # Show detailed results
+        result_message = []
+        if success_count > 0:
+            result_message.append(f"✅ {success_count} yeni öğrenci kaydedildi")
+        if skipped_count > 0:
+            result_message.append(f"⏭️ {skipped_count} mevcut öğrenci atlandı")
+        if error_count > 0:
+            result_message.append(f"❌ {error_count} öğrenci kaydedilemedi")
+        
+        # Prepare detailed text
+        detailed_parts = []
+        
+        if skipped_count > 0:
+            skipped_text = "⏭️ ATLANAN ÖĞRENCİLER:\n" + "\n".join(skipped_details[:15])
+            if len(skipped_details) > 15:
+                skipped_text += f"\n... ve {len(skipped_details) - 15} öğrenci daha"
+            detailed_parts.append(skipped_text)
+        
+        if error_count > 0:
+            error_text = "❌ HATA OLUŞAN KAYITLAR:\n" + "\n".join(error_details[:15])
+            if len(error_details) > 15:
+                error_text += f"\n... ve {len(error_details) - 15} hata daha"
+            detailed_parts.append(error_text)
+        
+        detailed_text = "\n\n".join(detailed_parts) if detailed_parts else None
+        
+        if error_count > 0:
+            ModernMessageBox.warning(
+                self,
+                "Kaydetme Sonuçları",
+                "\n".join(result_message),
+                detailed_text
+            )
+        else:
+            message = "\n".join(result_message)
+            if skipped_count > 0 and success_count == 0:
+                ModernMessageBox.information(
+                    self, 
+                    "Bilgi", 
+                    "Tüm öğrenciler zaten veritabanında mevcut.\n\n"
+                    f"{skipped_count} öğrenci atlandı.",
                     detailed_text
                 )
             else:
-                message = "\n".join(result_message)
-                if skipped_count > 0 and success_count == 0:
-                    ModernMessageBox.information(
-                        self, 
-                        "Bilgi", 
-                        "Tüm öğrenciler zaten veritabanında mevcut.\n\n"
-                        f"{skipped_count} öğrenci atlandı.",
-                        detailed_text
-                    )
-                else:
-                    ModernMessageBox.success(
-                        self, "Başarılı", message
-                    )
-            
-            self.pending_ogrenciler = []
-            self.load_existing_ogrenciler()
-            
-            # Refresh main window UI (menus and shortcuts) if students were added
-            if success_count > 0:
-                refresh_main_window_ui(self)
-            
-        except Exception as e:
-            logger.error(f"Error saving students: {e}", exc_info=True)
-            ModernMessageBox.error(self, "Hata", "Öğrenciler kaydedilirken oluştu", f"{str(e)}")
+                ModernMessageBox.success(
+                    self, "Başarılı", message
+                )
+        
+        self.pending_ogrenciler = []
+        self.load_existing_ogrenciler()
+        
+        # Refresh main window UI (menus and shortcuts) if students were added
+        if success_count > 0:
+            refresh_main_window_ui(self)
     
     def update_stats(self, existing, pending):
         """Update statistics label"""
@@ -4,15 +4,16 @@ Allows creating and visualizing seating arrangements for exams
 """
 
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
-    QGridLayout, QScrollArea, QFrame, QGroupBox, QFileDialog,
-    QDialog, QListWidget, QListWidgetItem, QDialogButtonBox
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QMessageBox,
+    QFrame, QGroupBox, QFileDialog,
+    QDialog, QListWidget, QListWidgetItem, QDialogButtonBox, QProgressBar
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QFont, QColor
 
 from models.database import db
@@ -21,10 +22,34 @@ from models.derslik_model import DerslikModel
 from models.ogrenci_model import OgrenciModel
 from utils.modern_dialogs import ModernMessageBox, sanitize_filename
 from algorithms.oturma_planlama import OturmaPlanlama
+from views.koordinator.seating_map import SeatingMapView
+from views.koordinator.exam_list_model import ACTION_COLUMN, ActionButtonDelegate, ExamListModel
 
 logger = logging.getLogger(__name__)
 
 
+class ProgramOturmaThread(QThread):
+    """Thread for seating every exam of a program"""
+    progress = Signal(int, str)
+    finished = Signal(dict)
+    error = Signal(str)
+
+    def __init__(self, program_id: int):
+        super().__init__()
+        self.program_id = program_id
+
+    def run(self):
+        try:
+            result = OturmaPlanlama().seat_program(
+                self.program_id,
+                progress_callback=self.progress.emit
+            )
+            self.finished.emit(result)
+        except Exception as e:
+            logger.error(f"Program seating thread error: {e}", exc_info=True)
+            self.error.emit(str(e))
+
+
 class OturmaPlaniView(QWidget):
     """Seating plan view for exam arrangements"""
 
@@ -42,6 +67,8 @@ class OturmaPlaniView(QWidget):
         self.selected_sinav = None
         self.seating_data = {}  # {ogrenci_no: {derslik_id, sira, sutun}}
         self.seating_data_sinav_id = None  # Track which exam the seating data belongs to
+        self.program_thread = None
+        self._reselect_sinav_id = None  # Exam to select again once the reloaded list has it
 
         self.init_ui()
         self.load_exams()
@@ -97,17 +124,32 @@ class OturmaPlaniView(QWidget):
         """)
         exam_layout = QVBoxLayout(exam_group)
 
-        self.exams_table = QTableWidget()
-        self.exams_table.setColumnCount(5)
-        self.exams_table.setHorizontalHeaderLabels(['Ders Kodu', 'Ders Adı', 'Tarih/Saat', 'Derslikler', 'İşlem'])
+        # Exams of all programs, paged from one query on a worker thread
+        self.exam_model = ExamListModel(self.bolum_id, self)
+        self.exam_model.rowsInserted.connect(self._on_exams_loaded)
+        self.exam_model.loading_changed.connect(self._on_exams_loading)
+        self.exam_model.load_failed.connect(self._on_exams_load_failed)
+
+        self.exams_table = QTableView()
+        self.exams_table.setModel(self.exam_model)
         self.exams_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.exams_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.exams_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.exams_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.exams_table.itemSelectionChanged.connect(self.on_exam_selected)
+        self.exams_table.verticalHeader().setVisible(False)
+        self.exams_table.setSelectionBehavior(QTableView.SelectRows)
+        self.exams_table.setSelectionMode(QTableView.SingleSelection)
+        self.exams_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.exams_table.setMouseTracking(True)  # hover colour of the action buttons
+        self.exams_table.selectionModel().selectionChanged.connect(self.on_exam_selected)
         self.exams_table.setMinimumWidth(600)
+
+        self.change_delegate = ActionButtonDelegate(self.exams_table)
+        self.change_delegate.clicked.connect(self._on_change_clicked)
+        self.exams_table.setItemDelegateForColumn(ACTION_COLUMN, self.change_delegate)
         exam_layout.addWidget(self.exams_table)
 
+        self.exams_status = QLabel("")
+        self.exams_status.setStyleSheet("color: #6b7280; font-size: 11px;")
+        exam_layout.addWidget(self.exams_status)
+
         content_layout.addWidget(exam_group, 2)
 
         # Right: Seating plan visualization
@@ -149,6 +191,25 @@ class OturmaPlaniView(QWidget):
         self.create_plan_btn.clicked.connect(self.create_seating_plan)
         btn_layout.addWidget(self.create_plan_btn)
 
+        self.seat_program_btn = QPushButton("Tüm Programı Yerleştir")
+        self.seat_program_btn.setFixedHeight(40)
+        self.seat_program_btn.setEnabled(False)
+        self.seat_program_btn.setToolTip("Seçili sınavın programındaki (seçim yoksa en son programdaki)\ntüm sınavlar için oturma düzeni oluşturup kaydeder")
+        self.seat_program_btn.setStyleSheet("""
+            QPushButton {
+                background: #8b5cf6;
+                color: white;
+                font-weight: bold;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-size: 13px;
+            }
+            QPushButton:hover { background: #7c3aed; }
+            QPushButton:disabled { background: #9ca3af; }
+        """)
+        self.seat_program_btn.clicked.connect(self.seat_whole_program)
+        btn_layout.addWidget(self.seat_program_btn)
+
         self.export_visual_btn = QPushButton("Görsel PDF (Oturma Düzeni)")
         self.export_visual_btn.setFixedHeight(40)
         self.export_visual_btn.setEnabled(False)
@@ -188,17 +249,14 @@ class OturmaPlaniView(QWidget):
         btn_layout.addStretch()
         plan_layout.addLayout(btn_layout)
 
-        # Scroll area for seating visualization
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: 1px solid #e5e7eb; border-radius: 6px; background: white; }")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        plan_layout.addWidget(self.progress_bar)
 
-        self.seating_widget = QWidget()
-        self.seating_layout = QVBoxLayout(self.seating_widget)
-        self.seating_layout.setAlignment(Qt.AlignCenter)
-
-        scroll.setWidget(self.seating_widget)
-        plan_layout.addWidget(scroll)
+        # Custom-painted seating map (Ctrl + tekerlek: yakınlaştır, Ctrl+0: sıfırla)
+        self.seating_map = SeatingMapView()
+        self.seating_map.setStyleSheet("QGraphicsView { border: 1px solid #e5e7eb; border-radius: 6px; background: white; }")
+        plan_layout.addWidget(self.seating_map)
 
         # Student list
         self.students_table = QTableWidget()
@@ -213,77 +271,41 @@ class OturmaPlaniView(QWidget):
         layout.addLayout(content_layout)
 
     def load_exams(self):
-        """Load all exams for the department"""
-        try:
-            # Get all exam programs for department
-            programs = self.sinav_model.get_programs_by_bolum(self.bolum_id)
+        """Load all exams for the department (first page; more on scroll, in the background)"""
+        self.exams_table.clearSelection()
+        self.exam_model.reload()
 
-            if not programs:
-                logger.info("Oturma Planı: Henüz sınav programı yok")
-                return
+    def _on_exams_loading(self, loading: bool):
+        if loading:
+            self.exams_status.setText("⏳ Sınavlar yükleniyor...")
+        else:
+            count = self.exam_model.rowCount()
+            more = " - devamı için aşağı kaydırın" if self.exam_model.canFetchMore() else ""
+            self.exams_status.setText(f"{count} sınav{more}" if count else "Henüz sınav programı yok")
+            self.seat_program_btn.setEnabled(count > 0 and self.program_thread is None)
+
+    def _on_exams_loaded(self, parent, first: int, last: int):
+        """Restore the selection of a reload once the exam's row arrives"""
+        if self._reselect_sinav_id is None:
+            return
+        row = self.exam_model.row_of(self._reselect_sinav_id)
+        if first <= row <= last:
+            self._reselect_sinav_id = None
+            self.exams_table.selectRow(row)
 
-            # Get exams from all programs
-            all_exams = []
-            for program in programs:
-                exams = self.sinav_model.get_sinavlar_by_program(program['program_id'])
-                for exam in exams:
-                    exam['program_id'] = program['program_id']
-                    exam['program_adi'] = program['program_adi']
-                    all_exams.append(exam)
-
-            logger.info(f"Oturma Planı: {len(all_exams)} sınav yüklendi")
-            self.exams_table.setRowCount(0)
-
-            for exam in all_exams:
-                row = self.exams_table.rowCount()
-                self.exams_table.insertRow(row)
-
-                self.exams_table.setItem(row, 0, QTableWidgetItem(exam.get('ders_kodu', '')))
-                self.exams_table.setItem(row, 1, QTableWidgetItem(exam.get('ders_adi', '')))
-
-                tarih_saat = exam.get('tarih_saat', '')
-                if isinstance(tarih_saat, str):
-                    try:
-                        dt = datetime.fromisoformat(tarih_saat)
-                        tarih_saat = dt.strftime('%d.%m.%Y %H:%M')
-                    except:
-                        pass
-                elif hasattr(tarih_saat, 'strftime'):
-                    tarih_saat = tarih_saat.strftime('%d.%m.%Y %H:%M')
-
-                self.exams_table.setItem(row, 2, QTableWidgetItem(str(tarih_saat)))
-                self.exams_table.setItem(row, 3, QTableWidgetItem(exam.get('derslik_adi', exam.get('derslik_kodu', ''))))
-
-                # Add change classroom button
-                change_btn = QPushButton("Derslik Değiştir")
-                change_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #f59e0b;
-                        color: white;
-                        font-weight: bold;
-                        border-radius: 4px;
-                        padding: 6px 12px;
-                        font-size: 11px;
-                    }
-                    QPushButton:hover { background: #d97706; }
-                """)
-                change_btn.clicked.connect(lambda checked=False, e=exam: self.change_classroom(e))
-                self.exams_table.setCellWidget(row, 4, change_btn)
-
-                # Store exam data
-                for col in range(4):
-                    item = self.exams_table.item(row, col)
-                    if item:
-                        item.setData(Qt.UserRole, exam)
+    def _on_exams_load_failed(self, message: str):
+        self.exams_status.setText("❌ Sınavlar yüklenemedi")
+        ModernMessageBox.error(self, "Yükleme Hatası", "Sınavlar yüklenirken bir hata oluştu.", f"Hata detayı:\n{message}")
 
-        except Exception as e:
-            logger.error(f"Error loading exams: {e}", exc_info=True)
-            ModernMessageBox.error(self, "Yükleme Hatası", "Sınavlar yüklenirken bir hata oluştu.", f"Hata detayı:\n{str(e)}")
+    def _on_change_clicked(self, row: int):
+        exam = self.exam_model.exam_at(row)
+        if exam:
+            self.change_classroom(exam)
 
     def on_exam_selected(self):
         """Handle exam selection"""
-        selected_items = self.exams_table.selectedItems()
-        if not selected_items:
+        selected_rows = self.exams_table.selectionModel().selectedRows()
+        if not selected_rows:
             self.selected_sinav = None
             self.create_plan_btn.setEnabled(False)
             self.export_visual_btn.setEnabled(False)
@@ -292,8 +314,8 @@ class OturmaPlaniView(QWidget):
             logger.info("❌ No exam selected - all buttons disabled")
             return
 
-        # Get exam data from first item
-        exam_data = selected_items[0].data(Qt.UserRole)
+        # Get exam data of the selected row
+        exam_data = self.exam_model.exam_at(selected_rows[0].row())
         if not exam_data:
             logger.warning("⚠️ Selected item has no exam data")
             return
@@ -459,6 +481,81 @@ class OturmaPlaniView(QWidget):
             logger.error(f"Error creating seating plan: {e}", exc_info=True)
             ModernMessageBox.error(self, "Planlama Hatası", "Oturma düzeni oluşturulurken bir hata oluştu.", f"Hata detayı:\n{str(e)}")
 
+    def seat_whole_program(self):
+        """Seat every exam of the selected (or latest) program in the background"""
+        # Exams are listed newest program first
+        exam = self.selected_sinav or self.exam_model.exam_at(0)
+        if self.program_thread is not None or not exam:
+            return
+
+        program_id = exam['program_id']
+        confirmed = ModernMessageBox.question(
+            self,
+            "Tüm Programı Yerleştir",
+            f"'{exam.get('program_adi', program_id)}' programındaki tüm sınavlar için oturma düzeni "
+            f"oluşturulacak.\n\nMevcut oturma planlarının yerine geçecek. Devam etmek istiyor musunuz?"
+        )
+        if not confirmed:
+            return
+
+        self.seat_program_btn.setEnabled(False)
+        self.create_plan_btn.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+
+        self.program_thread = ProgramOturmaThread(program_id)
+        self.program_thread.progress.connect(self.on_program_progress)
+        self.program_thread.finished.connect(self.on_program_finished)
+        self.program_thread.error.connect(self.on_program_error)
+        self.program_thread.start()
+
+    def on_program_progress(self, percent: int, message: str):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{message}  %p%")
+
+    def _finish_program_thread(self):
+        self.progress_bar.setVisible(False)
+        if self.program_thread:
+            self.program_thread.quit()
+            self.program_thread.wait()
+            self.program_thread = None
+        self.seat_program_btn.setEnabled(self.exam_model.rowCount() > 0)
+        self.create_plan_btn.setEnabled(self.selected_sinav is not None)
+
+    def on_program_error(self, error_msg: str):
+        self._finish_program_thread()
+        ModernMessageBox.error(self, "Planlama Hatası", "Program oturma düzeni oluşturulamadı.", error_msg)
+
+    def on_program_finished(self, result: Dict):
+        self._finish_program_thread()
+
+        if not result.get('success'):
+            details = "\n".join(
+                f"{c['tip']}: sınav {c.get('sinav_id')}, {c.get('ogrenci_no') or c.get('derslik_id') or ''}"
+                for c in result.get('conflicts', [])[:50]
+            )
+            ModernMessageBox.error(self, "Planlama Hatası", result.get('message', ''), details)
+            return
+
+        timings = result['timings']
+        lines = [
+            f"{e['ders_kodu']}: "
+            + (f"atlandı ({e['skipped']})" if e['skipped'] else
+               f"{e['placed_count']}/{e['ogrenci_sayisi']} öğrenci, {e['time_ms']:.1f} ms")
+            for e in result['exams']
+        ]
+        summary = (
+            f"Yükleme: {timings['load_s']:.2f} sn\n"
+            f"Oluşturma: {timings['generate_s']:.2f} sn ({result['workers']} işlem)\n"
+            f"Kayıt: {timings['save_s']:.2f} sn\n"
+            f"Hız: {result['seats_per_sec']:.0f} koltuk/sn\n\n"
+        )
+        message = f"{result['message']}\n\nToplam süre: {timings['total_s']:.2f} sn"
+        if result.get('unplaced_count'):
+            ModernMessageBox.warning(self, "Kısmi Başarı", message, summary + "\n".join(lines))
+        else:
+            ModernMessageBox.success(self, "Başarılı", message, summary + "\n".join(lines))
+
     def _get_exam_classrooms(self, sinav_id: int) -> List[Dict]:
         """Get classrooms assigned to an exam"""
         try:
@@ -478,158 +575,13 @@ class OturmaPlaniView(QWidget):
 
     def visualize_seating_plan(self, classrooms: List[Dict], seating_data: Dict):
         """Visualize seating arrangement with corridor groups"""
-        # Clear existing VISUALIZATION ONLY (don't touch seating_data!)
-        logger.info("Clearing old visualization widgets (keeping seating data)")
-        while self.seating_layout.count():
-            child = self.seating_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        for classroom in classrooms:
-            derslik_id = classroom['derslik_id']
-            rows = classroom.get('satir_sayisi', 10)
-            cols = classroom.get('sutun_sayisi', 6)
-            kapasite = classroom.get('kapasite', 60)
-            sira_yapisi = classroom.get('sira_yapisi', 3)  # 2'li veya 3'lü grup
-
-            # Classroom header
-            header = QLabel(f" {classroom.get('derslik_adi', classroom.get('derslik_kodu'))} (Kapasite: {kapasite})")
-            header.setFont(QFont("Segoe UI", 14, QFont.Bold))
-            header.setStyleSheet("color: #1f2937; padding: 10px;")
-            self.seating_layout.addWidget(header)
-
-            # Find max used row for this classroom
-            max_used_row = 0
-            for ogrenci_no, data in seating_data.items():
-                if data['derslik_id'] == derslik_id:
-                    max_used_row = max(max_used_row, data['sira'])
-
-            # Only show used rows (no extra rows to reduce widget count)
-            display_rows = max_used_row if max_used_row > 0 else min(5, rows)
-            
-            # Count students in this classroom
-            students_in_classroom = sum(1 for data in seating_data.values() if data['derslik_id'] == derslik_id)
-            logger.info(f"    Görselleştirme: {classroom.get('derslik_adi')} - {students_in_classroom} öğrenci, {display_rows} satır gösteriliyor")
-
-            # Reverse seat data for lookup
-            seat_lookup = {}
-            for ogrenci_no, data in seating_data.items():
-                if data['derslik_id'] == derslik_id:
-                    key = (data['sira'], data['sutun'])
-                    seat_lookup[key] = ogrenci_no
-
-            # Create grid for seats with corridor grouping
-            grid = QGridLayout()
-            grid.setSpacing(3)
-
-            # Calculate total visual columns (with corridors + window + door) based on sira_yapisi
-            corridor_count = (cols - 1) // sira_yapisi
-            total_visual_cols = cols + corridor_count + 2  # +1 for window, +1 for door
-
-            # Front label (Board)
-            front_label = QLabel(" TAHTA")
-            front_label.setAlignment(Qt.AlignCenter)
-            front_label.setStyleSheet("""
-                background: #fef3c7;
-                border: 2px solid #f59e0b;
-                border-radius: 4px;
-                padding: 8px;
-                font-weight: bold;
-                color: #92400e;
-            """)
-            grid.addWidget(front_label, 0, 0, 1, total_visual_cols)
-
-            # Left side - Windows
-            window_label = QLabel("🪟\nP\nE\nN\nC\nE\nR\nE")
-            window_label.setAlignment(Qt.AlignCenter)
-            window_label.setStyleSheet("""
-                background: #dbeafe;
-                border: 2px solid #3b82f6;
-                border-radius: 4px;
-                padding: 4px;
-                font-weight: bold;
-                color: #1e40af;
-                font-size: 10px;
-            """)
-            grid.addWidget(window_label, 1, 0, display_rows, 1)
-
-            # Shift columns by 1 to accommodate window label
-            col_offset = 1
-
-            for row in range(1, display_rows + 1):
-                # Add corridor space based on sira_yapisi (2'li or 3'lü groups)
-                visual_col = col_offset
-                for col in range(1, cols + 1):
-                    # Add corridor space after every sira_yapisi seats
-                    if col > 1 and (col - 1) % sira_yapisi == 0:
-                        spacer = QLabel("│")
-                        spacer.setAlignment(Qt.AlignCenter)
-                        spacer.setStyleSheet("color: #d1d5db; font-size: 20px;")
-                        grid.addWidget(spacer, row, visual_col)
-                        visual_col += 1
-
-                    seat_btn = QPushButton()
-                    seat_btn.setFixedSize(65, 65)
-
-                    key = (row, col)
-                    if key in seat_lookup:
-                        ogrenci_no = seat_lookup[key]
-                        ad_soyad = seating_data[ogrenci_no].get('ad_soyad', '')
-                        seat_btn.setText(f"{ogrenci_no}\n{ad_soyad[:12]}")
-                        seat_btn.setStyleSheet("""
-                            QPushButton {
-                                background: #dbeafe;
-                                border: 2px solid #3b82f6;
-                                border-radius: 6px;
-                                font-size: 9px;
-                                font-weight: bold;
-                                color: #1e40af;
-                            }
-                            QPushButton:hover {
-                                background: #bfdbfe;
-                            }
-                        """)
-                        seat_btn.setToolTip(f"{ad_soyad}\nÖğrenci No: {ogrenci_no}\nSıra: {row}, Sütun: {col}")
-                    else:
-                        # Empty seat - make it visually distinct
-                        seat_btn.setText("✗\nBOŞ")
-                        seat_btn.setStyleSheet("""
-                            QPushButton {
-                                background: #fee2e2;
-                                border: 2px dashed #ef4444;
-                                border-radius: 6px;
-                                font-size: 11px;
-                                font-weight: bold;
-                                color: #991b1b;
-                            }
-                        """)
-                        seat_btn.setToolTip(f"Boş Koltuk - Sıra: {row}, Sütun: {col}")
-
-                    grid.addWidget(seat_btn, row, visual_col)
-                    visual_col += 1
-
-            # Right side - Door (at the back)
-            door_label = QLabel("\nK\nA\nP\nI")
-            door_label.setAlignment(Qt.AlignCenter)
-            door_label.setStyleSheet("""
-                background: #fef3c7;
-                border: 2px solid #f59e0b;
-                border-radius: 4px;
-                padding: 4px;
-                font-weight: bold;
-                color: #92400e;
-                font-size: 10px;
-            """)
-            # Place door at the back (last few rows)
-            door_start_row = max(1, display_rows - 3)
-            grid.addWidget(door_label, door_start_row, visual_col, min(4, display_rows), 1)
-
-            grid_widget = QWidget()
-            grid_widget.setLayout(grid)
-            self.seating_layout.addWidget(grid_widget)
-
-            # Add spacing between classrooms
-            self.seating_layout.addSpacing(20)
+        # Replaces the visualization only (seating_data is kept)
+        start = time.perf_counter()
+        self.seating_map.set_plan(classrooms, seating_data)
+        logger.info(
+            f"⏱️ Oturma haritası: {len(classrooms)} derslik, {len(seating_data)} öğrenci, "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
 
     def update_student_list(self, students: List[Dict], seating_data: Dict):
         """Update student list table"""
@@ -653,11 +605,8 @@ class OturmaPlaniView(QWidget):
 
     def clear_seating_plan(self):
         """Clear seating plan visualization"""
-        # Clear visualization widgets
-        while self.seating_layout.count():
-            child = self.seating_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        # Clear visualization
+        self.seating_map.clear_plan()
 
         # Clear data
         self.students_table.setRowCount(0)
@@ -927,12 +876,8 @@ class OturmaPlaniView(QWidget):
                     self.selected_sinav = saved_sinav
                     # Only clear seating data (it's invalid now with new classrooms)
                     self.clear_seating_plan()
-                    # Re-select the row
-                    for row in range(self.exams_table.rowCount()):
-                        item = self.exams_table.item(row, 0)
-                        if item and item.data(Qt.UserRole) and item.data(Qt.UserRole).get('sinav_id') == sinav_id:
-                            self.exams_table.selectRow(row)
-                            break
+                    # Re-select the row when the reloaded list has it
+                    self._reselect_sinav_id = sinav_id
 
                 ModernMessageBox.information(self, "Başarılı", "✅ Derslik değişikliği başarıyla kaydedildi!\n\nYeni derslik düzenine göre oturma planını yeniden oluşturun.")
 
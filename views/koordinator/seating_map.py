@@ -0,0 +1,257 @@
+"""
+Oturma Haritası - Seating Map Renderer
+Custom-painted classroom seating map (QGraphicsView) with zoom and hover tooltips
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView, QStyleOptionGraphicsItem
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QBrush, QColor, QFont, QPainter, QPen
+
+logger = logging.getLogger(__name__)
+
+SEAT_SIZE = 65
+SEAT_SPACING = 3
+CELL = SEAT_SIZE + SEAT_SPACING
+CORRIDOR_WIDTH = 20
+HEADER_HEIGHT = 44
+BOARD_HEIGHT = 36
+SIDE_WIDTH = 30
+ROOM_SPACING = 20
+
+MIN_ZOOM = 0.1
+MAX_ZOOM = 4.0
+
+# Below this zoom seats are drawn as plain boxes (no text)
+TEXT_MIN_ZOOM = 0.45
+
+# {derslik_id: {(sira, sutun): (ogrenci_no, ad_soyad)}}
+SeatIndex = Dict[int, Dict[Tuple[int, int], Tuple[str, str]]]
+
+
+def build_seat_index(seating_data: Dict) -> SeatIndex:
+    """Per-classroom seat lookup of a {ogrenci_no: {derslik_id, sira, sutun, ad_soyad}} plan, in one pass"""
+    index: SeatIndex = {}
+    for ogrenci_no, data in seating_data.items():
+        index.setdefault(data['derslik_id'], {})[(data['sira'], data['sutun'])] = (
+            str(ogrenci_no), data.get('ad_soyad', '')
+        )
+    return index
+
+
+class RoomItem(QGraphicsItem):
+    """One classroom: header, board, window, seats with corridors, door
+
+    Seats are painted directly (no child items); paint() only draws the
+    seat rows that intersect the exposed rectangle, and the seat under the
+    mouse is found arithmetically for the tooltip.
+    """
+
+    def __init__(self, classroom: Dict, seats: Dict[Tuple[int, int], Tuple[str, str]]):
+        super().__init__()
+        self.classroom = classroom
+        self.seats = seats
+        self.cols = max(1, int(classroom.get('sutun_sayisi', 6) or 6))
+        self.sira_yapisi = max(1, int(classroom.get('sira_yapisi', 3) or 3))
+        rows = int(classroom.get('satir_sayisi', 10) or 10)
+
+        # Only show used rows (empty classrooms show the first few)
+        max_used_row = max((sira for sira, _ in seats), default=0)
+        self.display_rows = max_used_row if max_used_row > 0 else min(5, rows)
+
+        # x of every seat column, with a corridor after every sira_yapisi seats
+        self.col_x = [
+            SIDE_WIDTH + SEAT_SPACING + (col - 1) * CELL + ((col - 1) // self.sira_yapisi) * CORRIDOR_WIDTH
+            for col in range(1, self.cols + 1)
+        ]
+        self.seats_top = HEADER_HEIGHT + BOARD_HEIGHT + SEAT_SPACING
+        seats_right = self.col_x[-1] + SEAT_SIZE + SEAT_SPACING
+        self.width = seats_right + SIDE_WIDTH
+        self.height = self.seats_top + self.display_rows * CELL
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptHoverEvents(True)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self.width, self.height)
+
+    def seat_rect(self, sira: int, sutun: int) -> QRectF:
+        return QRectF(self.col_x[sutun - 1], self.seats_top + (sira - 1) * CELL, SEAT_SIZE, SEAT_SIZE)
+
+    def seat_at(self, x: float, y: float) -> Optional[Tuple[int, int]]:
+        """(sira, sutun) of the seat under an item position, None on aisles and walls"""
+        if y < self.seats_top:
+            return None
+        sira, dy = divmod(y - self.seats_top, CELL)
+        if sira >= self.display_rows or dy > SEAT_SIZE:
+            return None
+        # A corridor-separated group of sira_yapisi seats is one "wide cell"
+        group_width = self.sira_yapisi * CELL + CORRIDOR_WIDTH
+        group, gx = divmod(x - SIDE_WIDTH - SEAT_SPACING, group_width)
+        if group < 0:
+            return None
+        offset, sx = divmod(gx, CELL)
+        if offset >= self.sira_yapisi or sx > SEAT_SIZE:
+            return None
+        sutun = int(group) * self.sira_yapisi + int(offset) + 1
+        if sutun > self.cols:
+            return None
+        return int(sira) + 1, sutun
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        exposed = option.exposedRect
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        with_text = lod >= TEXT_MIN_ZOOM
+
+        # Header and board
+        if exposed.top() < self.seats_top:
+            painter.setPen(QColor('#1f2937'))
+            painter.setFont(QFont("Segoe UI", 14, QFont.Bold))
+            title = self.classroom.get('derslik_adi', self.classroom.get('derslik_kodu'))
+            painter.drawText(
+                QRectF(0, 0, self.width, HEADER_HEIGHT), Qt.AlignLeft | Qt.AlignVCenter,
+                f" {title} (Kapasite: {self.classroom.get('kapasite', 60)})"
+            )
+            board = QRectF(0, HEADER_HEIGHT, self.width, BOARD_HEIGHT - SEAT_SPACING)
+            painter.setPen(QPen(QColor('#f59e0b'), 2))
+            painter.setBrush(QColor('#fef3c7'))
+            painter.drawRoundedRect(board, 4, 4)
+            painter.setPen(QColor('#92400e'))
+            painter.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            painter.drawText(board, Qt.AlignCenter, "TAHTA")
+
+        # Window (left) and door (right, at the back)
+        side_font = QFont("Segoe UI", 8, QFont.Bold)
+        window = QRectF(0, self.seats_top, SIDE_WIDTH, self.display_rows * CELL - SEAT_SPACING)
+        door_rows = min(4, self.display_rows)
+        door = QRectF(
+            self.width - SIDE_WIDTH, self.seats_top + (self.display_rows - door_rows) * CELL,
+            SIDE_WIDTH, door_rows * CELL - SEAT_SPACING
+        )
+        for rect, fill, border, text_color, text in (
+            (window, '#dbeafe', '#3b82f6', '#1e40af', "P\nE\nN\nC\nE\nR\nE"),
+            (door, '#fef3c7', '#f59e0b', '#92400e', "K\nA\nP\nI"),
+        ):
+            if rect.intersects(exposed):
+                painter.setPen(QPen(QColor(border), 2))
+                painter.setBrush(QColor(fill))
+                painter.drawRoundedRect(rect, 4, 4)
+                if with_text:
+                    painter.setPen(QColor(text_color))
+                    painter.setFont(side_font)
+                    painter.drawText(rect, Qt.AlignCenter, text)
+
+        # Seats: only the exposed rows and columns
+        first_row = max(1, int((exposed.top() - self.seats_top) // CELL) + 1)
+        last_row = min(self.display_rows, int((exposed.bottom() - self.seats_top) // CELL) + 1)
+        columns = [
+            col for col in range(1, self.cols + 1)
+            if self.col_x[col - 1] + SEAT_SIZE >= exposed.left() and self.col_x[col - 1] <= exposed.right()
+        ]
+
+        taken_pen, taken_brush = QPen(QColor('#3b82f6'), 2), QBrush(QColor('#dbeafe'))
+        empty_pen, empty_brush = QPen(QColor('#ef4444'), 2, Qt.DashLine), QBrush(QColor('#fee2e2'))
+        taken_font = QFont("Segoe UI", 7, QFont.Bold)
+        empty_font = QFont("Segoe UI", 9, QFont.Bold)
+        taken_text, empty_text = QColor('#1e40af'), QColor('#991b1b')
+
+        for sira in range(first_row, last_row + 1):
+            for sutun in columns:
+                rect = self.seat_rect(sira, sutun)
+                student = self.seats.get((sira, sutun))
+                if student:
+                    painter.setPen(taken_pen)
+                    painter.setBrush(taken_brush)
+                    painter.drawRoundedRect(rect, 6, 6)
+                    if with_text:
+                        painter.setPen(taken_text)
+                        painter.setFont(taken_font)
+                        painter.drawText(rect, Qt.AlignCenter, f"{student[0]}\n{student[1][:12]}")
+                else:
+                    painter.setPen(empty_pen)
+                    painter.setBrush(empty_brush)
+                    painter.drawRoundedRect(rect, 6, 6)
+                    if with_text:
+                        painter.setPen(empty_text)
+                        painter.setFont(empty_font)
+                        painter.drawText(rect, Qt.AlignCenter, "✗\nBOŞ")
+
+    def hoverMoveEvent(self, event):
+        seat = self.seat_at(event.pos().x(), event.pos().y())
+        if seat is None:
+            self.setToolTip("")
+        else:
+            sira, sutun = seat
+            student = self.seats.get(seat)
+            if student:
+                self.setToolTip(f"{student[1]}\nÖğrenci No: {student[0]}\nSıra: {sira}, Sütun: {sutun}")
+            else:
+                self.setToolTip(f"Boş Koltuk - Sıra: {sira}, Sütun: {sutun}")
+        super().hoverMoveEvent(event)
+
+
+class SeatingMapView(QGraphicsView):
+    """Seating map of an exam: one RoomItem per classroom, stacked vertically
+
+    Qt only paints the items (and each item only the seats) inside the
+    viewport, so large exams render as fast as small ones. Ctrl + mouse wheel
+    zooms around the cursor, Ctrl+0 resets the zoom.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.setBackgroundBrush(QColor('white'))
+        self.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        self.setToolTip("")
+        self.zoom = 1.0
+
+    def set_plan(self, classrooms: List[Dict], seating_data: Dict) -> None:
+        """Replace the map with the classrooms of an exam and its {ogrenci_no: seat} plan"""
+        scene = self.scene()
+        scene.clear()
+        index = build_seat_index(seating_data)
+
+        y = 0.0
+        for classroom in classrooms:
+            item = RoomItem(classroom, index.get(classroom['derslik_id'], {}))
+            item.setPos(0, y)
+            scene.addItem(item)
+            y += item.height + ROOM_SPACING
+            logger.info(
+                f"    Görselleştirme: {classroom.get('derslik_adi')} - {len(item.seats)} öğrenci, "
+                f"{item.display_rows} satır gösteriliyor"
+            )
+
+        scene.setSceneRect(scene.itemsBoundingRect())
+        self.verticalScrollBar().setValue(self.verticalScrollBar().minimum())
+
+    def clear_plan(self) -> None:
+        self.scene().clear()
+        self.scene().setSceneRect(QRectF())
+
+    def set_zoom(self, zoom: float) -> None:
+        zoom = max(MIN_ZOOM, min(MAX_ZOOM, zoom))
+        self.scale(zoom / self.zoom, zoom / self.zoom)
+        self.zoom = zoom
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+            self.set_zoom(self.zoom * factor)
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier and event.key() == Qt.Key_0:
+            self.set_zoom(1.0)
+            event.accept()
+            return
+        super().keyPressEvent(event)
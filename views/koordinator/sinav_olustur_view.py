@@ -5,6 +5,7 @@ Sadece UI ve kullanıcı etkileşimi
 """
 
 import logging
+import os
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -27,6 +28,7 @@ from algorithms.sinav_planlama import SinavPlanlama
 from algorithms.scoring_system import SinavProgramScorer
 from styles.kou_theme import KOUTheme  # Modern KOÜ yeşil tema
 from algorithms.attempt_manager import AttemptManager
+from algorithms.result_cache import PlanningResultCache
 from utils.export_utils import ExportUtils
 from utils.modern_dialogs import ModernMessageBox, sanitize_filename
 from utils.view_helpers import refresh_main_window_ui
@@ -51,14 +53,17 @@ class SinavPlanlamaThread(QThread):
             if self.use_multiple_attempts:
                 # Çoklu deneme modu
                 scorer = SinavProgramScorer()
-                attempt_manager = AttemptManager(scorer)
+                # Unchanged inputs return the previous best at once (~/.sinav_takvimi)
+                attempt_manager = AttemptManager(scorer, result_cache=PlanningResultCache())
                 planner = SinavPlanlama()
 
                 result = attempt_manager.run_multiple_attempts(
                     planning_function=planner.plan_exam_schedule,
                     params=self.params,
                     max_attempts=self.params.get('max_attempts', 300),  # Default to 300
-                    progress_callback=self.progress.emit
+                    progress_callback=self.progress.emit,
+                    # requestInterruption() stops the run, keeping the best schedule so far
+                    should_stop=self.isInterruptionRequested
                 )
             else:
                 # Tek deneme modu
@@ -317,6 +322,30 @@ class SinavOlusturView(QWidget):
         self.create_btn.clicked.connect(self.create_schedule)
         layout.addWidget(self.create_btn)
 
+        # Cancel button (visible while planning): stops and keeps the best schedule so far
+        self.cancel_btn = QPushButton("⏹️ Durdur (en iyi sonucu koru)")
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.setMinimumHeight(32)
+        self.cancel_btn.setCursor(Qt.PointingHandCursor)
+        self.cancel_btn.setStyleSheet("""
+            QPushButton {
+                background: white;
+                color: #b91c1c;
+                border: 1px solid #fca5a5;
+                border-radius: 6px;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background: #fef2f2;
+            }
+            QPushButton:disabled {
+                color: #9ca3af;
+                border: 1px solid #d1d5db;
+            }
+        """)
+        self.cancel_btn.clicked.connect(self.cancel_planning)
+        layout.addWidget(self.cancel_btn)
+
     def _create_basic_info_group(self) -> QGroupBox:
         """Create basic info group"""
         group = QGroupBox("⚙️ Temel Bilgiler")
@@ -459,6 +488,27 @@ class SinavOlusturView(QWidget):
         gunluk_limit_layout.addStretch()
         layout.addLayout(gunluk_limit_layout)
 
+        sure_layout = QHBoxLayout()
+        sure_layout.setSpacing(12)
+
+        sure_label = QLabel("Planlama süresi (sn):")
+        sure_label.setStyleSheet("font-size: 11px; color: #1e293b;")
+        self.planlama_suresi = QSpinBox()
+        self.planlama_suresi.setRange(0, 600)  # 0 = süre sınırı yok (300 deneme)
+        self.planlama_suresi.setValue(0)  # Opt-in: budgeted runs depend on machine speed
+        self.planlama_suresi.setFixedHeight(28)
+        self.planlama_suresi.setFixedWidth(60)
+        self.planlama_suresi.setToolTip(
+            "Denemeler ve yerel arama bu süre içinde yapılır (0 = sabit 300 deneme).\n"
+            "Süre sınırıyla deneme sayısı bilgisayarın hızına bağlıdır; aynı girdiler farklı sonuç verebilir."
+        )
+        self.planlama_suresi.setSpecialValueText("Yok")
+
+        sure_layout.addWidget(sure_label)
+        sure_layout.addWidget(self.planlama_suresi)
+        sure_layout.addStretch()
+        layout.addLayout(sure_layout)
+
         return group
 
     def _create_time_settings_group(self) -> QGroupBox:
@@ -1012,6 +1062,8 @@ class SinavOlusturView(QWidget):
 
         # Start thread
         use_multiple = params.get('use_multiple_attempts', True)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(use_multiple)
         self.planning_thread = SinavPlanlamaThread(params, use_multiple)
         self.planning_thread.progress.connect(self.on_planning_progress)
         self.planning_thread.finished.connect(self.on_planning_finished)
@@ -1098,12 +1150,32 @@ class SinavOlusturView(QWidget):
             'class_per_day_limit': self.gunluk_sinav_limiti.value(),
             'student_per_day_limit': self.ogrenci_gunluk_limiti.value(),
             'ders_sinavlari_suresi': ders_sureleri,
-            'max_attempts': 300,  # Increased for better optimization
+            # With a time budget attempts and local search share the budget and
+            # max_attempts is only an upper bound; the attempt count then depends on
+            # machine speed, so only the default fixed-attempt run is reproducible
+            'time_budget_seconds': self.planlama_suresi.value(),
+            'max_attempts': 10000 if self.planlama_suresi.value() else 300,
             'use_multiple_attempts': True,
+            # Process-pool planning; results do not depend on the worker count
+            'parallel_workers': max(1, (os.cpu_count() or 1) - 1),
+            'coloring_algorithm': 'dsatur',  # greedy | dsatur | tabucol
+            'attempt_scheduler': 'ucb1',  # uniform | ucb1 (favour the variants that reach top scores)
+            'prune_attempts': True,  # Abandon attempts that can no longer beat the best score
+            'room_allocation': 'min_waste',  # greedy | min_waste (subset-sum room packing)
+            'local_search_seconds': 5,  # Simulated annealing on the best attempt (0 = off)
+            'local_search_iterations': 10000,  # Move cap: reproducible if reached within local_search_seconds
+            'warm_start_attempts': 100,  # Attempts after replaying a cached best of close inputs
             'days_count': days_count,  # For diagnostic error messages
-            'randomize': False  # Deterministic results for same inputs by default
+            'randomize': False  # Seeds from the inputs: same inputs => same results without a time budget
         }
 
+    def cancel_planning(self):
+        """Stop planning; the attempt manager returns the best schedule found so far"""
+        if getattr(self, 'planning_thread', None):
+            self.planning_thread.requestInterruption()
+            self.cancel_btn.setEnabled(False)
+            self.progress_label.setText("Durduruluyor, en iyi sonuç hazırlanıyor...")
+
     def on_planning_progress(self, percent, message):
         """Update planning progress"""
         self.progress_bar.setValue(percent)
@@ -1114,6 +1186,7 @@ class SinavOlusturView(QWidget):
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
         self.create_btn.setEnabled(True)
+        self.cancel_btn.setVisible(False)
 
         if hasattr(self, 'planning_thread') and self.planning_thread:
             self.planning_thread.quit()
@@ -1136,6 +1209,7 @@ class SinavOlusturView(QWidget):
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
         self.create_btn.setEnabled(True)
+        self.cancel_btn.setVisible(False)
 
         if hasattr(self, 'planning_thread') and self.planning_thread:
             self.planning_thread.quit()
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QFrame, QGraphicsOpacityEffect, QProgressBar,
     QApplication, QStackedWidget, QMessageBox
 )
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, Signal
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QThread, QTimer, Signal
 from PySide6.QtGui import QFont, QColor
 
 sys.path.append(str(Path(__file__).parent.parent))
@@ -27,11 +27,43 @@ from views.koordinator.ayarlar_view import AyarlarView
 from views.admin.kullanici_yonetimi_view import KullaniciYonetimiView
 from views.admin.bolum_yonetimi_view import BolumYonetimiView
 from views.admin.duyuru_yonetimi_view import DuyuruYonetimiView
+from models.istatistik_model import ADMIN_SCOPE, IstatistikModel
 from styles.theme import KocaeliTheme
 from utils.modern_dialogs import ModernMessageBox
 
 logger = logging.getLogger(__name__)
 
+# Dashboard counters: (label, IstatistikModel key)
+ADMIN_STATS = [
+    ("👥 Aktif Kullanıcılar", 'kullanici_sayisi'),
+    ("🏢 Bölümler", 'bolum_sayisi'),
+    ("👨‍🏫 Koordinatörler", 'koordinator_sayisi'),
+]
+BOLUM_STATS = [
+    ("📅 Sınav Programları", 'program_sayisi'),
+    ("📚 Dersler", 'ders_sayisi'),
+    ("🏛 Derslikler", 'derslik_sayisi'),
+    ("👨‍🎓 Öğrenciler", 'ogrenci_sayisi'),
+]
+
+
+class StatsRefreshThread(QThread):
+    """Thread for refreshing the dashboard counters"""
+    finished = Signal(object, dict)  # scope, counters
+    error = Signal(str)
+
+    def __init__(self, stats_model, scope):
+        super().__init__()
+        self.stats_model = stats_model
+        self.scope = scope
+
+    def run(self):
+        try:
+            self.finished.emit(self.scope, self.stats_model.refresh(self.scope))
+        except Exception as e:
+            logger.error(f"Stats error: {e}")
+            self.error.emit(str(e))
+
 
 class Theme:
     """Modern Theme - Improved Design"""
@@ -309,6 +341,16 @@ class MainWindow(QMainWindow):
         self.is_admin = user_data.get('role') == 'Admin'
         self.needs_bolum_selection = self.is_admin and not user_data.get('bolum_id')
 
+        # Dashboard counters: cached aggregate query, refreshed in the background
+        from models.database import db
+        self.stats_model = IstatistikModel(db)
+        self.stats_thread = None
+        self._pending_stats_scope = None  # requested while a refresh was running
+        self._stat_labels = {}  # key -> value QLabel of the current dashboard
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(int(max(self.stats_model.ttl, 5) * 1000))
+        self.stats_timer.timeout.connect(self._on_stats_timer)
+
         self.setWindowTitle(f"KOÜ Sınav Takvimi - {user_data.get('ad_soyad')}")
         self.setMinimumSize(1400, 800)
 
@@ -772,57 +814,16 @@ class MainWindow(QMainWindow):
         title.setFont(QFont("Segoe UI", 14, QFont.Bold))
         layout.addWidget(title)
 
-        # Get real statistics
+        # Cached counters at once (even if stale), refreshed in the background
         stats_list = QWidget()
         stats_layout = QVBoxLayout(stats_list)
         stats_layout.setSpacing(12)
 
-        try:
-            from models.database import db
-            is_impersonating = getattr(self, 'is_impersonating', False)
-            eff_user = self.get_effective_user_data()
-            
-            if self.is_admin and not is_impersonating:
-                # Admin stats
-                users_count = db.execute_query("SELECT COUNT(*) AS c FROM users WHERE aktif = TRUE")[0]['c']
-                bolum_count = db.execute_query("SELECT COUNT(*) AS c FROM bolumler WHERE aktif = TRUE")[0]['c']
-                koor_count = db.execute_query("SELECT COUNT(*) AS c FROM users WHERE aktif = TRUE AND role = 'Bölüm Koordinatörü'")[0]['c']
-                
-                stats_data = [
-                    ("👥 Aktif Kullanıcılar", users_count),
-                    ("🏢 Bölümler", bolum_count),
-                    ("👨‍🏫 Koordinatörler", koor_count),
-                ]
-            else:
-                # Department stats
-                from models.sinav_model import SinavModel
-                from models.ders_model import DersModel
-                from models.derslik_model import DerslikModel
-                from models.ogrenci_model import OgrenciModel
-                
-                bolum_id = eff_user.get('bolum_id')
-                sinav_model = SinavModel(db)
-                ders_model = DersModel(db)
-                derslik_model = DerslikModel(db)
-                ogrenci_model = OgrenciModel(db)
-                
-                programlar = sinav_model.get_programs_by_bolum(bolum_id)
-                program_count = len([p for p in programlar if p.get('aktif', True)])
-                ders_count = len(ders_model.get_dersler_by_bolum(bolum_id))
-                derslik_count = len(derslik_model.get_derslikler_by_bolum(bolum_id))
-                ogrenci_count = len(ogrenci_model.get_ogrenciler_by_bolum(bolum_id))
-                
-                stats_data = [
-                    ("📅 Sınav Programları", program_count),
-                    ("📚 Dersler", ders_count),
-                    ("🏛 Derslikler", derslik_count),
-                    ("👨‍🎓 Öğrenciler", ogrenci_count),
-                ]
-        except Exception as e:
-            logger.error(f"Stats error: {e}")
-            stats_data = [("⚠️ Veri yüklenemedi", 0)]
+        scope = self._stats_scope()
+        stats, fresh = self.stats_model.peek(scope)
+        self._stat_labels = {}
 
-        for label, value in stats_data:
+        for label, key in (ADMIN_STATS if scope == ADMIN_SCOPE else BOLUM_STATS):
             item = QWidget()
             item_layout = QHBoxLayout(item)
             item_layout.setContentsMargins(0, 0, 0, 0)
@@ -834,18 +835,78 @@ class MainWindow(QMainWindow):
             
             item_layout.addStretch()
 
-            val = QLabel(str(value))
+            val = QLabel(str(stats[key]) if stats else "…")
             val.setFont(QFont("Segoe UI", 14, QFont.Bold))
             val.setStyleSheet("color: #10b981;")
             item_layout.addWidget(val)
+            self._stat_labels[key] = val
 
             stats_layout.addWidget(item)
 
+        if not fresh:
+            self._start_stats_refresh(scope)
+        self.stats_timer.start()
+
         layout.addWidget(stats_list)
         layout.addStretch()
 
         return card
     
+    def _stats_scope(self):
+        """Counter scope of the dashboard: admin panel or the effective department"""
+        if self.is_admin and not getattr(self, 'is_impersonating', False):
+            return ADMIN_SCOPE
+        return IstatistikModel.bolum_scope(self.get_effective_user_data().get('bolum_id'))
+
+    def _start_stats_refresh(self, scope):
+        if self.stats_thread is not None:
+            self._pending_stats_scope = scope  # started when the running refresh finishes
+            return
+        self.stats_thread = StatsRefreshThread(self.stats_model, scope)
+        self.stats_thread.finished.connect(self._on_stats_refreshed)
+        self.stats_thread.error.connect(self._on_stats_error)
+        self.stats_thread.start()
+
+    def _finish_stats_thread(self):
+        if self.stats_thread:
+            self.stats_thread.wait()
+            self.stats_thread.deleteLater()
+            self.stats_thread = None
+        scope, self._pending_stats_scope = self._pending_stats_scope, None
+        if scope is not None and scope == self._stats_scope():
+            self._start_stats_refresh(scope)
+
+    def _on_stats_refreshed(self, scope, stats):
+        self._finish_stats_thread()
+        if scope != self._stats_scope():
+            # Impersonation/department changed meanwhile: show what is cached for the
+            # new dashboard; its own refresh was queued and is running now
+            stats, _ = self.stats_model.peek(self._stats_scope())
+            if stats is None:
+                return
+        for key, label in self._stat_labels.items():
+            try:
+                label.setText(str(stats.get(key, 0)))
+            except RuntimeError:
+                pass  # dashboard recreated meanwhile
+
+    def _on_stats_error(self, message):
+        self._finish_stats_thread()
+        for label in self._stat_labels.values():
+            try:
+                if label.text() == "…":
+                    label.setText("⚠️")
+                    label.setToolTip(f"Veri yüklenemedi: {message}")
+            except RuntimeError:
+                pass
+
+    def _on_stats_timer(self):
+        """Keep the visible dashboard's counters within the TTL"""
+        if self.active_menu == 'dashboard' and self._stat_labels:
+            scope = self._stats_scope()
+            if not self.stats_model.peek(scope)[1]:
+                self._start_stats_refresh(scope)
+
     def create_activity_card(self):
         """Recent activity or upcoming events card"""
         card = QFrame()
@@ -1121,6 +1182,9 @@ class MainWindow(QMainWindow):
     
     def refresh_ui_for_data_change(self):
         """Refresh UI after data changes (classroom/course/student added)"""
+        # Counters changed: recount (the sidebar checks below read them)
+        self.stats_model.invalidate()
+
         # Recreate sidebar to update menu items based on new data
         self.recreate_sidebar()
         
@@ -1216,9 +1280,6 @@ class MainWindow(QMainWindow):
     def _check_classrooms_exist(self) -> bool:
         """Check if classrooms exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.derslik_model import DerslikModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1226,9 +1287,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            derslik_model = DerslikModel(db)
-            derslikler = derslik_model.get_derslikler_by_bolum(eff_bolum_id)
-            return len(derslikler) > 0
+            return self.stats_model.get_bolum_stats(eff_bolum_id)['derslik_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking classrooms: {e}", exc_info=True)
@@ -1238,9 +1297,6 @@ class MainWindow(QMainWindow):
     def _check_courses_exist(self) -> bool:
         """Check if courses exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.ders_model import DersModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1248,9 +1304,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            ders_model = DersModel(db)
-            dersler = ders_model.get_dersler_by_bolum(eff_bolum_id)
-            return len(dersler) > 0
+            return self.stats_model.get_bolum_stats(eff_bolum_id)['ders_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking courses: {e}", exc_info=True)
@@ -1260,9 +1314,6 @@ class MainWindow(QMainWindow):
     def _check_exam_programs_exist(self) -> bool:
         """Check if exam programs exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.sinav_model import SinavModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1270,9 +1321,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            sinav_model = SinavModel(db)
-            programs = sinav_model.get_programs_by_bolum(eff_bolum_id)
-            return len(programs) > 0
+            return self.stats_model.get_bolum_stats(eff_bolum_id)['program_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking exam programs: {e}", exc_info=True)
@@ -1282,9 +1331,6 @@ class MainWindow(QMainWindow):
     def _check_students_exist(self) -> bool:
         """Check if students exist for current user/bolum"""
         try:
-            from models.database import db
-            from models.ogrenci_model import OgrenciModel
-            
             # Get effective user (handle impersonation)
             eff_user = self.get_effective_user_data()
             eff_bolum_id = eff_user.get('bolum_id')
@@ -1292,9 +1338,7 @@ class MainWindow(QMainWindow):
             if not eff_bolum_id:
                 return True  # Admin without bolum - allow all
             
-            ogrenci_model = OgrenciModel(db)
-            ogrenciler = ogrenci_model.get_ogrenciler_by_bolum(eff_bolum_id)
-            return len(ogrenciler) > 0
+            return self.stats_model.get_bolum_stats(eff_bolum_id)['ogrenci_sayisi'] > 0
             
         except Exception as e:
             logger.error(f"Error checking students: {e}", exc_info=True)